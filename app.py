@@ -1,6 +1,8 @@
 from flask import Flask, render_template, request
 from routes import register_routes
 from config.settings import load_config
+from services.fanout import server_timing_header
+from services.query_stats import init_query_stats
 from os.path import splitext, exists
 from os import makedirs
 from flask_talisman import Talisman
@@ -74,6 +76,16 @@ def log_response_info(response):
     app.logger.info(f'Response: {response.status}\nHeaders: {dict(response.headers)}')
     return response
 
+# Счетчики SQL/Google Sheets на запрос (+ ?_debug=timing при DEBUG_TIMING_ENABLED)
+init_query_stats(app)
+
+# Время запросов к БД и параллельных подзапросов страницы (видно во вкладке Network браузера)
+@app.after_request
+def add_server_timing(response):
+    if timing := server_timing_header():
+        response.headers['Server-Timing'] = timing
+    return response
+
 # Register routes
 register_routes(app)
 
@@ -0,0 +1,60 @@
+"""Compare two benchmark result files case by case.
+
+    python -m benchmarks.compare cache/bench/results/macro_routes-A.json cache/bench/results/macro_routes-B.json [--threshold 1.2]
+
+Cases are matched by name. Exits with 1 if any case got slower than
+``--threshold`` times its old median (for CI-style checks).
+"""
+import argparse
+import json
+import sys
+from typing import Dict
+
+
+def load(path: str) -> Dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--metric', default='median_ms', choices=['min_ms', 'median_ms', 'p95_ms', 'mean_ms'])
+    parser.add_argument('--threshold', type=float, default=None, help="fail if new/old exceeds this ratio")
+    args = parser.parse_args()
+
+    old, new = load(args.old), load(args.new)
+    if old['suite'] != new['suite']:
+        print(f"[FAIL] Different suites: {old['suite']} vs {new['suite']}")
+        sys.exit(2)
+    for doc in (old, new):
+        print(f"{doc['created_at']}  {doc.get('git_commit') or '-':<10} {doc['meta'].get('scale')}")
+
+    old_results = {r['name']: r for r in old['results']}
+    regressions = []
+    print(f"\n{'case':<44} {'old':>10} {'new':>10} {'ratio':>7}  queries")
+    for result in new['results']:
+        before = old_results.pop(result['name'], None)
+        if before is None:
+            print(f"{result['name']:<44} {'-':>10} {result[args.metric]:>10.2f} {'new':>7}")
+            continue
+        ratio = result[args.metric] / before[args.metric] if before[args.metric] else float('inf')
+        queries = ''
+        if 'queries_per_request' in result:
+            queries = f"{before.get('queries_per_request', 0):.1f} -> {result['queries_per_request']:.1f}"
+        marker = ''
+        if args.threshold is not None and ratio > args.threshold:
+            marker = ' [SLOWER]'
+            regressions.append(result['name'])
+        print(f"{result['name']:<44} {before[args.metric]:>10.2f} {result[args.metric]:>10.2f} {ratio:>6.2f}x  {queries}{marker}")
+    for name in old_results:
+        print(f"{name:<44} {'(removed)':>10}")
+
+    if regressions:
+        print(f"\n[FAIL] {len(regressions)} case(s) slower than {args.threshold}x")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""Shared pieces of the benchmark suites: app over a fixture, timing, JSON results.
+
+Results go to ``cache/bench/results/<suite>-<timestamp>.json``; compare two
+runs with ``python -m benchmarks.compare old.json new.json``.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import asdict
+from datetime import datetime
+from os.path import splitext
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import Flask
+
+from benchmarks.fixture import DEFAULT_DIR, ensure_fixture, fixture_paths, scale_arguments, scale_from_args
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(DEFAULT_DIR, 'results')
+
+
+def make_app(database: str, sheets_dir: str) -> Flask:
+    """The site's app (blueprints, templates) reading the fixture via DB_BACKEND=sqlite"""
+    # Таблицы Google и манифест ассетов - только локальные снапшоты, без сети.
+    # Все файловые кэши - рядом с фикстурой, чтобы не смешиваться с кэшами сайта
+    fixture_dir = os.path.dirname(os.path.abspath(database))
+    os.environ.update({
+        'DB_BACKEND': 'sqlite',
+        'SQLITE_PATH': database,
+        'SHEETS_CACHE_DIR': sheets_dir,
+        'SHEETS_OFFLINE': '1',
+        'CHEST_CACHE_DIR': os.path.join(fixture_dir, 'chests'),
+        'ASSET_MANIFEST_PATH': os.path.join(fixture_dir, 'asset_manifest.json'),
+        'ASSET_MANIFEST_OFFLINE': '1',
+    })
+    from config.settings import load_config
+    from routes import register_routes
+    from services.query_stats import init_query_stats
+
+    app = Flask('app', root_path=ROOT)
+    load_config(app)
+    app.config['DEBUG_TIMING_ENABLED'] = True
+    init_query_stats(app)
+    register_routes(app)
+
+    # Как в app.py (сам app.py при импорте настраивает логи и Talisman)
+    @app.template_filter('remove_extension')
+    def remove_extension(value):
+        return splitext(value)[0]
+
+    return app
+
+
+def suite_arguments(parser: argparse.ArgumentParser):
+    """Fixture selection (built on first use) and run options shared by the suites"""
+    scale_arguments(parser)
+    parser.add_argument('--database', help="fixture database (default: cache/bench/fnlparm-<scale>.sqlite)")
+    parser.add_argument('--sheets-dir', help="sheet snapshots (default: cache/bench/sheets-<scale>)")
+    parser.add_argument('--rebuild', action='store_true', help="regenerate the fixture")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help="results file (default: cache/bench/results/<suite>-<time>.json)")
+
+
+def prepare(args) -> Tuple[Flask, Dict]:
+    """App over the requested fixture and the run metadata stored with the results"""
+    scale = scale_from_args(args)
+    default_database, default_sheets = fixture_paths(args.scale)
+    database = args.database or default_database
+    sheets_dir = args.sheets_dir or default_sheets
+
+    started = time.monotonic()
+    if ensure_fixture(database, sheets_dir, scale, args.seed, args.rebuild):
+        print(f"Fixture {database} built in {time.monotonic() - started:.1f}s")
+    meta = {'scale_name': args.scale, 'scale': asdict(scale), 'seed': args.seed,
+            'database': database, 'repeat': args.repeat}
+    return make_app(database, sheets_dir), meta
+
+
+def time_call(func: Callable, repeat: int, warmup: int = 1, setup: Optional[Callable] = None) -> Dict:
+    """Run ``func`` warmup + repeat times; timings of the measured runs in ms"""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return summarize(timings)
+
+
+def summarize(timings: List[float]) -> Dict:
+    ordered = sorted(timings)
+    return {
+        'runs': len(ordered),
+        'min_ms': ordered[0],
+        'median_ms': statistics.median(ordered),
+        'p95_ms': ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        'mean_ms': statistics.fmean(ordered),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def save_results(suite: str, results: List[Dict], meta: Dict, output: Optional[str] = None) -> str:
+    """Write one run as JSON; returns the file path"""
+    created_at = datetime.now()
+    path = output or os.path.join(RESULTS_DIR, f"{suite}-{created_at:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    document = {
+        'suite': suite,
+        'created_at': created_at.isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'meta': meta,
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def print_result(result: Dict):
+    print(f"{result['name']:<44} {result['median_ms']:>10.2f} {result['p95_ms']:>10.2f} {result.get('detail', '')}")
@@ -0,0 +1,122 @@
+"""Queries per item listing request: per-type loop vs one set-based query vs the catalog.
+
+Runs against the database configured in .env::
+
+    python -m benchmarks.item_listing_queries [--route item_all] [--search ""] [--repeat 5]
+
+Every execute_query checks out one pooled connection, so connection checkouts
+are counted as queries.
+"""
+import argparse
+import time
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+from flask import Flask, current_app
+
+import services.database as database
+from config.settings import load_config
+from models.item import ITEM_COLUMNS, DT_Item, DT_ItemResource
+from routes.item_routes import ITEM_ROUTES
+from services.item_catalog import get_item_catalog
+from services.item_service import get_items_by_type
+
+
+class QueryCounter:
+    """Counts connection checkouts made through services.database"""
+
+    def __init__(self):
+        self.count = 0
+        self._original = database.get_db_connection
+
+    def __enter__(self):
+        original = self._original
+
+        @contextmanager
+        def counting_connection():
+            self.count += 1
+            with original() as conn:
+                yield conn
+
+        database.get_db_connection = counting_connection
+        return self
+
+    def __exit__(self, *exc):
+        database.get_db_connection = self._original
+
+
+def legacy_get_items_by_type(item_types, search_term=''):
+    """Listing as it was before: IDs query, then items, then resources (3 queries per call)"""
+    placeholders = ','.join('?' * len(item_types))
+    rows = database.execute_query(
+        f"SELECT IID FROM DT_Item WHERE IType IN ({placeholders}) AND IName LIKE ? ORDER BY IID",
+        list(item_types) + [f'%{search_term}%'],
+    )
+    item_ids = [row.IID for row in rows]
+    if not item_ids:
+        return [], {}
+
+    placeholders = ','.join('?' * len(item_ids))
+    rows = database.execute_query(f"SELECT {ITEM_COLUMNS} FROM DT_Item WHERE IID IN ({placeholders})", item_ids)
+    items_dict = {row.IID: DT_Item.from_row(row) for row in rows}
+    rows = database.execute_query(
+        f"SELECT * FROM DT_ItemResource WHERE ROwnerID IN ({placeholders}) AND RType = 2", item_ids
+    )
+    resources = {row.ROwnerID: DT_ItemResource(row.ROwnerID, row.RFileName, row.RPosX, row.RPosY) for row in rows}
+
+    no_image = f"{current_app.config['GITHUB_URL']}no_item_image.png"
+    file_paths = {iid: resources[iid].file_path if iid in resources else no_image for iid in item_ids}
+    return [items_dict.get(iid) for iid in item_ids], file_paths
+
+
+def per_type_loop(types, search_term):
+    """Old with_filters: one listing call per item type"""
+    items, file_paths = [], {}
+    for item_type in types:
+        type_items, type_paths = legacy_get_items_by_type([item_type], search_term)
+        items.extend(type_items)
+        file_paths.update(type_paths)
+    return items, file_paths
+
+
+def measure(name, func, repeat):
+    timings = []
+    with QueryCounter() as counter:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            items, _ = func()
+            timings.append(time.perf_counter() - started)
+    queries = counter.count / repeat
+    best = min(timings) * 1000
+    print(f"{name:<28} {queries:>8.0f} {best:>10.1f} {len(items):>8}")
+    return {'name': name, 'queries_per_request': queries, 'best_ms': best, 'items': len(items)}
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Count queries per item listing request")
+    parser.add_argument('--route', default='item_all', choices=sorted(ITEM_ROUTES))
+    parser.add_argument('--search', default='')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    load_config(app)
+    types = ITEM_ROUTES[args.route]['types']
+
+    with app.app_context():
+        print(f"/{args.route}: {len(types)} item types, search={args.search!r}\n")
+        print(f"{'variant':<28} {'queries':>8} {'best, ms':>10} {'items':>8}")
+
+        measure('before: per-type loop', lambda: per_type_loop(types, args.search), args.repeat)
+
+        app.config['ITEM_CATALOG_ENABLED'] = False
+        measure('after: set-based query', lambda: get_items_by_type(types, args.search), args.repeat)
+
+        app.config['ITEM_CATALOG_ENABLED'] = True
+        get_item_catalog()  # Прогрев - первая загрузка не входит в замер
+        measure('after: catalog (warm)', lambda: get_items_by_type(types, args.search), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
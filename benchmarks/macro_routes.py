@@ -0,0 +1,159 @@
+"""Macro benchmarks: every blueprint route through the Flask test client.
+
+    python -m benchmarks.macro_routes [--scale small] [--repeat 20] [--with-caches] [--endpoint items.item_detail]
+
+The app reads the synthetic fixture with ``DB_BACKEND=sqlite``, so full
+requests (queries, FanOut, templates, JSON) are timed without MSSQL. By
+default the service and response caches are off and every request does the
+work; ``--with-caches`` measures the warm path instead. The in-memory
+catalogs and graphs stay on either way and are loaded before timing.
+
+Every registered endpoint must have a case here; the run fails on an
+endpoint without one. Write endpoints are listed as skipped (the fixture
+backend is read-only).
+"""
+import argparse
+import sys
+from typing import Dict, List
+
+from flask import Flask
+
+from benchmarks.harness import prepare, print_result, save_results, suite_arguments, time_call
+from services.database import execute_query
+from services.sqlite_backend import SQLiteBackend, get_sqlite_backend
+
+# Эндпоинты, которые пишут в БД - на снимке только для чтения не замеряются
+WRITE_ENDPOINTS = {'chests.save_chest_loot'}
+
+
+def _first(query: str, default: int = 1) -> int:
+    row = execute_query(query, fetch_one=True)
+    return row[0] if row and row[0] is not None else default
+
+
+# Страница предмета требует иконку (DT_ItemResource с RType = 2)
+WITH_ICON = "IN (SELECT ROwnerID FROM DT_ItemResource WHERE RType = 2)"
+
+
+def sample_ids() -> Dict[str, int]:
+    """IDs from the fixture that have data behind every page section"""
+    return {
+        'item': _first(f"SELECT MIN(RItemID0) FROM DT_Refine WHERE RItemID0 {WITH_ICON}"),
+        'material': _first("SELECT MIN(RItemID) FROM DT_RefineMaterial"),
+        'drop_item': _first(f"SELECT MIN(DItem) FROM DT_DropItem WHERE DItem {WITH_ICON}"),
+        'bead_item': _first(f"SELECT MIN(IID) FROM DT_Bead WHERE IID {WITH_ICON}"),
+        'monster': _first("SELECT MIN(MID) FROM DT_MonsterDrop"),
+        'skill': _first("SELECT MIN(SID) FROM DT_SkillAbnormal"),
+        'abnormal': _first("SELECT MIN(AbnormalID) FROM DT_SkillAbnormal"),
+        'quest': _first("SELECT MIN(mQuestNo) FROM TblQuest"),
+        'chest': 929,
+    }
+
+
+def route_cases(ids: Dict[str, int]) -> List[Dict]:
+    """Requests per endpoint: name, endpoint, url and test client kwargs"""
+    ajax = {'X-Requested-With': 'XMLHttpRequest'}
+
+    def case(endpoint, name, url, **kwargs):
+        return {'endpoint': endpoint, 'name': name, 'url': url, 'kwargs': kwargs}
+
+    return [
+        case('items.item_page', 'GET /weapon', '/weapon'),
+        case('items.item_page', 'GET /item_all (AJAX)', '/item_all?levelMin=10&levelMax=60', headers=ajax),
+        case('items.item_page', 'GET /item_all (AJAX ndjson)', '/item_all?format=ndjson', headers=ajax),
+        case('items.item_detail', 'GET /item/<recipe product>', f"/item/{ids['item']}"),
+        case('items.item_detail', 'GET /item/<drop + material>', f"/item/{ids['drop_item']}"),
+        case('items.item_detail', 'GET /item/<bead>', f"/item/{ids['bead_item']}"),
+        case('monsters.monster_page', 'GET /monster_all', '/monster_all'),
+        case('monsters.monster_page', 'GET /monster_all (AJAX)', '/monster_all?mLevelMin=10', headers=ajax),
+        case('monsters.monster_detail', 'GET /monster/<id>', f"/monster/{ids['monster']}"),
+        case('skills.skills_list', 'GET /skills', '/skills'),
+        case('skills.skill_detail', 'GET /skill/<id>', f"/skill/{ids['skill']}"),
+        case('abnormals.abnormals_list', 'GET /abnormals', '/abnormals'),
+        case('abnormals.abnormal_detail', 'GET /abnormal/<id>', f"/abnormal/{ids['abnormal']}"),
+        case('merchants.merchants_list', 'GET /merchants', '/merchants'),
+        case('chests.chest_list', 'GET /chests', '/chests'),
+        case('chests.get_item_info', 'GET /api/item-info/<id>', f"/api/item-info/{ids['item']}"),
+        case('chests.get_chest_loot', 'GET /api/chest-loot/<mid>', f"/api/chest-loot/{ids['chest']}"),
+        case('quests.quest_list', 'GET /quests', '/quests'),
+        case('quests.quest_details_api', 'GET /api/quest/<no>', f"/api/quest/{ids['quest']}"),
+        case('search.api_search', 'GET /api/search?q=меч', '/api/search?q=меч'),
+        case('search.api_search', 'GET /api/search?q=<id>', f"/api/search?q={ids['item']}"),
+        case('drops.api_drops', 'GET /api/drops?item=', f"/api/drops?item={ids['drop_item']}"),
+        case('drops.api_drops', 'GET /api/drops?monster=', f"/api/drops?monster={ids['monster']}"),
+        case('drops.api_farm', 'GET /api/farm/<id>', f"/api/farm/{ids['drop_item']}"),
+        case('crafts.craft_tree_api', 'GET /api/craft/<id>/tree', f"/api/craft/{ids['item']}/tree"),
+        case('crafts.craft_materials_api', 'GET /api/craft/<id>/materials', f"/api/craft/{ids['item']}/materials"),
+        case('crafts.craft_buildable_api', 'POST /api/craft/buildable', '/api/craft/buildable',
+             method='POST', json={'inventory': {str(ids['material']): 100}}),
+        case('stats.api_stats', 'GET /api/stats', '/api/stats'),
+    ]
+
+
+def uncovered_endpoints(app: Flask, cases: List[Dict]) -> List[str]:
+    covered = {c['endpoint'] for c in cases} | WRITE_ENDPOINTS | {'static'}
+    return sorted(rule.endpoint for rule in app.url_map.iter_rules() if rule.endpoint not in covered)
+
+
+def run_case(client, backend: SQLiteBackend, case: Dict, repeat: int) -> Dict:
+    kwargs = dict(case['kwargs'])
+    method = kwargs.pop('method', 'GET')
+    last = {}
+
+    def request():
+        response = client.open(case['url'], method=method, **kwargs)
+        last['status'], last['bytes'] = response.status_code, len(response.get_data())
+
+    before = backend.stats['queries']
+    result = {'name': case['name'], 'endpoint': case['endpoint'], 'url': case['url']}
+    result.update(time_call(request, repeat))
+    # Запросы к БД на один HTTP-запрос (прогрев тоже считается)
+    result['queries_per_request'] = (backend.stats['queries'] - before) / (repeat + 1)
+    result['status'] = last['status']
+    result['bytes'] = last['bytes']
+    result['detail'] = f"{last['status']} {last['bytes']:>9} B {result['queries_per_request']:>6.1f} q"
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every route through the Flask test client over the synthetic fixture")
+    suite_arguments(parser)
+    parser.add_argument('--with-caches', action='store_true', help="keep the service and response caches on")
+    parser.add_argument('--endpoint', action='append', help="run only these endpoints (repeatable)")
+    args = parser.parse_args()
+
+    app, meta = prepare(args)
+    app.config['SERVICE_CACHE_ENABLED'] = args.with_caches
+    app.config['RESPONSE_CACHE_ENABLED'] = args.with_caches
+    meta['with_caches'] = args.with_caches
+
+    with app.app_context():
+        cases = route_cases(sample_ids())
+        backend = get_sqlite_backend()
+    missing = uncovered_endpoints(app, cases)
+    if missing:
+        print(f"[FAIL] No benchmark case for: {', '.join(missing)}")
+        sys.exit(1)
+
+    results, failed = [], []
+    client = app.test_client()
+    print(f"\n{'route':<44} {'median, ms':>10} {'p95, ms':>10}")
+    for case in cases:
+        if args.endpoint and case['endpoint'] not in args.endpoint:
+            continue
+        result = run_case(client, backend, case, args.repeat)
+        print_result(result)
+        results.append(result)
+        if result['status'] >= 400:
+            failed.append(case['name'])
+    for endpoint in sorted(WRITE_ENDPOINTS):
+        print(f"[SKIP] {endpoint} (writes to the database)")
+
+    print(f"\nSaved {save_results('macro_routes', results, meta, args.output)}")
+    if failed:
+        print(f"[FAIL] Error responses: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Micro-benchmarks of the hot service functions over the synthetic fixture.
+
+    python -m benchmarks.micro_services [--scale small] [--repeat 20] [--only filters]
+
+Covers listing filters (apply_filters / apply_monster_filters, on catalog
+selections and on plain lists), chest script parsing (warm and cold parse
+cache), item_to_dict / monster_to_dict serialization and the quest grouping
+behind get_quests_data. Catalogs are loaded before timing starts.
+"""
+import argparse
+from typing import Callable, Dict, List
+
+import services.chest_script as chest_script
+from benchmarks.harness import prepare, print_result, save_results, suite_arguments, time_call
+from routes.item_routes import ITEM_ROUTES
+from routes.monster_routes import MONSTER_ROUTES
+from services.chest_service import get_chest_script, parse_script
+from services.item_service import apply_filters, get_items_by_type, item_to_dict
+from services.monster_service import apply_monster_filters, get_monsters_by_class, monster_to_dict
+from services.quest_catalog import assemble_quests
+from services.quest_service import get_quests_data
+
+ITEM_FILTERS = {'levelMin': '10', 'levelMax': '60', 'IDHITMin': '5', 'stackableFilter': '0', 'eventItemFilter': '0'}
+MONSTER_FILTERS = {'mLevelMin': '10', 'mLevelMax': '60', 'raceFilter': '3', 'eventMonsterFilter': ''}
+MONSTER_TICK_FILTERS = dict(MONSTER_FILTERS, mTickMin='60')
+CHEST_MID = 929
+
+
+def _clear_parse_cache():
+    with chest_script._cache_lock:
+        chest_script._cache.clear()
+
+
+def cases() -> List[Dict]:
+    """(group, name, func, setup, detail) of every case; data comes from the current app"""
+    items, _ = get_items_by_type(ITEM_ROUTES['item_all']['types'])
+    item_list = list(items)
+    monsters, _ = get_monsters_by_class(MONSTER_ROUTES['monster_all']['classes'])
+    monster_list = list(monsters)
+    script = get_chest_script(CHEST_MID) or ''
+
+    def filtered(func: Callable, records, filters) -> str:
+        return f"{len(records)} -> {len(func(records, filters))}"
+
+    return [
+        {'group': 'filters', 'name': 'apply_filters (catalog selection)',
+         'func': lambda: apply_filters(items, ITEM_FILTERS), 'detail': filtered(apply_filters, items, ITEM_FILTERS)},
+        {'group': 'filters', 'name': 'apply_filters (plain list)',
+         'func': lambda: apply_filters(item_list, ITEM_FILTERS), 'detail': filtered(apply_filters, item_list, ITEM_FILTERS)},
+        {'group': 'filters', 'name': 'apply_monster_filters (catalog selection)',
+         'func': lambda: apply_monster_filters(monsters, MONSTER_FILTERS),
+         'detail': filtered(apply_monster_filters, monsters, MONSTER_FILTERS)},
+        {'group': 'filters', 'name': 'apply_monster_filters (list + mTick)',
+         'func': lambda: apply_monster_filters(monster_list, MONSTER_TICK_FILTERS),
+         'detail': filtered(apply_monster_filters, monster_list, MONSTER_TICK_FILTERS)},
+        {'group': 'chest', 'name': 'parse_script (parse cache warm)',
+         'func': lambda: parse_script(script, CHEST_MID), 'detail': f"{len(script)} chars"},
+        {'group': 'chest', 'name': 'parse_script (parse cache cold)',
+         'func': lambda: parse_script(script, CHEST_MID), 'setup': _clear_parse_cache,
+         'detail': f"{len(parse_script(script, CHEST_MID)[0])} entries"},
+        {'group': 'serialize', 'name': 'item_to_dict (all items)',
+         'func': lambda: [item_to_dict(item) for item in items], 'detail': f"{len(items)} items"},
+        {'group': 'serialize', 'name': 'monster_to_dict (all monsters)',
+         'func': lambda: [monster_to_dict(monster) for monster in monsters], 'detail': f"{len(monsters)} monsters"},
+        {'group': 'quests', 'name': 'assemble_quests (SQL rows -> grouped quests)',
+         'func': assemble_quests, 'detail': f"{len(assemble_quests())} quests"},
+        {'group': 'quests', 'name': 'get_quests_data (catalog warm)',
+         'func': get_quests_data, 'detail': f"{len(get_quests_data())} quests"},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of service functions over the synthetic fixture")
+    suite_arguments(parser)
+    parser.add_argument('--only', action='append', choices=['filters', 'chest', 'serialize', 'quests'],
+                        help="run only these groups (repeatable)")
+    args = parser.parse_args()
+
+    app, meta = prepare(args)
+    results = []
+    with app.app_context():
+        selected = [case for case in cases() if not args.only or case['group'] in args.only]
+        print(f"\n{'case':<44} {'median, ms':>10} {'p95, ms':>10}")
+        for case in selected:
+            result = {'name': case['name'], 'group': case['group'], 'detail': case['detail']}
+            result.update(time_call(case['func'], args.repeat, setup=case.get('setup')))
+            print_result(result)
+            results.append(result)
+
+    print(f"\nSaved {save_results('micro_services', results, meta, args.output)}")
+
+
+if __name__ == '__main__':
+    main()
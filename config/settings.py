@@ -10,6 +10,16 @@ SKILLAPPLYRACE_URL = "https://docs.google.com/spreadsheets/d/1Vz-YWTOGnFUqzlieWf
 ATTRIBUTE_TYPE_WEAPON_URL ="https://docs.google.com/spreadsheets/d/1p8ghiK3AR7Qy-Ckpc3tRcHgIDm507S5i_JBXHHe1dHM/edit?usp=sharing"
 ATTRIBUTE_TYPE_ARMOR_URL ="https://docs.google.com/spreadsheets/d/1Y7Ryq9utZ3643XuvlDHhkLAshC6aZ0n9awoYFAq6wmw/edit?usp=sharing"
 
+# Все таблицы, которые кэшируются локально (python -m services.sheets_cache)
+SHEET_URLS = {
+    'monster_class': MONSTER_CLASS_URL,
+    'monster_race': MONSTER_RACE_URL,
+    'monster_location': MONSTER_LOCATION_URL,
+    'skill_apply_race': SKILLAPPLYRACE_URL,
+    'attribute_type_weapon': ATTRIBUTE_TYPE_WEAPON_URL,
+    'attribute_type_armor': ATTRIBUTE_TYPE_ARMOR_URL,
+}
+
 # GitHub URL
 GITHUB_URL = "https://raw.githubusercontent.com/Aksel911/R2-HTML-DB/main/static/"
 
@@ -23,18 +33,96 @@ def get_database_config():
         'PWD': os.getenv('DB_PASSWORD'),
     }
 
+def get_pool_config():
+    """Get connection pool configuration from environment variables"""
+    return {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+        'max_uses': int(os.getenv('DB_POOL_MAX_USES', 1000)),          # Пересоздать соединение после N выдач
+        'max_age': float(os.getenv('DB_POOL_MAX_AGE', 1800)),          # ... или через T секунд
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', 30)),            # Сколько ждать свободное соединение
+        'health_check_interval': float(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', 30)),
+    }
+
+def get_sheets_cache_config():
+    """Get Google Sheets snapshot cache configuration from environment variables"""
+    return {
+        'cache_dir': os.getenv('SHEETS_CACHE_DIR', 'cache/sheets'),
+        'ttl': float(os.getenv('SHEETS_CACHE_TTL', 3600)),             # Через сколько секунд обновлять в фоне
+        'offline': os.getenv('SHEETS_OFFLINE', '0').lower() in ('1', 'true', 'yes'),
+        'timeout': float(os.getenv('SHEETS_FETCH_TIMEOUT', 10)),
+    }
+
+def get_asset_manifest_config():
+    """Get static asset manifest configuration from environment variables"""
+    return {
+        'path': os.getenv('ASSET_MANIFEST_PATH', 'cache/asset_manifest.json'),
+        'local_dir': os.getenv('ASSET_LOCAL_DIR') or None,              # static/ локального клона R2-HTML-DB
+        'ttl': float(os.getenv('ASSET_MANIFEST_TTL', 86400)),          # Через сколько секунд обновлять в фоне
+        'offline': os.getenv('ASSET_MANIFEST_OFFLINE', '0').lower() in ('1', 'true', 'yes'),
+        'timeout': float(os.getenv('ASSET_FETCH_TIMEOUT', 30)),
+    }
+
 def load_config(app):
     """Load all configuration settings"""
     load_dotenv()
     
-    # Check required environment variables
-    required_env_vars = ['DB_USER', 'DB_PASSWORD']
+    # Check required environment variables (снимку SQLite учетные данные MSSQL не нужны)
+    db_backend = os.getenv('DB_BACKEND', 'mssql').lower()
+    required_env_vars = ['DB_USER', 'DB_PASSWORD'] if db_backend != 'sqlite' else []
     missing_vars = [var for var in required_env_vars if not os.getenv(var)]
     if missing_vars:
         raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
     
     # Set Flask configuration
     app.config['DATABASE_CONFIG'] = get_database_config()
+    app.config['DB_POOL'] = get_pool_config()
+    # Источник данных: mssql или sqlite (локальный снимок только для чтения, python -m services.sqlite_backend)
+    app.config['DB_BACKEND'] = db_backend
+    app.config['SQLITE_PATH'] = os.getenv('SQLITE_PATH', 'cache/fnlparm.sqlite')
     app.config['GITHUB_URL'] = GITHUB_URL
     app.config['DATABASE_NAME'] = os.getenv('DB_NAME', 'FNLParm')
-    app.config['PORT'] = os.getenv('PORT', 5000) # Default port = 5000
\ No newline at end of file
+    app.config['PORT'] = os.getenv('PORT', 5000) # Default port = 5000
+
+    # Каталог DT_Item в памяти
+    app.config['ITEM_CATALOG_ENABLED'] = os.getenv('ITEM_CATALOG_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    app.config['ITEM_CATALOG_TTL'] = float(os.getenv('ITEM_CATALOG_TTL', 300))  # Как часто проверять изменения
+
+    # Каталог DT_Monster (+ время респауна из TblMonsterSpot) в памяти
+    app.config['MONSTER_CATALOG_ENABLED'] = os.getenv('MONSTER_CATALOG_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    app.config['MONSTER_CATALOG_TTL'] = float(os.getenv('MONSTER_CATALOG_TTL', 300))
+
+    # Собранные квесты (/quests, /api/quest/<no>) в памяти
+    app.config['QUEST_CATALOG_ENABLED'] = os.getenv('QUEST_CATALOG_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    app.config['QUEST_CATALOG_TTL'] = float(os.getenv('QUEST_CATALOG_TTL', 600))
+
+    # Разобранный дроп сундуков (общий для всех процессов, пересобирается при сохранении)
+    app.config['CHEST_CACHE_DIR'] = os.getenv('CHEST_CACHE_DIR', 'cache/chests')
+
+    # Граф дропа (монстр <-> предметы) в памяти
+    app.config['DROP_GRAPH_ENABLED'] = os.getenv('DROP_GRAPH_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    app.config['DROP_GRAPH_TTL'] = float(os.getenv('DROP_GRAPH_TTL', 600))
+
+    # Граф рецептов крафта (DT_Refine / DT_RefineMaterial) в памяти
+    app.config['CRAFT_GRAPH_ENABLED'] = os.getenv('CRAFT_GRAPH_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    app.config['CRAFT_GRAPH_TTL'] = float(os.getenv('CRAFT_GRAPH_TTL', 600))
+
+    # Кэш геттеров сервисов (@cached): время жизни записи в секундах
+    app.config['SERVICE_CACHE_ENABLED'] = os.getenv('SERVICE_CACHE_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    app.config['SERVICE_CACHE_TTL'] = float(os.getenv('SERVICE_CACHE_TTL', 300))
+
+    # Кэш готовых страниц /item, /monster, /skill, /abnormal (ETag + 304, stale-while-revalidate)
+    app.config['RESPONSE_CACHE_ENABLED'] = os.getenv('RESPONSE_CACHE_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    app.config['RESPONSE_CACHE_TTL'] = float(os.getenv('RESPONSE_CACHE_TTL', 300))       # Свежая страница
+    app.config['RESPONSE_CACHE_STALE'] = float(os.getenv('RESPONSE_CACHE_STALE', 3600))  # Отдается, пока перерисовывается в фоне
+    app.config['RESPONSE_CACHE_MAXSIZE'] = int(os.getenv('RESPONSE_CACHE_MAXSIZE', 2000))
+
+    # Поисковый индекс имен (/api/search)
+    app.config['SEARCH_INDEX_TTL'] = float(os.getenv('SEARCH_INDEX_TTL', 600))
+
+    # Потоки для параллельных подзапросов детальных страниц (не больше DB_POOL_MAX_SIZE)
+    app.config['FANOUT_MAX_WORKERS'] = int(os.getenv('FANOUT_MAX_WORKERS', 8))
+    # Сколько секунд страница монстра ждет подзапросы; опоздавшие секции рендерятся пустыми
+    app.config['MONSTER_PAGE_DEADLINE'] = float(os.getenv('MONSTER_PAGE_DEADLINE', 3.0))
+    # ?_debug=timing (JSON с запросами страницы), тексты SQL в Server-Timing и /api/stats
+    app.config['DEBUG_TIMING_ENABLED'] = os.getenv('DEBUG_TIMING_ENABLED', '0').lower() in ('1', 'true', 'yes')
\ No newline at end of file
@@ -2,6 +2,27 @@ from dataclasses import dataclass
 from os.path import splitext
 from flask import current_app
 
+# Колонки DT_Item, которые читает DT_Item.from_row
+ITEM_COLUMNS = """
+    IID, IName, IType, ILevel, IDHIT, IDDD, IRHIT, IRDD, IMHIT, IMDD,
+    IHPPlus, IMPPlus, ISTR, IDEX, IINT, IMaxStack, IWeight, IUseType,
+    IUseNum, IRecycle, IHPRegen, IMPRegen, IAttackRate, IMoveRate,
+    ICritical, ITermOfValidity, ITermOfValidityMi, IDesc, IStatus,
+    IFakeID, IFakeName, IUseMsg, IRange, IUseClass, IDropEffect,
+    IUseLevel, IUseEternal, IUseDelay, IUseInAttack, IIsEvent,
+    IIsIndict, IAddWeight, ISubType, IIsCharge, INationOp,
+    IPShopItemType, IQuestNo, IIsTest, IQuestNeedCnt, IContentsLv,
+    IIsConfirm, IIsSealable, IAddDDWhenCritical, mSealRemovalNeedCnt,
+    mIsPracticalPeriod, mIsReceiveTown, IIsReinforceDestroy,
+    IAddPotionRestore, IAddMaxHpWhenTransform, IAddMaxMpWhenTransform,
+    IAddAttackRateWhenTransform, IAddMoveRateWhenTransform, ISupportType,
+    ITermOfValidityLv, mIsUseableUTGWSvr, IAddShortAttackRange,
+    IAddLongAttackRange, IWeaponPoisonType, IDPV, IMPV, IRPV, IDDV,
+    IMDV, IRDV, IHDPV, IHMPV, IHRPV, IHDDV, IHMDV, IHRDV,
+    ISubDDWhenCritical, IGetItemFeedback, IEnemySubCriticalHit,
+    IIsPartyDrop, IMaxBeadHoleCount, ISubTypeOption, mIsDeleteArenaSvr
+"""
+
 @dataclass
 class DT_Item:
     """Data class for items"""
@@ -97,6 +118,99 @@ class DT_Item:
         # Преобразование URL класса
         self.IUseClass = f"{current_app.config['GITHUB_URL']}class/{self.IUseClass}.png"
 
+    @classmethod
+    def from_row(cls, row) -> 'DT_Item':
+        """Build DT_Item from a DT_Item row selected with ITEM_COLUMNS"""
+        return cls(
+            IID=row.IID,
+            IName=row.IName,
+            IType=row.IType,
+            ILevel=row.ILevel,
+            IDHIT=row.IDHIT,
+            IDDD=row.IDDD,
+            IRHIT=row.IRHIT,
+            IRDD=row.IRDD,
+            IMHIT=row.IMHIT,
+            IMDD=row.IMDD,
+            IHPPlus=row.IHPPlus,
+            IMPPlus=row.IMPPlus,
+            ISTR=row.ISTR,
+            IDEX=row.IDEX,
+            IINT=row.IINT,
+            IMaxStack=row.IMaxStack,
+            IWeight=float(row.IWeight),
+            IUseType=row.IUseType,
+            IUseNum=row.IUseNum,
+            IRecycle=row.IRecycle,
+            IHPRegen=row.IHPRegen,
+            IMPRegen=row.IMPRegen,
+            IAttackRate=row.IAttackRate,
+            IMoveRate=row.IMoveRate,
+            ICritical=row.ICritical,
+            ITermOfValidity=row.ITermOfValidity,
+            ITermOfValidityMi=row.ITermOfValidityMi,
+            IDesc=row.IDesc.replace('\\n', ' ⭑ ') if row.IDesc else '',
+            IStatus=row.IStatus,
+            IFakeID=row.IFakeID,
+            IFakeName=row.IFakeName,
+            IUseMsg=row.IUseMsg,
+            IRange=row.IRange,
+            IUseClass=row.IUseClass,
+            IDropEffect=row.IDropEffect,
+            IUseLevel=row.IUseLevel,
+            IUseEternal=bool(row.IUseEternal),
+            IUseDelay=row.IUseDelay,
+            IUseInAttack=bool(row.IUseInAttack),
+            IIsEvent=bool(row.IIsEvent),
+            IIsIndict=bool(row.IIsIndict),
+            IAddWeight=float(row.IAddWeight),
+            ISubType=row.ISubType,
+            IIsCharge=bool(row.IIsCharge),
+            INationOp=row.INationOp,
+            IPShopItemType=row.IPShopItemType,
+            IQuestNo=row.IQuestNo,
+            IIsTest=bool(row.IIsTest),
+            IQuestNeedCnt=row.IQuestNeedCnt,
+            IContentsLv=row.IContentsLv,
+            IIsConfirm=bool(row.IIsConfirm),
+            IIsSealable=bool(row.IIsSealable),
+            IAddDDWhenCritical=row.IAddDDWhenCritical,
+            mSealRemovalNeedCnt=row.mSealRemovalNeedCnt,
+            mIsPracticalPeriod=bool(row.mIsPracticalPeriod),
+            mIsReceiveTown=bool(row.mIsReceiveTown),
+            IIsReinforceDestroy=bool(row.IIsReinforceDestroy),
+            IAddPotionRestore=row.IAddPotionRestore,
+            IAddMaxHpWhenTransform=row.IAddMaxHpWhenTransform,
+            IAddMaxMpWhenTransform=row.IAddMaxMpWhenTransform,
+            IAddAttackRateWhenTransform=row.IAddAttackRateWhenTransform,
+            IAddMoveRateWhenTransform=row.IAddMoveRateWhenTransform,
+            ISupportType=row.ISupportType,
+            ITermOfValidityLv=row.ITermOfValidityLv,
+            mIsUseableUTGWSvr=bool(row.mIsUseableUTGWSvr),
+            IAddShortAttackRange=row.IAddShortAttackRange,
+            IAddLongAttackRange=row.IAddLongAttackRange,
+            IWeaponPoisonType=row.IWeaponPoisonType,
+            IDPV=row.IDPV,
+            IMPV=row.IMPV,
+            IRPV=row.IRPV,
+            IDDV=row.IDDV,
+            IMDV=row.IMDV,
+            IRDV=row.IRDV,
+            IHDPV=row.IHDPV,
+            IHMPV=row.IHMPV,
+            IHRPV=row.IHRPV,
+            IHDDV=row.IHDDV,
+            IHMDV=row.IHMDV,
+            IHRDV=row.IHRDV,
+            ISubDDWhenCritical=row.ISubDDWhenCritical,
+            IGetItemFeedback=row.IGetItemFeedback,
+            IEnemySubCriticalHit=row.IEnemySubCriticalHit,
+            IIsPartyDrop=bool(row.IIsPartyDrop),
+            IMaxBeadHoleCount=row.IMaxBeadHoleCount,
+            ISubTypeOption=row.ISubTypeOption,
+            mIsDeleteArenaSvr=bool(row.mIsDeleteArenaSvr)
+        )
+
 @dataclass
 class DT_ItemResource:
     """Data class for item resources"""
@@ -1,6 +1,22 @@
 from dataclasses import dataclass
 from typing import Dict
 
+# Колонки DT_Monster, которые читает Monster.from_row
+MONSTER_COLUMNS = """
+    MID, MName, mLevel, MClass, MExp, MHIT, MMinD, MMaxD, MAttackRateOrg,
+    MMoveRateOrg, MAttackRateNew, MMoveRateNew, MHP, MMP, MMoveRange,
+    MGbjType, MRaceType, MAiType, MCastingDelay, MChaotic, MSameRace1,
+    MSameRace2, MSameRace3, MSameRace4, mSightRange, mAttackRange,
+    mSkillRange, mBodySize, mDetectTransF, mDetectTransP, mDetectChao,
+    mAiEx, mScale, mIsResistTransF, mIsEvent, mIsTest, mHPNew, mMPNew,
+    mBuyMerchanID, mSellMerchanID, mChargeMerchanID, mTransformWeight,
+    mNationOp, mHPRegen, mMPRegen, IContentsLv, mIsEventTest, mIsShowHp,
+    mSupportType, mVolitionOfHonor, mWMapIconType,
+    mIsAmpliableTermOfValidity, mAttackType, mTransType, mDPV, mMPV, mRPV,
+    mDDV, mMDV, mRDV, mSubDDWhenCritical, mEnemySubCriticalHit, mEventQuest,
+    mEScale
+"""
+
 @dataclass
 class Monster:
     """Data class for monsters"""
@@ -68,6 +84,77 @@ class Monster:
     mEnemySubCriticalHit: float
     mEventQuest: bool
     mEScale: float
+
+    @classmethod
+    def from_row(cls, row) -> 'Monster':
+        """Build a Monster from a DT_Monster row selected with MONSTER_COLUMNS"""
+        return cls(
+            MID=row.MID,
+            MName=row.MName,
+            mLevel=row.mLevel,
+            MClass=row.MClass,
+            MExp=row.MExp,
+            MHIT=row.MHIT,
+            MMinD=row.MMinD,
+            MMaxD=row.MMaxD,
+            MAttackRateOrg=row.MAttackRateOrg,
+            MMoveRateOrg=row.MMoveRateOrg,
+            MAttackRateNew=row.MAttackRateNew,
+            MMoveRateNew=row.MMoveRateNew,
+            MHP=row.MHP,
+            MMP=row.MMP,
+            MMoveRange=row.MMoveRange,
+            MGbjType=row.MGbjType,
+            MRaceType=row.MRaceType,
+            MAiType=row.MAiType,
+            MCastingDelay=row.MCastingDelay,
+            MChaotic=row.MChaotic,
+            MSameRace1=row.MSameRace1,
+            MSameRace2=row.MSameRace2,
+            MSameRace3=row.MSameRace3,
+            MSameRace4=row.MSameRace4,
+            mSightRange=row.mSightRange,
+            mAttackRange=row.mAttackRange,
+            mSkillRange=row.mSkillRange,
+            mBodySize=row.mBodySize,
+            mDetectTransF=int(row.mDetectTransF),
+            mDetectTransP=int(row.mDetectTransP),
+            mDetectChao=int(row.mDetectChao),
+            mAiEx=row.mAiEx,
+            mScale=row.mScale,
+            mIsResistTransF=int(row.mIsResistTransF),
+            mIsEvent=int(row.mIsEvent),
+            mIsTest=int(row.mIsTest),
+            mHPNew=row.mHPNew,
+            mMPNew=row.mMPNew,
+            mBuyMerchanID=row.mBuyMerchanID,
+            mSellMerchanID=row.mSellMerchanID,
+            mChargeMerchanID=row.mChargeMerchanID,
+            mTransformWeight=row.mTransformWeight,
+            mNationOp=row.mNationOp,
+            mHPRegen=row.mHPRegen,
+            mMPRegen=row.mMPRegen,
+            IContentsLv=row.IContentsLv,
+            mIsEventTest=int(row.mIsEventTest),
+            mIsShowHp=int(row.mIsShowHp),
+            mSupportType=row.mSupportType,
+            mVolitionOfHonor=row.mVolitionOfHonor,
+            mWMapIconType=row.mWMapIconType,
+            mIsAmpliableTermOfValidity=int(row.mIsAmpliableTermOfValidity),
+            mAttackType=row.mAttackType,
+            mTransType=row.mTransType,
+            mDPV=row.mDPV,
+            mMPV=row.mMPV,
+            mRPV=row.mRPV,
+            mDDV=row.mDDV,
+            mMDV=row.mMDV,
+            mRDV=row.mRDV,
+            mSubDDWhenCritical=row.mSubDDWhenCritical,
+            mEnemySubCriticalHit=row.mEnemySubCriticalHit,
+            mEventQuest=int(row.mEventQuest),
+            mEScale=row.mEScale
+        )
+
     # def to_dict(self) -> Dict:
     #     """Convert monster to dictionary with formatted fields"""
     #     return {
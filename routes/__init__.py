@@ -6,6 +6,10 @@ from routes.abnormal_routes import bp as abnormal_bp
 from routes.merchant_routes import bp as merchant_bp
 from routes.chest_routes import bp as chest_bp
 from routes.quest_routes import bp as quest_bp
+from routes.search_routes import bp as search_bp
+from routes.drop_routes import bp as drop_bp
+from routes.craft_routes import bp as craft_bp
+from routes.stats_routes import bp as stats_bp
 
 __all__ = ['register_routes']
 
@@ -17,4 +21,8 @@ def register_routes(app: Flask):
     app.register_blueprint(abnormal_bp)
     app.register_blueprint(merchant_bp)
     app.register_blueprint(chest_bp)
-    app.register_blueprint(quest_bp)
\ No newline at end of file
+    app.register_blueprint(quest_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(drop_bp)
+    app.register_blueprint(craft_bp)
+    app.register_blueprint(stats_bp)
\ No newline at end of file
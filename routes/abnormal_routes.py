@@ -5,10 +5,12 @@ from services.abnormal_service import (
     get_abnormal_items,
     get_abnormal_skills
 )
+from services.response_cache import cached_page
 
 bp = Blueprint('abnormals', __name__)
 
 @bp.route('/abnormal/<int:aid>')
+@cached_page('abnormal', 'aid')
 def abnormal_detail(aid: int):
     """Abnormal effect detail page"""
     abnormal = get_abnormal_detail(aid)
@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, jsonify, request
-from services.chest_service import get_chest_route_call, get_chest_script, analyze_drops, update_chest_loot
+from services.chest_service import get_chest_route_call, get_cached_drops, update_chest_loot
 from services.item_service import get_item_name, get_item_pic_url, get_item_resource
 
 bp = Blueprint('chests', __name__)
@@ -17,6 +17,9 @@ def chest_list():
         if item['MID'] not in items_by_mid:
             items_by_mid[item['MID']] = []
         items_by_mid[item['MID']].append(item)
+    # На странице - от самого частого к самому редкому
+    for mid_items in items_by_mid.values():
+        mid_items.sort(key=lambda x: x['probability'], reverse=True)
     
     # Формируем финальный список, используя словарь
     formatted_items = [
@@ -27,7 +30,8 @@ def chest_list():
             'item_id': 0,
             'item_name': 'No items',
             'item_pic': '',
-            'drop_chance': 0
+            'drop_chance': 0,
+            'probability': 0
         }]) for mid in chest_mids
     ]
     
@@ -56,11 +60,7 @@ def get_item_info(item_id):
 def get_chest_loot(mid):
     """Получение текущего содержимого сундука"""
     try:
-        script = get_chest_script(mid)
-        if not script:
-            return jsonify({'items': []})
-            
-        drops, _ = analyze_drops(mid)
+        drops, _ = get_cached_drops(mid)
         if not drops:
             return jsonify({'items': []})
             
@@ -71,6 +71,7 @@ def get_chest_loot(mid):
             'MName': drop['MName'],
             'MID_pic': drop['MID_pic'],
             'dropChance': round(drop['drop_chance'] / 100),  # Конвертируем в проценты
+            'probability': drop['probability'],
             'count': drop.get('count', 1),  # Получаем количество или используем 1 по умолчанию
             'status': drop.get('status', 1)  # Получаем статус или используем 1 (обычный) по умолчанию
         } for drop in drops]
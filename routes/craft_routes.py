@@ -0,0 +1,55 @@
+from flask import Blueprint, jsonify, request
+
+from services.craft_graph import get_craft_graph
+from services.craft_service import get_buildable_items, get_craft_materials, get_craft_tree
+
+bp = Blueprint('crafts', __name__)
+
+
+def _quantity() -> float:
+    return max(request.args.get('quantity', 1, type=float), 0)
+
+
+@bp.route('/api/craft/<int:item_id>/tree')
+def craft_tree_api(item_id):
+    """Full recipe tree: /api/craft/<id>/tree[?quantity=1]"""
+    try:
+        graph = get_craft_graph()
+        if item_id not in graph.made_by:
+            return jsonify({'error': 'Recipe not found'}), 404
+        return jsonify({
+            'item_id': item_id,
+            'depth': graph.depth.get(item_id, 0),
+            'tree': get_craft_tree(item_id, _quantity()),
+        })
+    except Exception as e:
+        print(f"Error building craft tree: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/craft/<int:item_id>/materials')
+def craft_materials_api(item_id):
+    """Expected raw materials: /api/craft/<id>/materials[?quantity=1]"""
+    try:
+        if item_id not in get_craft_graph().made_by:
+            return jsonify({'error': 'Recipe not found'}), 404
+        return jsonify({'item_id': item_id, 'materials': get_craft_materials(item_id, _quantity())})
+    except Exception as e:
+        print(f"Error expanding craft materials: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/craft/buildable', methods=['POST'])
+def craft_buildable_api():
+    """What can be built from an inventory: POST {"inventory": {"<IID>": <count>, ...}}"""
+    data = request.get_json(silent=True) or {}
+    try:
+        inventory = {int(item_id): int(count) for item_id, count in (data.get('inventory') or {}).items()}
+    except (TypeError, ValueError, AttributeError):
+        return jsonify({'error': 'inventory must map item IDs to counts'}), 400
+
+    try:
+        return jsonify(get_buildable_items(inventory))
+    except Exception as e:
+        print(f"Error checking buildable items: {e}")
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,73 @@
+import time
+
+import numpy as np
+from flask import Blueprint, jsonify, request
+
+from services.drop_graph import get_drop_graph
+from services.farm_ranking import SORT_KEYS, rank_farm_spots
+from services.resource_loader import get_resource_loader
+
+bp = Blueprint('drops', __name__)
+
+
+@bp.route('/api/drops')
+def api_drops():
+    """Drop edges from the drop graph: /api/drops?item=<id> and/or ?monster=<id>[&limit=100]"""
+    item_id = request.args.get('item', type=int)
+    monster_id = request.args.get('monster', type=int)
+    limit = max(1, min(request.args.get('limit', 100, type=int), 1000))
+    if item_id is None and monster_id is None:
+        return jsonify({'error': 'item or monster is required'}), 400
+
+    try:
+        started = time.perf_counter()
+        graph = get_drop_graph()
+        if monster_id is not None:
+            positions = graph.monster_edges(monster_id)
+            if item_id is not None:
+                positions = positions[graph.item[positions] == item_id]
+        else:
+            positions = graph.item_edges(item_id)
+
+        # Самые вероятные ребра первыми
+        total = len(positions)
+        positions = positions[np.argsort(-graph.probability[positions], kind='stable')[:limit]]
+        drops = graph.edges(positions)
+
+        loader = get_resource_loader()
+        loader.want_items(d['DItem'] for d in drops).want_monsters(d['MID'] for d in drops)
+        for drop in drops:
+            drop['IName'] = loader.item_name(drop['DItem'])
+            drop['MName'] = loader.monster_name(drop['MID'])
+        took_ms = (time.perf_counter() - started) * 1000
+    except Exception as e:
+        print(f"Error in drops api: {e}")
+        return jsonify({'error': str(e)}), 500
+
+    return jsonify({
+        'item': item_id,
+        'monster': monster_id,
+        'total': total,
+        'drops': drops,
+        'took_ms': round(took_ms, 3),
+    })
+
+
+@bp.route('/api/farm/<int:item_id>')
+def api_farm(item_id):
+    """Best monsters to farm an item: /api/farm/<id>[?sort=hour|kill][&limit=20][&location=<text>]"""
+    sort = request.args.get('sort', 'hour')
+    if sort not in SORT_KEYS:
+        return jsonify({'error': f"sort must be one of {', '.join(SORT_KEYS)}"}), 400
+    limit = max(1, min(request.args.get('limit', 20, type=int), 500))
+    location = request.args.get('location', '')
+
+    try:
+        started = time.perf_counter()
+        spots = rank_farm_spots(item_id, sort, limit, location)
+        took_ms = (time.perf_counter() - started) * 1000
+    except Exception as e:
+        print(f"Error in farm ranking: {e}")
+        return jsonify({'error': str(e)}), 500
+
+    return jsonify({'item': item_id, 'sort': sort, 'spots': spots, 'took_ms': round(took_ms, 3)})
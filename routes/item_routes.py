@@ -19,6 +19,8 @@ from services.item_service import (
     get_item_panalty_data
 )
 from services.monster_service import get_monster_drop_info
+from routes.listing import listing_response
+from services.fanout import FanOut
 from services.merchant_service import get_merchant_sellers
 from services.craft_service import (
     check_base_items_for_craft,
@@ -26,6 +28,7 @@ from services.craft_service import (
 )
 from services.skill_service import get_item_skill, get_sid_by_spid
 from services.abnormal_service import get_abnormal_in_skill
+from services.response_cache import cached_page
 from functools import wraps
 
 bp = Blueprint('items', __name__)
@@ -146,14 +149,8 @@ def with_filters(allowed_types):
                 # Get search term
                 search_term = request.args.get('search', '')
                 
-                # Get initial data for allowed types
-                items = []
-                file_paths = {}
-                
-                for item_type in allowed_types:
-                    type_items, type_paths = get_items_by_type([item_type], search_term)
-                    items.extend(type_items)
-                    file_paths.update(type_paths)
+                # Get initial data for all allowed types in one pass
+                items, file_paths = get_items_by_type(allowed_types, search_term)
 
                 # If it's an AJAX request, handle filtering
                 if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -162,24 +159,9 @@ def with_filters(allowed_types):
                     # Apply filters
                     filtered_items = apply_filters(items, filters)
                     
-                    # Get pagination parameters
-                    page = request.args.get('page', 1, type=int)
-                    per_page = request.args.get('per_page', 25000, type=int) # ! PP LIMIT
-                    
-                    # Apply pagination
-                    start_idx = (page - 1) * per_page
-                    end_idx = start_idx + per_page
-                    paginated_items = filtered_items[start_idx:end_idx]
-                    
-                    # Convert to dict for response
-                    items_dict = [item_to_dict(item) for item in paginated_items]
-                    #print(items_dict)
-                    return jsonify({
-                        'items': items_dict,
-                        'resources': file_paths,
-                        'total': len(filtered_items),
-                        'pages': (len(filtered_items) + per_page - 1) // per_page
-                    })
+                    # Page by IID cursor (or stream as NDJSON), icons only for the page
+                    return listing_response(filtered_items, file_paths, item_to_dict,
+                                            key=lambda item: item.IID, collection='items')
                 
                 # For normal request, pass data to route
                 return original_route(items_wep=items, item_resources=file_paths, *args, **kwargs)
@@ -195,7 +177,25 @@ def with_filters(allowed_types):
 
 
 
+def _load_item_skill(item_id: int):
+    """Item skill data plus the abnormal effects of its linked skills (one dependent chain)"""
+    skill_data = get_item_skill(item_id)
+    if skill_data and isinstance(skill_data, tuple) and len(skill_data) == 6:
+        return skill_data, get_abnormal_in_skill(skill_data[3])
+    return skill_data, (None, None)
+
+
+def _load_rune_bead(item_id: int):
+    """Rune bead data and, for activation runes, the skill it activates"""
+    rune_bead_data = get_rune_bead_data(item_id)
+    activation_bead_data = activation_bead_pic = None
+    if rune_bead_data and rune_bead_data.mBeadType == 2:
+        activation_bead_data, activation_bead_pic = get_sid_by_spid(rune_bead_data.mParamA)
+    return rune_bead_data, activation_bead_data, activation_bead_pic
+
+
 @bp.route('/item/<int:item_id>')
+@cached_page('item', 'item_id')
 def item_detail(item_id: int):
     try:
         print(f"Item ID: {item_id}")
@@ -204,7 +204,29 @@ def item_detail(item_id: int):
         if not item:
             return "Item not found", 404
 
-        item_resource = get_item_resource(item_id)
+        # Независимые подзапросы выполняются параллельно, страница ждет самый медленный
+        tasks = FanOut()
+        tasks.submit('resource', get_item_resource, item_id)
+        tasks.submit('mondropinfo', get_monster_drop_info, item_id)
+        tasks.submit('merchant_sellers', get_merchant_sellers, item_id)
+        tasks.submit('craft_items', check_base_items_for_craft, item_id)
+        tasks.submit('craft_next', check_next_craft_item, item_id)
+        tasks.submit('specificproc', get_specific_proc_item, item_id)
+        tasks.submit('skill', _load_item_skill, item_id)
+        tasks.submit('model_resource', get_item_model_resource, item_id)
+        tasks.submit('abnormal_resist', get_itemabnormalResist_data, item_id)
+        tasks.submit('bead_module', get_item_bead_module_data, item_id)
+        tasks.submit('bead_holeprob', get_item_bead_holeprob_data, item_id)
+        tasks.submit('attribute_add', get_item_attribute_add_data, item_id)
+        tasks.submit('attribute_resist', get_item_attribute_resist_data, item_id)
+        tasks.submit('protect', get_item_protect_data, item_id)
+        tasks.submit('slain', get_item_slain_data, item_id)
+        tasks.submit('panalty', get_item_panalty_data, item_id)
+        if item.IName.startswith('Руна'):
+            tasks.submit('rune_bead', _load_rune_bead, item_id)
+        data = tasks.results()
+
+        item_resource = data['resource']
         if not item_resource:
             return "Item resource not found", 404
 
@@ -214,18 +236,11 @@ def item_detail(item_id: int):
         except (ValueError, AttributeError):
             return "Invalid item use class", 400
 
-        # Получение связанных данных
-        mondropinfo = get_monster_drop_info(item_id)
-        merchant_sellers = get_merchant_sellers(item_id)
-        craft_items = check_base_items_for_craft(item_id)
-        craft_next_item = check_next_craft_item(item_id)
-        specificproc_check = get_specific_proc_item(item_id)
-
         # Обработка данных навыков
-        skill_data = get_item_skill(item_id)
+        skill_data, abnormal_data = data['skill']
         if skill_data and isinstance(skill_data, tuple) and len(skill_data) == 6:
             itemdskill_data, itemskill_pic, linked_skills, linked_skillsaid, transform_list, monster_pic_url = skill_data
-            abnormal_type_data, abnormal_type_pic = get_abnormal_in_skill(linked_skillsaid)
+            abnormal_type_data, abnormal_type_pic = abnormal_data
         else:
             itemdskill_data = itemskill_pic = abnormal_type_data = abnormal_type_pic = None
             linked_skills = linked_skillsaid = transform_list = monster_pic_url = None
@@ -233,7 +248,7 @@ def item_detail(item_id: int):
         # Обработка модели предмета
         item_model_no = None
         prefix = 'i'
-        itemresource_result = get_item_model_resource(item_id)
+        itemresource_result = data['model_resource']
         if itemresource_result:
             base = f"{int(itemresource_result.RPosX):03}{int(itemresource_result.RPosY):03}"
             if item.IType == 3:  # Доспехи
@@ -254,24 +269,8 @@ def item_detail(item_id: int):
         elif item.IType not in [1, 18, 20, 2, 19]:  # Не оружие/щит/стрелы
             prefix = 'i'
 
-        # Проверка DT_ItemAbnormalResist
-        item_abnormalResist_data = get_itemabnormalResist_data(item_id)
-
         # Проверка DT_Bead и активации навыков
-        rune_bead_data = activation_bead_data = activation_bead_pic = None
-        if item.IName.startswith('Руна'):
-            rune_bead_data = get_rune_bead_data(item_id)
-            if rune_bead_data and rune_bead_data.mBeadType == 2:
-                activation_bead_data, activation_bead_pic = get_sid_by_spid(rune_bead_data.mParamA)
-
-        # Получение дополнительных данных предмета
-        item_bead_module_data = get_item_bead_module_data(item_id)
-        item_bead_holeprob_data = get_item_bead_holeprob_data(item_id)
-        item_attribute_add_data = get_item_attribute_add_data(item_id)
-        item_attribute_resist_data = get_item_attribute_resist_data(item_id)
-        item_protect_data = get_item_protect_data(item_id)
-        item_slain_data = get_item_slain_data(item_id)
-        item_panalty_data = get_item_panalty_data(item_id)
+        rune_bead_data, activation_bead_data, activation_bead_pic = data.get('rune_bead', (None, None, None))
 
         # Рендеринг шаблона
         return render_template(
@@ -281,11 +280,11 @@ def item_detail(item_id: int):
             use_class=use_class,
             prefix=prefix,
             monstermodelno_result=item_model_no,
-            mondropinfo=mondropinfo,
-            merchant_sellers=merchant_sellers,
-            craft_result=craft_items,
-            craft_next=craft_next_item,
-            specificproc_data=specificproc_check,
+            mondropinfo=data['mondropinfo'],
+            merchant_sellers=data['merchant_sellers'],
+            craft_result=data['craft_items'],
+            craft_next=data['craft_next'],
+            specificproc_data=data['specificproc'],
             itemdskill_data=itemdskill_data,
             itemskill_pic=itemskill_pic,
             linked_skills=linked_skills,
@@ -294,17 +293,17 @@ def item_detail(item_id: int):
             abnormal_type_pic=abnormal_type_pic,
             transform_list=transform_list,
             monster_pic_url=monster_pic_url,
-            item_abnormalResist_data=item_abnormalResist_data,
+            item_abnormalResist_data=data['abnormal_resist'],
             rune_bead_data=rune_bead_data,
             activation_bead_data=activation_bead_data,
             activation_bead_pic=activation_bead_pic,
-            item_bead_module_data=item_bead_module_data,
-            item_bead_holeprob_data=item_bead_holeprob_data,
-            item_attribute_add_data=item_attribute_add_data,
-            item_attribute_resist_data=item_attribute_resist_data,
-            item_protect_data=item_protect_data,
-            item_slain_data=item_slain_data,
-            item_panalty_data=item_panalty_data
+            item_bead_module_data=data['bead_module'],
+            item_bead_holeprob_data=data['bead_holeprob'],
+            item_attribute_add_data=data['attribute_add'],
+            item_attribute_resist_data=data['attribute_resist'],
+            item_protect_data=data['protect'],
+            item_slain_data=data['slain'],
+            item_panalty_data=data['panalty']
         )
     except Exception as e:
         print(f"Error in item detail route: {str(e)}")
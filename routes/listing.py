@@ -0,0 +1,90 @@
+"""Pagination and streaming for the AJAX listings (items, monsters).
+
+Records arrive already sorted by their ID, so the cursor is simply the last ID
+the client has seen (``?after=<id>&limit=<n>``). ``?format=ndjson`` streams
+one JSON object per line instead of building the whole body in memory::
+
+    {"total": 1234}
+    {"data": {...}, "resource": "https://..."}
+    ...
+    {"done": true, "count": 1234, "next_cursor": null}
+
+The old ``?page=&per_page=`` parameters still work, capped at MAX_LIMIT.
+"""
+from bisect import bisect_right
+from typing import Callable, Dict, List, Optional
+
+from flask import Response, current_app, jsonify, request, stream_with_context
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def _limit_arg(name: str, default: Optional[int]) -> Optional[int]:
+    limit = request.args.get(name, default, type=int)
+    if limit is None:
+        return None
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def wants_ndjson() -> bool:
+    if request.args.get('format') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+
+def _page_slice(records: List, key: Callable, limit: Optional[int]):
+    """Slice for the current request: keyset (after/limit) or legacy page/per_page"""
+    if 'page' in request.args and 'after' not in request.args:
+        per_page = _limit_arg('per_page', DEFAULT_LIMIT)
+        page = max(1, request.args.get('page', 1, type=int))
+        start = (page - 1) * per_page
+        return records[start:start + per_page], per_page
+
+    after = request.args.get('after', type=int)
+    start = bisect_right(records, after, key=key) if after is not None else 0
+    end = start + limit if limit is not None else len(records)
+    return records[start:end], limit
+
+
+def _resource_for(resources: Dict, record_id):
+    # Ключи resources бывают int или str - в JSON они всё равно станут строками
+    return resources.get(record_id, resources.get(str(record_id)))
+
+
+def listing_response(records: List, resources: Dict, to_dict: Callable, key: Callable,
+                     collection: str):
+    """JSON page (or NDJSON stream) of records; resources only for the returned records"""
+    total = len(records)
+
+    if wants_ndjson():
+        page, _ = _page_slice(records, key, _limit_arg('limit', None))
+        has_more = bool(page) and key(page[-1]) != key(records[-1])
+        dumps = current_app.json.dumps
+
+        def generate():
+            yield dumps({'total': total}) + '\n'
+            try:
+                for record in page:
+                    yield dumps({'data': to_dict(record),
+                                 'resource': _resource_for(resources, key(record))}) + '\n'
+            except Exception as e:
+                # Заголовки уже ушли - сообщаем об ошибке последней строкой
+                print(f"Error streaming {collection}: {e}")
+                yield dumps({'error': str(e)}) + '\n'
+                return
+            yield dumps({'done': True, 'count': len(page),
+                         'next_cursor': key(page[-1]) if has_more else None}) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+    page, per_page = _page_slice(records, key, _limit_arg('limit', DEFAULT_LIMIT))
+    has_more = bool(page) and key(page[-1]) != key(records[-1])
+    return jsonify({
+        collection: [to_dict(record) for record in page],
+        'resources': {key(record): _resource_for(resources, key(record)) for record in page},
+        'total': total,
+        'pages': (total + per_page - 1) // per_page,
+        'next_cursor': key(page[-1]) if has_more else None,
+    })
@@ -1,5 +1,4 @@
 from flask import Blueprint, render_template, current_app, abort, jsonify, request
-import requests
 from services.monster_service import (
     get_monster_by_id,
     get_monster_drops,
@@ -16,14 +15,17 @@ from services.monster_service import (
     
     
 )
-from services.utils import get_google_sheets_data
+from services.monster_catalog import get_monster_ticks
+from services.utils import get_monster_class_names, get_monster_race_descs, get_monster_locations
 from services.merchant_service import (
     get_merchant_items,
     get_payment_type_name
 )
 from services.database import execute_query
-from config.settings import MONSTER_CLASS_URL, MONSTER_RACE_URL, MONSTER_LOCATION_URL
-import pandas as pd
+from services.fanout import FanOut
+from services.asset_manifest import monster_gif_url, monster_pic_url
+from services.response_cache import cached_page
+from routes.listing import listing_response
 from functools import wraps
 
 bp = Blueprint('monsters', __name__)
@@ -97,24 +99,15 @@ def with_monster_filters(allowed_classes):
                     # Apply filters
                     filtered_monsters = apply_monster_filters(monsters, filters)
                     
-                    # Get pagination parameters
-                    page = request.args.get('page', 1, type=int)
-                    per_page = request.args.get('per_page', 25000, type=int) # ! PP LIMIT
-                
-                    # Apply pagination
-                    start_idx = (page - 1) * per_page
-                    end_idx = start_idx + per_page
-                    paginated_monsters = filtered_monsters[start_idx:end_idx]
-                    
-                    # Convert to dict for response
-                    monsters_dict = [monster_to_dict(item) for item in paginated_monsters]
-                    
-                    return jsonify({
-                        'monsters': monsters_dict,
-                        'resources': file_paths,
-                        'total': len(filtered_monsters),
-                        'pages': (len(filtered_monsters) + per_page - 1) // per_page
-                    })
+                    # Время респауна отдаем вместе с монстром - фильтр по нему работает и на клиенте
+                    ticks = get_monster_ticks()
+
+                    def to_dict(monster):
+                        return dict(monster_to_dict(monster), mTick=ticks.get(monster.MID, 0))
+
+                    # Page by MID cursor (or stream as NDJSON), pictures only for the page
+                    return listing_response(filtered_monsters, file_paths, to_dict,
+                                            key=lambda monster: monster.MID, collection='monsters')
                     
                 # For normal request, pass data to route
                 return original_route(items=monsters, item_resources=file_paths, *args, **kwargs)
@@ -130,12 +123,63 @@ def with_monster_filters(allowed_classes):
 
 
 
+# Что показывать вместо секции, если ее загрузка упала или не успела к дедлайну
+MONSTER_PAGE_DEFAULTS = {
+    'class_names': {},
+    'race_descs': {},
+    'locations': {},
+    'tick_normal': (0, 0),
+    'tick_event': (0, 0),
+    'model_resource': None,
+    'merchant_items': [],
+    'drops': [],
+    'abnormal_resist': None,
+    'attribute_add': None,
+    'attribute_resist': None,
+    'protect': None,
+    'slain': None,
+}
+
+
 @bp.route('/monster/<int:monster_id>')
+@cached_page('monster', 'monster_id')
 def monster_detail(monster_id: int):
     """Страница деталей монстра"""
+    # Все загрузки независимы: запускаем параллельно и ждем не дольше MONSTER_PAGE_DEADLINE,
+    # опоздавшие секции страницы рендерятся пустыми
+    deadline = current_app.config.get('MONSTER_PAGE_DEADLINE', 3.0)
+    # Картинка и анимация - по манифесту ассетов, без запросов к GitHub
+    file_path = monster_pic_url(monster_id)
+    file_path_gif = monster_gif_url(monster_id)
+
+    tasks = FanOut(timeout=deadline)
+    tasks.submit('monster', get_monster_by_id, monster_id)
+    tasks.submit('class_names', get_monster_class_names)
+    tasks.submit('race_descs', get_monster_race_descs)
+    tasks.submit('locations', get_monster_locations)
+    tasks.submit('tick_normal', get_monster_mtick, monster_id, 0)
+    tasks.submit('tick_event', get_monster_mtick, monster_id, 1)
+    tasks.submit('model_resource', get_monster_resource, monster_id)
+    tasks.submit('merchant_items', get_merchant_items, monster_id)
+    tasks.submit('drops', get_monster_drops, monster_id)
+    tasks.submit('abnormal_resist', get_monsterabnormalResist_data, monster_id)
+    tasks.submit('attribute_add', get_monster_attribute_add_data, monster_id)
+    tasks.submit('attribute_resist', get_monster_attribute_resist_data, monster_id)
+    tasks.submit('protect', get_monster_protect_data, monster_id)
+    tasks.submit('slain', get_monster_slain_data, monster_id)
+
+    # Без самого монстра страницы нет: его ошибка или таймаут не подменяются значением по умолчанию
+    try:
+        monster = tasks.result('monster')
+    except TimeoutError:
+        tasks.record_timings()
+        return "Monster data is temporarily unavailable", 503
+
     # Получение данных монстра
-    if not (monster := get_monster_by_id(monster_id)):
+    if not monster:
+        tasks.record_timings()
         return "Monster not found", 404
+    data = tasks.results(defaults=MONSTER_PAGE_DEFAULTS)
     #print(monster)
     # Преобразуем monster в словарь для удобства работы
     monster_dict = {
@@ -206,26 +250,9 @@ def monster_detail(monster_id: int):
     }
     
 
-    # Получение данных из Google Sheets
-    sheets_data = {
-        'class': get_google_sheets_data(MONSTER_CLASS_URL),
-        'race': get_google_sheets_data(MONSTER_RACE_URL),
-        'location': get_google_sheets_data(MONSTER_LOCATION_URL)
-    }
-
-    # Получение информации о классе
-    class_info = {"MName": ""}
-    if not sheets_data['class'].empty:
-        class_match = sheets_data['class'][sheets_data['class']['MClass'] == monster_dict['MClass']]
-        if not class_match.empty:
-            class_info["MName"] = class_match.iloc[0]['MName']
-
-    # Получение информации о расе
-    race_info = {"mDesc": None}
-    if not sheets_data['race'].empty:
-        race_match = sheets_data['race'][sheets_data['race']['MRaceType'] == monster_dict['MRaceType']]
-        if not race_match.empty:
-            race_info["mDesc"] = race_match.iloc[0]['mDesc']
+    # Получение информации о классе и расе из Google Sheets
+    class_info = {"MName": data['class_names'].get(monster_dict['MClass'], "")}
+    race_info = {"mDesc": data['race_descs'].get(monster_dict['MRaceType'])}
 
     
     
@@ -257,7 +284,7 @@ def monster_detail(monster_id: int):
     respawn_info_event = {}
 
     # Для mIsEvent = 0
-    mTick_normal, mVarRespawnTick_normal = get_monster_mtick(monster_id, 0)
+    mTick_normal, mVarRespawnTick_normal = data['tick_normal']
     if mTick_normal > 0:
         respawn_info_normal = {
             "normal": get_respawn_info(mTick_normal),
@@ -265,7 +292,7 @@ def monster_detail(monster_id: int):
         }
 
     # Для mIsEvent = 1
-    mTick_event, mVarRespawnTick_event = get_monster_mtick(monster_id, 1)
+    mTick_event, mVarRespawnTick_event = data['tick_event']
     if mTick_event > 0:
         respawn_info_event = {
             "normal": get_respawn_info(mTick_event),
@@ -276,41 +303,20 @@ def monster_detail(monster_id: int):
     
     
     # Получение локации монстра
-    monster_location = []
-    if not sheets_data['location'].empty:
-        location_match = sheets_data['location'][sheets_data['location']['MID'] == monster_id]
-        if not location_match.empty:
-            monster_location = [
-                {
-                    "Location": row['mPlaceNmRus'],
-                    "LocationLevel": None if pd.isna(row['mMapNmRus']) else row['mMapNmRus']
-                }
-                for _, row in location_match.iterrows()
-            ]
-            #print(monster_location)
-
-
-    # Обработка изображений
-    file_path = f"{current_app.config['GITHUB_URL']}{monster_id}.png"
-    file_path_gif = f"{current_app.config['GITHUB_URL']}gif/{monster_id}_IDLE.gif"
-    try:
-        if requests.head(file_path_gif).status_code != 200:
-            file_path_gif = None
-    except:
-        file_path_gif = None
+    monster_location = data['locations'].get(monster_id, [])
 
     # Получение модели монстра
     prefix = 'm'  # Префикс по умолчанию для всех монстров
     monster_model_no = None
-    if model_result := get_monster_resource(monster_id):
+    if model_result := data['model_resource']:
         monster_model_no = f"{int(model_result.RFileName):05}"
 
     # Получение дополнительных данных
-    monster_abnormalResist_data = get_monsterabnormalResist_data(monster_id) or None
-    monster_attribute_add_data = get_monster_attribute_add_data(monster_id) or None
-    monster_attribute_resist_data = get_monster_attribute_resist_data(monster_id) or None
-    monster_protect_data = get_monster_protect_data(monster_id) or None
-    monster_slain_data = get_monster_slain_data(monster_id) or None
+    monster_abnormalResist_data = data['abnormal_resist'] or None
+    monster_attribute_add_data = data['attribute_add'] or None
+    monster_attribute_resist_data = data['attribute_resist'] or None
+    monster_protect_data = data['protect'] or None
+    monster_slain_data = data['slain'] or None
 
     return render_template(
         'monster_core/monster_page_detail.html',
@@ -322,15 +328,16 @@ def monster_detail(monster_id: int):
         respawn_info_normal=respawn_info_normal,
         respawn_info_event=respawn_info_event,
         monlocationinfo=monster_location,
-        merchant_items=get_merchant_items(monster_id),
-        mondropinfo=get_monster_drops(monster_id),
+        merchant_items=data['merchant_items'],
+        mondropinfo=data['drops'],
         monstermodelno_result=monster_model_no,
         monster_abnormalResist_data=monster_abnormalResist_data,
         monster_attribute_add_data=monster_attribute_add_data,
         monster_attribute_resist_data=monster_attribute_resist_data,
         monster_protect_data=monster_protect_data,
         monster_slain_data=monster_slain_data,
-        prefix=prefix
+        prefix=prefix,
+        timed_out_sections=tasks.timed_out
     )
     
     
@@ -1,5 +1,5 @@
-from flask import Blueprint, render_template, jsonify, request
-from services.quest_service import get_quests_data
+from flask import Blueprint, Response, render_template, jsonify, request
+from services.quest_service import get_quests_data, get_quest_details, get_quest_json
 
 bp = Blueprint('quests', __name__)
 
@@ -7,17 +7,22 @@ bp = Blueprint('quests', __name__)
 def quest_list():
     # Получаем данные о квестах
     quests_data = get_quests_data()
-    
+
     return render_template(
         'quest_core/quest_page_route.html',
         quests=quests_data
     )
 
 @bp.route('/api/quest/<int:quest_no>')
-def get_quest_details(quest_no):
+def quest_details_api(quest_no):
     """Получение детальной информации о квесте"""
     try:
+        # JSON из каталога отдаем как есть, без повторной сериализации
+        if (body := get_quest_json(quest_no)) is not None:
+            return Response(body, mimetype='application/json')
         quest_details = get_quest_details(quest_no)
+        if quest_details is None:
+            return jsonify({'error': 'Quest not found'}), 404
         return jsonify(quest_details)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,46 @@
+import time
+
+from flask import Blueprint, jsonify, request, url_for
+
+from services.search_index import SEARCH_SOURCES, search
+
+bp = Blueprint('search', __name__)
+
+# Вид результата -> страница с подробностями
+DETAIL_ENDPOINTS = {
+    'item': ('items.item_detail', 'item_id'),
+    'monster': ('monsters.monster_detail', 'monster_id'),
+    'skill': ('skills.skill_detail', 'skill_id'),
+    'abnormal': ('abnormals.abnormal_detail', 'aid'),
+}
+
+
+@bp.route('/api/search')
+def api_search():
+    """Unified name / ID search: /api/search?q=<text>[&kind=item,monster][&limit=20]"""
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 20, type=int)
+    kinds = None
+    if kind_arg := request.args.get('kind'):
+        kinds = [kind for kind in kind_arg.split(',') if kind in SEARCH_SOURCES]
+
+    try:
+        started = time.perf_counter()
+        hits = search(query, kinds, limit)
+        took_ms = (time.perf_counter() - started) * 1000
+    except Exception as e:
+        print(f"Error in search: {e}")
+        return jsonify({'error': str(e)}), 500
+
+    results = []
+    for hit in hits:
+        endpoint, arg = DETAIL_ENDPOINTS[hit.kind]
+        results.append({
+            'kind': hit.kind,
+            'id': hit.id,
+            'name': hit.name,
+            'rank': hit.rank,
+            'url': url_for(endpoint, **{arg: hit.id}),
+        })
+
+    return jsonify({'query': query, 'results': results, 'took_ms': round(took_ms, 3)})
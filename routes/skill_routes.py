@@ -8,14 +8,15 @@ from services.skill_service import (
     get_skill_attribute_data,
     get_skill_slain_data
 )
-from services.utils import get_google_sheets_data
-from config.settings import SKILLAPPLYRACE_URL
+from services.utils import get_skill_apply_race_descs
 from services.database import execute_query
 from services.utils import get_skill_icon_path, clean_dict
+from services.response_cache import cached_page
 
 bp = Blueprint('skills', __name__)
 
 @bp.route('/skill/<int:skill_id>')
+@cached_page('skill', 'skill_id')
 def skill_detail(skill_id: int):
     """Страница деталей навыка"""
     # Получение основных данных навыка
@@ -43,11 +44,7 @@ def skill_detail(skill_id: int):
     # Получение информации о расе из Google Sheets
     race_info = None
     if skill.apply_race is not None:
-        skill_apply_race_df = get_google_sheets_data(SKILLAPPLYRACE_URL)
-        if not skill_apply_race_df.empty:
-            race_match = skill_apply_race_df[skill_apply_race_df['mApplyRace'] == skill.apply_race]
-            if not race_match.empty:
-                race_info = race_match.iloc[0]['mDesc']
+        race_info = get_skill_apply_race_descs().get(skill.apply_race)
     
     # Получение иконки навыка
     skill_icon = None
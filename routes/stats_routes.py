@@ -0,0 +1,28 @@
+from flask import Blueprint, abort, jsonify, request
+
+from services.cache import cache_stats
+from services.database import get_pool_stats
+from services.query_stats import debug_timing_enabled, process_stats
+
+bp = Blueprint('stats', __name__)
+
+
+@bp.route('/api/stats')
+def api_stats():
+    """Process-wide SQL/sheet timings per endpoint and fingerprint, pool and cache counters: /api/stats[?limit=50]"""
+    # Тексты запросов и счетчики - только при DEBUG_TIMING_ENABLED
+    if not debug_timing_enabled():
+        abort(404)
+    limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+
+    try:
+        pool = get_pool_stats()
+    except Exception as e:
+        print(f"Error getting pool stats: {e}")
+        pool = {'error': str(e)}
+
+    return jsonify({
+        'requests': process_stats(limit),
+        'pool': pool,
+        'cache': cache_stats(),
+    })
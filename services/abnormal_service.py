@@ -1,8 +1,9 @@
 from typing import List, Dict, Optional, Tuple
 from models.abnormal import Abnormal, AbnormalItem, AbnormalSkill, AbnormalListItem
+from services.cache import cached, tag_ids
 from services.database import execute_query
 from services.utils import get_skill_icon_path, clean_dict
-from services.item_service import get_item_resource
+from services.resource_loader import get_resource_loader
 
 def get_abnormals_list() -> Tuple[List[AbnormalListItem], Dict[int, str]]:
     """Get list of all abnormal effects"""
@@ -48,6 +49,7 @@ def get_abnormals_list() -> Tuple[List[AbnormalListItem], Dict[int, str]]:
 
     return abnormals_data, file_paths
 
+@cached(tags=tag_ids('abnormal'))
 def get_abnormal_detail(aid: int) -> Optional[Abnormal]:
     """Get detailed abnormal effect information"""
     query = """
@@ -130,6 +132,7 @@ def get_abnormal_detail(aid: int) -> Optional[Abnormal]:
         abnormal_type_pic=abnormal_type_pic
     )
 
+@cached(tags=tag_ids('abnormal'))
 def get_abnormal_skills(aid: int) -> List[AbnormalSkill]:
     """Get all related skills for abnormal effect"""
     if aid is None:
@@ -174,6 +177,7 @@ def get_abnormal_skills(aid: int) -> List[AbnormalSkill]:
         print(f"Error in get_abnormal_skills: {e}")
         return []
 
+@cached(tags=tag_ids('abnormal'))
 def get_abnormal_items(aid: int) -> List[AbnormalItem]:
     """Get all related items for abnormal effect"""
     if aid is None:
@@ -194,9 +198,10 @@ def get_abnormal_items(aid: int) -> List[AbnormalItem]:
     try:
         rows = execute_query(query, (aid,))
         items = []
+        loader = get_resource_loader().want_items(row.IID for row in rows)
         
         for row in rows:
-            item_resource = get_item_resource(row.IID)
+            item_resource = loader.item_resource(row.IID)
             item_pic = item_resource.file_path if item_resource else None
             
             items.append(AbnormalItem(
@@ -210,6 +215,7 @@ def get_abnormal_items(aid: int) -> List[AbnormalItem]:
         print(f"Error in get_abnormal_items: {e}")
         return []
 
+@cached(tags=tag_ids('abnormal'))
 def get_abnormal_in_skill(aid: int) -> Optional[Tuple]:
     """Get abnormal effect information in skill context"""
     if aid is None:
@@ -0,0 +1,260 @@
+"""Index of the sprites and GIFs that exist in the static asset repository.
+
+Picture URLs point at ``GITHUB_URL`` (raw files of the R2-HTML-DB repo), but
+not every item/monster/skill has a sprite and only some monsters have an
+animation. Instead of asking GitHub on every page view, the set of file paths
+under ``static/`` is kept in memory and mirrored to ``ASSET_MANIFEST_PATH``.
+
+The manifest is built from a local checkout (``ASSET_LOCAL_DIR``, fast, done
+synchronously) or from the GitHub tree API (always in a background thread).
+Until one exists, pictures keep their conventional URL and animations are
+treated as missing, so a page never waits on the network and the result
+depends only on the manifest state.
+
+Build it at deploy time with::
+
+    python -m services.asset_manifest [--local path/to/R2-HTML-DB/static]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import FrozenSet, Optional
+
+import requests
+from flask import current_app
+
+from config.settings import GITHUB_URL, get_asset_manifest_config
+
+NO_ITEM_IMAGE = 'no_item_image.png'
+NO_MONSTER_IMAGE = 'no_monster/no_monster_image.png'
+
+
+@dataclass(frozen=True)
+class AssetManifest:
+    """Set of paths relative to GITHUB_URL (``123.png``, ``gif/123_IDLE.gif``)"""
+    paths: FrozenSet[str]
+    source: str
+    built_at: float
+    complete: bool = True   # False, если GitHub вернул обрезанное дерево
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def exists(self, path: str) -> Optional[bool]:
+        """True/False, or None when the manifest cannot tell (truncated listing)"""
+        if path in self.paths:
+            return True
+        return False if self.complete else None
+
+
+def tree_api_url(github_url: str = GITHUB_URL) -> str:
+    """GitHub tree API URL for the repo behind a raw.githubusercontent.com base URL"""
+    owner, repo, branch = github_url.split('raw.githubusercontent.com/')[1].split('/')[:3]
+    return f"https://api.github.com/repos/{owner}/{repo}/git/trees/{branch}?recursive=1"
+
+
+def _static_prefix(github_url: str = GITHUB_URL) -> str:
+    # https://raw.githubusercontent.com/<owner>/<repo>/<branch>/static/ -> "static/"
+    parts = github_url.split('raw.githubusercontent.com/')[1].split('/', 3)
+    return parts[3] if len(parts) > 3 else ''
+
+
+def scan_local(root: str) -> AssetManifest:
+    """Manifest of a local checkout of the static directory"""
+    paths = set()
+    for dirpath, _, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root)
+        for filename in filenames:
+            path = filename if rel_dir == '.' else os.path.join(rel_dir, filename)
+            paths.add(path.replace(os.sep, '/'))
+    return AssetManifest(frozenset(paths), f"local:{root}", time.time())
+
+
+def fetch_remote(timeout: float = 30) -> AssetManifest:
+    """Manifest from the GitHub tree API (one request for the whole repo)"""
+    response = requests.get(tree_api_url(), timeout=timeout,
+                            headers={'Accept': 'application/vnd.github+json'})
+    response.raise_for_status()
+    tree = response.json()
+    prefix = _static_prefix()
+    paths = frozenset(
+        entry['path'][len(prefix):] for entry in tree.get('tree', ())
+        if entry.get('type') == 'blob' and entry['path'].startswith(prefix)
+    )
+    truncated = bool(tree.get('truncated'))
+    if truncated:
+        print(f"Asset tree is truncated ({len(paths)} paths): missing files will not be detected")
+    return AssetManifest(paths, 'github', time.time(), complete=not truncated)
+
+
+class AssetManifestStore:
+    """Process-wide manifest with an on-disk copy and background refresh"""
+
+    def __init__(self, path: str = 'cache/asset_manifest.json', local_dir: Optional[str] = None,
+                 ttl: float = 86400, offline: bool = False, timeout: float = 30):
+        self.path = path
+        self.local_dir = local_dir
+        self.ttl = ttl
+        self.offline = offline
+        self.timeout = timeout
+        self._manifest: Optional[AssetManifest] = None
+        self._disk_checked = False
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._failed_at = 0.0
+        self.retry_after = min(ttl, 300)
+
+    def _load_from_disk(self) -> Optional[AssetManifest]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            return AssetManifest(frozenset(data['paths']), data['source'],
+                                 data['built_at'], data.get('complete', True))
+        except Exception as e:
+            print(f"Error loading asset manifest {self.path}: {e}")
+            return None
+
+    def _save_to_disk(self, manifest: AssetManifest):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'source': manifest.source, 'built_at': manifest.built_at,
+                           'complete': manifest.complete, 'paths': sorted(manifest.paths)}, f)
+            os.replace(tmp_path, self.path)  # Атомарная замена - читатели не увидят половину файла
+        except Exception as e:
+            print(f"Error saving asset manifest {self.path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def build(self) -> AssetManifest:
+        """Scan the local checkout if configured, otherwise ask GitHub"""
+        if self.local_dir:
+            return scan_local(self.local_dir)
+        return fetch_remote(self.timeout)
+
+    def refresh(self) -> Optional[AssetManifest]:
+        """Rebuild now; returns the new manifest, or the current one on failure"""
+        try:
+            manifest = self.build()
+        except Exception as e:
+            print(f"Error building asset manifest: {e}")
+            self._failed_at = time.time()
+            return self._manifest
+        self._manifest = manifest
+        self._save_to_disk(manifest)
+        return manifest
+
+    def refresh_in_background(self):
+        """Start a daemon thread rebuilding the manifest, unless one is already running"""
+        with self._lock:
+            if self._refreshing or time.time() - self._failed_at < self.retry_after:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name='asset-manifest-refresh', daemon=True).start()
+
+    def get(self) -> Optional[AssetManifest]:
+        """Current manifest, or None while the first one is being built"""
+        manifest = self._manifest
+        if manifest is None and not self._disk_checked:
+            with self._lock:
+                if self._manifest is None and not self._disk_checked:
+                    self._manifest = self._load_from_disk()
+                    self._disk_checked = True
+            manifest = self._manifest
+            if manifest is None and self.local_dir:
+                # Локальная копия - без сети, можно собрать прямо сейчас
+                manifest = self.refresh()
+
+        if self.offline and not self.local_dir:
+            return manifest
+        if manifest is None or time.time() - manifest.built_at >= self.ttl:
+            self.refresh_in_background()
+        return manifest
+
+
+_store: Optional[AssetManifestStore] = None
+_store_lock = threading.Lock()
+
+
+def get_manifest_store() -> AssetManifestStore:
+    """Process-wide AssetManifestStore configured from environment variables"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = AssetManifestStore(**get_asset_manifest_config())
+    return _store
+
+
+def asset_exists(path: str) -> Optional[bool]:
+    """Whether GITHUB_URL/<path> exists; None if there is no manifest to tell"""
+    manifest = get_manifest_store().get()
+    return manifest.exists(path) if manifest is not None else None
+
+
+def asset_url(path: str, fallback: Optional[str] = None) -> str:
+    """URL of a static asset, or of ``fallback`` if the manifest knows it is missing"""
+    if fallback is not None and asset_exists(path) is False:
+        path = fallback
+    return f"{current_app.config['GITHUB_URL']}{path}"
+
+
+def monster_pic_url(monster_id: int) -> str:
+    return asset_url(f"{monster_id}.png", NO_MONSTER_IMAGE)
+
+
+def sprite_url(file_name: str, pos_x, pos_y, fallback: str = NO_ITEM_IMAGE) -> str:
+    """Icon cut from a sprite sheet: <file>_<x>_<y>.png"""
+    return asset_url(f"{file_name}_{pos_x}_{pos_y}.png", fallback)
+
+
+def monster_gif_url(monster_id: int, animation: str = 'IDLE') -> Optional[str]:
+    """Animation URL only if the manifest lists it (no manifest - no animation)"""
+    path = f"gif/{monster_id}_{animation}.gif"
+    if asset_exists(path) is not True:
+        return None
+    return f"{current_app.config['GITHUB_URL']}{path}"
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Build the static asset manifest")
+    parser.add_argument('--local', help="static directory of a local checkout (default: ASSET_LOCAL_DIR)")
+    parser.add_argument('--output', help="manifest file (default: ASSET_MANIFEST_PATH)")
+    args = parser.parse_args()
+
+    store = get_manifest_store()
+    if args.local:
+        store.local_dir = args.local
+    if args.output:
+        store.path = args.output
+
+    try:
+        manifest = store.build()
+    except Exception as e:
+        print(f"[FAIL] {e}")
+        raise SystemExit(1)
+    store._save_to_disk(manifest)
+    print(f"[OK]   {len(manifest)} assets from {manifest.source} -> {store.path}"
+          f"{'' if manifest.complete else ' (truncated)'}")
+
+
+if __name__ == '__main__':
+    main()
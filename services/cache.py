@@ -0,0 +1,242 @@
+"""Memoization for service-layer getters: ``@cached(...)``.
+
+A replacement for the ``#@lru_cache`` lines that used to sit above the
+getters, without the problems that kept them disabled:
+
+* entries expire after ``ttl`` seconds (default SERVICE_CACHE_TTL) and the
+  cache is bounded to ``maxsize`` entries, least recently used first out;
+* the key includes the app's database/asset settings, so two apps (or a
+  config change) never share entries, and calls outside an app context just
+  run the function;
+* values are deep-copied on the way in and out, so callers may mutate the
+  dataclasses and dicts they get without corrupting the cache;
+* every entry carries tags (``"item:123"``, ``"monster:929"``...) computed
+  from the call arguments; ``invalidate_tags()`` drops matching entries in
+  every cached function;
+* hit/miss/eviction counters per function are available from ``cache_stats()``;
+* a result computed while an error was swallowed is not stored: getters
+  catch DB errors and return ``[]``/``None``, so ``execute_query`` (and
+  the sheet readers) call ``report_error()``, and a call during which the
+  thread's error count grew is treated as a fallback and returned uncached.
+
+Arguments are frozen (lists -> tuples, dicts -> sorted item tuples) to build
+the key; calls with arguments that still cannot be hashed bypass the cache,
+and so do results that cannot be deep-copied. Exceptions are never cached,
+``None`` results are unless an error was reported while computing them.
+"""
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from flask import current_app, has_app_context
+
+_MISSING = object()
+
+
+_errors = threading.local()
+
+
+def report_error():
+    """Mark work in this thread as degraded: a swallowed error replaced real data with a fallback"""
+    _errors.count = getattr(_errors, 'count', 0) + 1
+
+
+def error_count() -> int:
+    """Errors reported in this thread so far; compare before/after a call to see if it degraded"""
+    return getattr(_errors, 'count', 0)
+
+
+def _freeze(value):
+    """Hashable form of an argument (raises TypeError if there is none)"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    hash(value)
+    return value
+
+
+def _app_namespace() -> tuple:
+    """Settings that change what the getters return"""
+    config = current_app.config
+    return (
+        current_app.import_name,
+        config.get('DATABASE_NAME'),
+        config.get('DB_BACKEND'),
+        (config.get('DATABASE_CONFIG') or {}).get('SERVER'),
+        config.get('GITHUB_URL'),
+    )
+
+
+class FunctionCache:
+    """LRU + TTL entries of one cached function"""
+
+    def __init__(self, func: Callable, maxsize: int, ttl: Optional[float],
+                 tags: Optional[Callable[..., Iterable[str]]]):
+        self.func = func
+        self.name = f"{func.__module__}.{func.__qualname__}"
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.tags = tags
+        self._entries: 'OrderedDict[tuple, tuple]' = OrderedDict()  # key -> (expires_at, value, tags)
+        self._by_tag: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'invalidations': 0,
+                      'bypassed': 0, 'uncacheable': 0, 'errors': 0}
+
+    def __call__(self, *args, **kwargs):
+        if not has_app_context() or not current_app.config.get('SERVICE_CACHE_ENABLED', True):
+            return self.func(*args, **kwargs)
+        try:
+            key = (_app_namespace(), _freeze(args), _freeze(kwargs))
+        except TypeError:
+            self.stats['bypassed'] += 1
+            return self.func(*args, **kwargs)
+
+        value = self._get(key)
+        if value is not _MISSING:
+            return copy.deepcopy(value)
+
+        errors = error_count()
+        value = self.func(*args, **kwargs)
+        if error_count() != errors:
+            self.stats['errors'] += 1  # Значение-заглушка после ошибки БД - не кэшируем
+            return value
+        try:
+            stored = copy.deepcopy(value)
+        except Exception:
+            self.stats['uncacheable'] += 1  # Например, строки pyodbc - отдаем как есть, не кэшируем
+            return value
+        tags = tuple(self.tags(*args, **kwargs)) if self.tags else ()
+        self._put(key, stored, tags)
+        return value
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return _MISSING
+            if entry[0] is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[1]
+
+    def _put(self, key, value, tags):
+        ttl = self.ttl if self.ttl is not None else current_app.config.get('SERVICE_CACHE_TTL', 300)
+        expires_at = time.monotonic() + ttl if ttl and ttl > 0 else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, value, tags)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.stats['evictions'] += 1
+
+    def _remove(self, key):
+        """Drop one entry and its tag links. Caller holds the lock."""
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._by_tag.get(tag, ())):
+                    self._remove(key)
+                    removed += 1
+            self.stats['invalidations'] += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+
+    def info(self) -> Dict:
+        with self._lock:
+            size = len(self._entries)
+        return dict(self.stats, name=self.name, size=size, maxsize=self.maxsize, ttl=self.ttl)
+
+
+_registry: Dict[str, FunctionCache] = {}
+_registry_lock = threading.Lock()
+
+
+def cached(maxsize: int = 1000, ttl: Optional[float] = None,
+           tags: Optional[Callable[..., Iterable[str]]] = None):
+    """Memoize a service getter.
+
+    ``ttl`` in seconds (None -> SERVICE_CACHE_TTL, 0 -> no expiry);
+    ``tags(*args, **kwargs)`` returns the invalidation tags of a call.
+    """
+    def decorator(func):
+        cache = FunctionCache(func, maxsize, ttl, tags)
+        with _registry_lock:
+            _registry[cache.name] = cache
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return cache(*args, **kwargs)
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+def tag_ids(prefix: str, position: int = 0, name: Optional[str] = None):
+    """Tags ``"<prefix>:<id>"`` from one argument (an ID or a list of IDs)"""
+    def tags(*args, **kwargs):
+        value = kwargs.get(name, _MISSING) if name else _MISSING
+        if value is _MISSING:
+            value = args[position] if len(args) > position else None
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return [f"{prefix}:{v}" for v in value]
+        return [f"{prefix}:{value}"] if isinstance(value, int) else []
+    return tags
+
+
+_listeners: List[Callable[[Iterable[str]], int]] = []
+
+
+def add_invalidation_listener(listener: Callable[[Iterable[str]], int]):
+    """Also call ``listener(tags)`` on invalidate_tags() (e.g. the response cache)"""
+    _listeners.append(listener)
+
+
+def invalidate_tags(*tags: str) -> int:
+    """Drop entries with any of the tags from all cached functions and listeners; returns how many"""
+    with _registry_lock:
+        caches = list(_registry.values())
+    removed = sum(cache.invalidate_tags(tags) for cache in caches)
+    return removed + sum(listener(tags) for listener in list(_listeners))
+
+
+def clear_caches():
+    with _registry_lock:
+        caches = list(_registry.values())
+    for cache in caches:
+        cache.clear()
+
+
+def cache_stats() -> Dict[str, Dict]:
+    """Per-function counters and sizes"""
+    with _registry_lock:
+        caches = list(_registry.values())
+    return {cache.name: cache.info() for cache in caches}
@@ -0,0 +1,141 @@
+"""File-backed cache of parsed chest loot, shared by all worker processes.
+
+Chest scripts only change through /api/save-chest-loot, so the parsed rows
+(names and icons included) are stored as ``<CHEST_CACHE_DIR>/<mid>.json``
+on first read and rewritten right after a save commits. Files are replaced
+atomically (temp file + ``os.replace``), so other processes read either the
+old or the new table, never half of it. Each process keeps the decoded rows
+in memory and re-reads a file only when its mtime/size changes.
+
+Files live in a subdirectory per data source (backend + server + database),
+so a snapshot or benchmark fixture never shares rows with the live database.
+A reader that parsed the script after a cache miss only creates the file if
+it is still missing (``put(..., replace=False)``): if a save rebuilt the
+entry in the meantime, the rows parsed from the older script are dropped.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from flask import current_app
+
+CacheEntry = Tuple[List[Dict], Optional[str]]   # (строки дропа, последняя иконка)
+
+
+class ChestLootCache:
+    """MID -> parsed loot rows, on disk and in memory"""
+
+    def __init__(self, cache_dir: str = 'cache/chests'):
+        self.cache_dir = cache_dir
+        self._memory: Dict[int, Tuple[tuple, CacheEntry]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, mid: int) -> str:
+        return os.path.join(self.cache_dir, f"{int(mid)}.json")
+
+    def get(self, mid: int) -> Optional[CacheEntry]:
+        """Cached rows, or None if this chest has not been cached yet"""
+        path = self._path(mid)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._memory.get(mid)
+        if cached is not None and cached[0] == stamp:
+            return list(cached[1][0]), cached[1][1]
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading chest cache {path}: {e}")
+            self.invalidate(mid)  # Иначе put(replace=False) никогда не перезапишет битый файл
+            return None
+        entry = (data['drops'], data['item_pic'])
+        with self._lock:
+            self._memory[mid] = (stamp, entry)
+        return list(entry[0]), entry[1]
+
+    def put(self, mid: int, drops: List[Dict], item_pic: Optional[str], replace: bool = True) -> bool:
+        """Store rows for a chest atomically; with ``replace=False`` only if there is no file yet.
+
+        Returns False if the rows were not stored.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(mid)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'mid': mid, 'built_at': time.time(), 'drops': drops, 'item_pic': item_pic},
+                          f, ensure_ascii=False)
+            if replace:
+                os.replace(tmp_path, path)  # Атомарная замена - другие процессы не увидят половину файла
+            # link() не перезаписывает: файл, созданный сохранением после промаха, остается
+            elif not self._link(tmp_path, path):
+                return False
+        except Exception as e:
+            print(f"Error saving chest cache {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if replace:
+                self.invalidate(mid)  # Старый файл после неудачного сохранения сундука устарел
+            return False
+        with self._lock:
+            self._memory.pop(mid, None)
+        return True
+
+    def _link(self, tmp_path: str, path: str) -> bool:
+        """Move tmp_path to path only if path does not exist; never touches an existing file"""
+        try:
+            os.link(tmp_path, path)
+            return True
+        except OSError as e:
+            # Файл уже есть (его мог только что записать save) или ФС без жестких ссылок:
+            # не сохраняем, но и чужой файл не трогаем
+            if not isinstance(e, FileExistsError):
+                print(f"Error linking chest cache {path}: {e}")
+            return False
+        finally:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def invalidate(self, mid: int):
+        """Drop a chest from the cache; the next read parses the script again"""
+        with self._lock:
+            self._memory.pop(mid, None)
+        try:
+            os.remove(self._path(mid))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error removing chest cache for {mid}: {e}")
+
+
+_caches: Dict[str, ChestLootCache] = {}
+_cache_lock = threading.Lock()
+
+
+def source_namespace() -> str:
+    """Subdirectory name of the current app's data source, e.g. ``mssql-1a2b3c4d``"""
+    config = current_app.config
+    backend = config.get('DB_BACKEND', 'mssql')
+    if backend == 'sqlite':
+        source = os.path.abspath(config.get('SQLITE_PATH', 'cache/fnlparm.sqlite'))
+    else:
+        source = f"{(config.get('DATABASE_CONFIG') or {}).get('SERVER')}/{config.get('DATABASE_NAME')}"
+    return f"{backend}-{hashlib.sha1(source.encode('utf-8')).hexdigest()[:8]}"
+
+
+def get_chest_cache() -> ChestLootCache:
+    """Process-wide ChestLootCache in CHEST_CACHE_DIR/<data source>"""
+    cache_dir = os.path.join(current_app.config.get('CHEST_CACHE_DIR', 'cache/chests'), source_namespace())
+    cache = _caches.get(cache_dir)
+    if cache is None:
+        with _cache_lock:
+            cache = _caches.setdefault(cache_dir, ChestLootCache(cache_dir))
+    return cache
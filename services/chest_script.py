@@ -0,0 +1,144 @@
+"""Parser for the loot part of chest dialog scripts (TblDialogScript.mScriptText).
+
+Chest scripts roll once and walk an if/elseif chain of cumulative thresholds::
+
+    rand = getlgrandom() % 10000
+    if rand <= 500
+     result = pushitem2(1234,1,18,1)
+    elseif rand <= 1200
+     result = pushitem2(5678,2,18,2)
+    else
+     result = pushitem2(4900,10,18,1)
+    endif
+
+The script is tokenized in one pass with a single compiled pattern; a stack of
+open ``if`` blocks tells which rand branch every ``pushitem2`` belongs to
+(other ``if`` blocks, such as key checks, are tracked so their ``endif`` does
+not close the chain). The true probability of a branch is the width of its
+threshold interval: ``rand <= t`` after ``rand <= p`` hits ``t - p`` of the
+``modulus`` values. Parsed tables are cached by the SHA-1 of the script text.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+DEFAULT_MODULUS = 10000
+CACHE_SIZE = 64
+
+_TOKEN = re.compile(r"""
+      (?P<rand_init>\brand\s*=\s*getlgrandom\s*\(\s*\)\s*%\s*(?P<modulus>\d+))
+    | \b(?P<rand_cond>if|elseif)\s+rand\s*<=\s*(?P<threshold>\d+)
+    | \b(?P<cond>if|elseif)\b
+    | \b(?P<else>else)\b
+    | \b(?P<endif>endif)\b
+    | \bpushitem2\s*\(\s*(?P<item>\d+)\s*,\s*(?P<count>\d+)\s*,\s*\d+\s*,\s*(?P<status>\d+)\s*\)
+""", re.VERBOSE)
+
+
+@dataclass(frozen=True)
+class LootEntry:
+    item_id: int
+    count: int
+    status: int
+    threshold: Optional[int]    # Порог из скрипта (накопительный); None для ветки else
+    probability: float          # Настоящая вероятность, 0..1
+
+    @property
+    def fallback(self) -> bool:
+        return self.threshold is None
+
+
+@dataclass(frozen=True)
+class LootTable:
+    entries: Tuple[LootEntry, ...]    # В порядке скрипта
+    modulus: int = DEFAULT_MODULUS
+
+    @property
+    def conditional(self) -> Tuple[LootEntry, ...]:
+        """Entries with a rand threshold (without the else branch)"""
+        return tuple(e for e in self.entries if not e.fallback)
+
+
+class _Block:
+    """One open if-block"""
+    __slots__ = ('rand', 'modulus', 'previous', 'branch', 'probability')
+
+    def __init__(self, rand: bool, modulus: int):
+        self.rand = rand
+        self.modulus = modulus
+        self.previous = -1          # rand >= 0, поэтому первый интервал 0..t
+        self.branch = None          # Порог текущей ветки, 'else' или None
+        self.probability = 0.0
+
+    def enter(self, threshold: Optional[int]):
+        top = self.modulus - 1
+        bound = top if threshold is None else min(threshold, top)
+        self.probability = max(0, bound - self.previous) / self.modulus
+        self.previous = max(self.previous, bound)
+        self.branch = 'else' if threshold is None else threshold
+
+
+def parse_loot_table(script: Optional[str]) -> LootTable:
+    """Loot table of a chest script (cached by script hash)"""
+    if not script:
+        return LootTable(())
+    digest = hashlib.sha1(script.encode('utf-8')).hexdigest()
+    with _cache_lock:
+        table = _cache.get(digest)
+        if table is not None:
+            _cache.move_to_end(digest)
+            return table
+    table = _parse(script)
+    with _cache_lock:
+        _cache[digest] = table
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return table
+
+
+def _parse(script: str) -> LootTable:
+    entries: List[LootEntry] = []
+    stack: List[_Block] = []
+    modulus = DEFAULT_MODULUS
+
+    for match in _TOKEN.finditer(script):
+        if match.group('rand_init'):
+            modulus = int(match.group('modulus')) or DEFAULT_MODULUS
+        elif match.group('rand_cond'):
+            if match.group('rand_cond') == 'if':
+                stack.append(_Block(rand=True, modulus=modulus))
+            elif not stack or not stack[-1].rand:
+                # elseif по rand после обычного if - дальше блок считается розыгрышем
+                stack[-1:] = [_Block(rand=True, modulus=modulus)]
+            stack[-1].enter(int(match.group('threshold')))
+        elif match.group('cond'):
+            if match.group('cond') == 'if':
+                stack.append(_Block(rand=False, modulus=modulus))
+            elif stack and stack[-1].rand:
+                stack[-1].branch = None  # elseif не по rand - такие ветки не считаем
+        elif match.group('else'):
+            if stack and stack[-1].rand:
+                stack[-1].enter(None)
+        elif match.group('endif'):
+            if stack:
+                stack.pop()
+        elif match.group('item'):
+            block = next((b for b in reversed(stack) if b.rand), None)
+            if block is None or block.branch is None:
+                continue  # Выдача вне розыгрыша
+            entries.append(LootEntry(
+                item_id=int(match.group('item')),
+                count=int(match.group('count')),
+                status=int(match.group('status')),
+                threshold=None if block.branch == 'else' else block.branch,
+                probability=block.probability,
+            ))
+
+    return LootTable(tuple(entries), modulus)
+
+
+_cache: 'OrderedDict[str, LootTable]' = OrderedDict()
+_cache_lock = threading.Lock()
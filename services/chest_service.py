@@ -1,98 +1,93 @@
 from typing import List, Dict, Optional, Set, Tuple
 from flask import current_app
-from services.database import execute_query
-from services.item_service import get_item_resource, get_item_pic_url, get_item_name
-from services.monster_service import get_monster_name, get_monster_pic_url
-import re
+from services.cache import invalidate_tags
+from services.database import execute_query, transaction
+from services.asset_manifest import NO_ITEM_IMAGE, asset_url
+from services.monster_service import get_monster_pic_url
+from services.resource_loader import get_resource_loader
+from services.chest_script import parse_loot_table
+from services.chest_cache import get_chest_cache
 from datetime import datetime
 
 # Получаем диалог скрипты по MID
 def get_chest_script(chest_mid: int) -> Optional[str]:
-    """Получаем диалог скрипты по MID"""
-    try:
-        query = "SELECT mScriptText FROM TblDialogScript WHERE mMId = ?"
-        row = execute_query(query, (chest_mid,), fetch_one=True)
-        return row[0] if row else None
-    except Exception as e:
-        print(f"Error getting chest script: {e}")
-        return None
+    """Получаем диалог скрипты по MID (ошибки БД пробрасываются)"""
+    query = "SELECT mScriptText FROM TblDialogScript WHERE mMId = ?"
+    row = execute_query(query, (chest_mid,), fetch_one=True)
+    return row[0] if row else None
 
 # Парсим диалог скрипты
 def parse_script(script: str, chest_mid: int) -> List[Dict]:
+   """Loot rows of a chest script, in script order (names and icons resolved in one batch)"""
    # Если скрипт пустой или None, возвращаем пустые значения
    if not script:
        return [], None
-       
-   drops = []
-   current_item = None
-   item_pic = None
-   
-   chest_mid_mname = None
-   chest_mid_mname = get_monster_name(chest_mid)
-   
-   chest_mid_pic = None
-   chest_mid_pic = get_monster_pic_url(chest_mid)
-   
+
    try:
-       # Разбиваем скрипт на строки
-       lines = [line.strip() for line in script.split('\n') if line.strip()]
-       
-       for i, line in enumerate(lines):
-           # Ищем pushitem2
-           if 'pushitem2(' in line:
-               match = re.search(r'pushitem2\((\d+),', line)
-               if match:
-                   current_item = int(match.group(1))
-                   # Ищем шанс в следующих строках
-                   for next_line in lines[i:i+3]:  # Проверяем следующие 3 строки
-                       if 'rand <=' in next_line:
-                           chance_match = re.search(r'rand <= (\d+)', next_line)
-                           if chance_match:
-                               chance = int(chance_match.group(1))
-                               item_name = get_item_name(current_item)
-                               item_pic = get_item_pic_url(current_item)
-                               drops.append({
-                                   'MID': chest_mid,
-                                   'MID_pic': chest_mid_pic,
-                                   'MName': chest_mid_mname,
-                                   'item_id': current_item,
-                                   'item_name': item_name,
-                                   'item_pic': item_pic,
-                                   'drop_chance': chance
-                               })
-                               break
-
-       # Сортируем по шансу от большего к меньшему
-       drops.sort(key=lambda x: x['drop_chance'], reverse=True)
-       return drops, item_pic
-       
+       # Ветка else (утешительный приз) в редакторе не показывается - ее добавляет generate_dialog_script
+       entries = parse_loot_table(script).conditional
+       if not entries:
+           return [], None
+
+       loader = get_resource_loader().want_items(entry.item_id for entry in entries).want_monsters((chest_mid,))
+       chest_mid_mname = loader.monster_name(chest_mid)
+       chest_mid_pic = get_monster_pic_url(chest_mid)
+       no_image = asset_url(NO_ITEM_IMAGE)
+
+       drops = [{
+           'MID': chest_mid,
+           'MID_pic': chest_mid_pic,
+           'MName': chest_mid_mname,
+           'item_id': entry.item_id,
+           'item_name': loader.item_name(entry.item_id),
+           'item_pic': loader.item_pic_url(entry.item_id, no_image),
+           'count': entry.count,
+           'status': entry.status,
+           'drop_chance': entry.threshold,      # Порог из скрипта - его же сохраняет редактор
+           'probability': entry.probability,    # Настоящая вероятность выпадения
+       } for entry in entries]
+       return drops, drops[-1]['item_pic']
+
    except Exception as e:
+       # Ошибки БД при поиске имен/иконок пробрасываем - пустой результат попал бы в кэш сундуков
        print(f"Error parsing script for chest {chest_mid}: {e}")
        print(f"Script content: {script}")
-       return [], None
+       raise
    
 
-def analyze_drops(mid: int) -> Tuple[List[Dict], Optional[str]]:
-    """Анализ дропа из сундука"""
-    #print(f"\nАнализ содержимого сундука для MID: {mid}\n")
+def get_cached_drops(mid: int) -> Tuple[List[Dict], Optional[str]]:
+    """Дроп сундука из кэша (скрипт парсится только при первом чтении и после сохранения)"""
+    cache = get_chest_cache()
+    cached = cache.get(mid)
+    if cached is not None:
+        return cached
     try:
-        # Получаем скрипт
         script = get_chest_script(mid)
+        # MID без скрипта не кэшируем - иначе любой GET /api/chest-loot/<id> оставлял бы файл
         if not script:
-            print(f"No script found for chest {mid}")
             return [], None
-            
-        # Парсим скрипт
         drops, item_pic = parse_script(script, mid)
-        if not drops:
-            print(f"No drops found in script for chest {mid}")
-            return [], None
-            
-        return drops, item_pic
-        
     except Exception as e:
         print(f"Error analyzing drops for chest {mid}: {e}")
         return [], None
+    if not drops:
+        return [], None  # Скрипт NPC, а не сундука - тоже не кэшируем
+    # Только если файла все еще нет: сохранение после нашего промаха уже записало свежий дроп
+    if not cache.put(mid, drops, item_pic, replace=False):
+        cached = cache.get(mid)
+        if cached is not None:
+            return cached
+    return drops, item_pic
+
+
+def rebuild_chest_cache(mid: int, script_text: str):
+    """Replace the cached rows of a chest after its script was saved"""
+    cache = get_chest_cache()
+    try:
+        cache.put(mid, *parse_script(script_text, mid))
+    except Exception as e:
+        print(f"Error rebuilding chest cache for {mid}: {e}")
+        cache.invalidate(mid)
 
     
 # * [929, 2578] # MID NPC (Золотой: 929, Изумрудный: 2578)
@@ -103,7 +98,7 @@ def get_chest_route_call(chest_mids: List[int]) -> Tuple[List[Dict], Set[str]]:
     
     for mid in chest_mids:
         try:
-            data, item_pic = analyze_drops(mid)
+            data, item_pic = get_cached_drops(mid)
             if data and item_pic:  # Проверяем что получили данные
                 all_data.extend(data)
                 all_item_pics.add(item_pic)
@@ -272,52 +267,42 @@ def generate_additional_dialog_texts() -> str:
 </text>"""
 
 def update_chest_database(mid: int, script_text: str, dialog_text: str) -> bool:
-    """Обновление данных сундука в базе данных через удаление и вставку"""
-    
+    """Обновление данных сундука в базе данных через удаление и вставку
+
+    Все четыре запроса уходят одним пакетом в одной транзакции: либо сундук
+    обновлен целиком, либо (при любой ошибке) остается прежним.
+    """
     try:
-        # Удаляем старые записи и получаем количество удаленных строк
-        deleted_script = execute_query(
-            "DELETE FROM TblDialogScript WHERE mMId = ?", 
-            (mid,)
-        )
-        print(f"Deleted {deleted_script} rows from TblDialogScript {mid}")
-        # Вставляем новую запись в TblDialogScript
-        inserted_script = execute_query("""
-            INSERT INTO TblDialogScript (mMId, mScriptText, mRegDate, mUptDate)
-            VALUES (?, ?, GETDATE(), GETDATE())
-        """, (mid, script_text))
-        
-        # Удаляем из второй таблицы
-        deleted_dialog = execute_query(
-            "DELETE FROM TblDialog WHERE mMId = ?",
-            (mid,)
-        )
-        
-        # Вставляем в TblDialog
-        inserted_dialog = execute_query("""
-            INSERT INTO TblDialog (
-                mMId, mClick, mRegDate, mUptDate,
-                mDie, mAttacked, mTarget, mBear,
-                mGossip1, mGossip2, mGossip3, mGossip4
-            )
-            VALUES (
-                ?, ?, GETDATE(), GETDATE(),
-                ',', ',', ',', ',',
-                ',', ',', ',', ','
-            )
-        """, (mid, dialog_text))
-        
-        # Можно даже логировать результаты
-        print(f"Script: deleted {deleted_script}, inserted {inserted_script} for {mid}")
-        print(f"Dialog: deleted {deleted_dialog}, inserted {inserted_dialog} for {mid}")
-        
+        with transaction() as uow:
+            uow.execute_batch([
+                ("DELETE FROM TblDialogScript WHERE mMId = ?", (mid,)),
+                ("""
+                    INSERT INTO TblDialogScript (mMId, mScriptText, mRegDate, mUptDate)
+                    VALUES (?, ?, GETDATE(), GETDATE())
+                """, (mid, script_text)),
+                ("DELETE FROM TblDialog WHERE mMId = ?", (mid,)),
+                ("""
+                    INSERT INTO TblDialog (
+                        mMId, mClick, mRegDate, mUptDate,
+                        mDie, mAttacked, mTarget, mBear,
+                        mGossip1, mGossip2, mGossip3, mGossip4
+                    )
+                    VALUES (
+                        ?, ?, GETDATE(), GETDATE(),
+                        ',', ',', ',', ',',
+                        ',', ',', ',', ','
+                    )
+                """, (mid, dialog_text)),
+            ])
+
+        print(f"Chest {mid}: TblDialogScript and TblDialog replaced")
         return True
-        
+
     except Exception as e:
         print(f"Error updating chest database: {e}")
         return False
-    
-    
+
+
 def update_chest_loot(mid: int, items: List[Dict]) -> bool:
     """Обновление содержимого сундука"""
     try:
@@ -327,6 +312,11 @@ def update_chest_loot(mid: int, items: List[Dict]) -> bool:
         
         # Обновляем базу данных
         success = update_chest_database(mid, script_text, dialog_text)
+        if success:
+            # Кэш пересобираем из только что записанного скрипта
+            rebuild_chest_cache(mid, script_text)
+            # Сундук - это монстр: сбрасываем закэшированные данные по его MID
+            invalidate_tags(f"chest:{mid}", f"monster:{mid}")
         
         return success
     except Exception as e:
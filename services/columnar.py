@@ -0,0 +1,107 @@
+"""Column-oriented (NumPy) view over a fixed sequence of records.
+
+Listing filters compile to a list of ``(column, op, value)`` predicates that
+are evaluated as one vectorized boolean mask over the whole table; the
+records that pass are then picked with a single gather. Columns are built on
+first use from the record attributes (NULL -> 0) and cached, so a table that
+lives in a catalog snapshot pays that cost once.
+"""
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Predicate = Tuple[str, str, Any]
+
+OPS = {
+    'eq': np.equal,
+    'ge': np.greater_equal,
+    'le': np.less_equal,
+    'in': np.isin,
+}
+
+
+class ColumnarTable:
+    """Records plus lazily built per-attribute NumPy columns"""
+
+    def __init__(self, records: Sequence, dtypes: Optional[Dict[str, Any]] = None,
+                 default_dtype=np.float64, columns: Optional[Dict[str, np.ndarray]] = None):
+        self.records = tuple(records)
+        self.dtypes = dtypes or {}
+        self.default_dtype = default_dtype
+        self._columns: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+        # Колонки, посчитанные заранее не из атрибутов записей (например, из другой таблицы)
+        for name, column in (columns or {}).items():
+            column.flags.writeable = False
+            self._columns[name] = column
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def column(self, name: str) -> np.ndarray:
+        """Column array for an attribute (built once, read-only afterwards)"""
+        column = self._columns.get(name)
+        if column is None:
+            with self._lock:
+                column = self._columns.get(name)
+                if column is None:
+                    column = np.fromiter(
+                        ((getattr(record, name, 0) or 0) for record in self.records),
+                        dtype=self.dtypes.get(name, self.default_dtype),
+                        count=len(self.records),
+                    )
+                    column.flags.writeable = False
+                    self._columns[name] = column
+        return column
+
+    def mask(self, predicates: Iterable[Predicate]) -> np.ndarray:
+        """Boolean mask over the whole table; all predicates ANDed"""
+        mask = np.ones(len(self.records), dtype=bool)
+        for name, op, value in predicates:
+            mask &= OPS[op](self.column(name), value)
+        return mask
+
+    def take(self, positions: np.ndarray) -> 'Selection':
+        """Records at the given positions, in that order"""
+        records = self.records
+        return Selection([records[i] for i in positions.tolist()], self, positions)
+
+    def select(self, predicates: Iterable[Predicate],
+               positions: Optional[np.ndarray] = None) -> 'Selection':
+        """Records (optionally only among ``positions``) matching all predicates"""
+        predicates = list(predicates)
+        if positions is None:
+            if not predicates:
+                return self.take(np.arange(len(self.records)))
+            return self.take(np.flatnonzero(self.mask(predicates)))
+        if not predicates:
+            return self.take(positions)
+        return self.take(positions[self.mask(predicates)[positions]])
+
+
+class Selection(list):
+    """A plain list of records that remembers where they sit in their table.
+
+    Filtering a Selection again only gathers from the table's columns instead
+    of rebuilding them from the records.
+    """
+
+    def __init__(self, records: List, table: ColumnarTable, positions: np.ndarray):
+        super().__init__(records)
+        self.table = table
+        self.positions = positions
+
+
+def select_records(records: Sequence, predicates: List[Predicate],
+                   dtypes: Optional[Dict[str, Any]] = None) -> List:
+    """Filter any record list with compiled predicates.
+
+    A Selection is filtered against its own (cached) table; any other list
+    gets a throwaway table that only builds the columns the predicates use.
+    """
+    if not predicates:
+        return records
+    if isinstance(records, Selection):
+        return records.table.select(predicates, records.positions)
+    return ColumnarTable(records, dtypes).select(predicates)
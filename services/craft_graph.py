@@ -0,0 +1,342 @@
+"""Process-wide recipe graph over DT_Refine / DT_RefineMaterial.
+
+Every recipe (RID) turns its materials into ``RIsCreateCnt`` units of
+``RItemID0`` with chance ``RSuccess`` %. The graph is read with one query and
+kept with adjacency in both directions (item -> recipes that make it,
+item -> recipes that use it) and a topological order of items, materials
+first. Cycles (upgrade/downgrade chains) are tolerated: items on a cycle are
+treated as raw materials, so they come first in the order and are not
+expanded; items that merely depend on a cycle are ordered normally.
+
+A material listed several times in one recipe (different ``ROrderNo``) is
+needed that many times. Expected cost assumes materials are consumed on a
+failed attempt, so one unit of a product costs ``1 / (RSuccess x RIsCreateCnt)``
+attempts. Per-item raw material vectors are computed once per snapshot.
+"""
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from flask import current_app
+
+from services.database import execute_query
+from services.snapshot import SnapshotHolder
+
+RECIPES_QUERY = """
+    SELECT a.RID, a.RItemID0, a.RSuccess, a.RIsCreateCnt, c.RItemID, c.ROrderNo
+    FROM DT_Refine AS a
+    INNER JOIN DT_Item AS b ON (a.RItemID0 = b.IID)
+    INNER JOIN DT_RefineMaterial AS c ON (a.RID = c.RID)
+    INNER JOIN DT_Item AS b1 ON (c.RItemID = b1.IID)
+"""
+FINGERPRINT_QUERIES = (
+    "SELECT COUNT_BIG(*), CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM DT_Refine",
+    "SELECT COUNT_BIG(*), CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM DT_RefineMaterial",
+)
+
+# Не раскрываем дерево глубже / больше (общие подрецепты повторяются в каждой ветке)
+MAX_TREE_DEPTH = 64
+MAX_TREE_NODES = 5000
+
+
+@dataclass(frozen=True)
+class Recipe:
+    rid: int
+    product: int
+    success: Optional[float]                        # RSuccess в процентах, как в БД
+    create_count: int
+    materials: Tuple[Tuple[int, int], ...]          # (RItemID, количество) в порядке ROrderNo
+    material_rows: Tuple[Tuple[int, int], ...]      # (RItemID, ROrderNo) как в DT_RefineMaterial
+
+    @property
+    def yield_per_attempt(self) -> float:
+        """Expected product units per attempt (NULL RSuccess counts as 100 %)"""
+        chance = 1.0 if self.success is None else max(0.0, min(self.success, 100.0)) / 100.0
+        return chance * max(self.create_count or 1, 1)
+
+
+@dataclass(frozen=True)
+class CraftGraph:
+    recipes: Mapping[int, Recipe]                   # RID -> рецепт
+    made_by: Mapping[int, Tuple[int, ...]]          # Предмет -> RID рецептов, которые его создают
+    used_in: Mapping[int, Tuple[int, ...]]          # Предмет -> RID рецептов, где он материал
+    order: Tuple[int, ...]                          # Предметы: материалы раньше продуктов
+    position: Mapping[int, int]
+    depth: Mapping[int, int]                        # Длина самой длинной цепочки крафта до сырья
+    cyclic: FrozenSet[int]                          # Предметы на циклах рецептов
+    loaded_at: float = field(default_factory=time.time)
+    _unit_costs: Dict[int, Mapping[int, float]] = field(default_factory=dict, compare=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+
+    def recipes_for(self, item_id: int) -> List[Recipe]:
+        return [self.recipes[rid] for rid in self.made_by.get(item_id, ())]
+
+    def recipes_using(self, item_id: int) -> List[Recipe]:
+        return [self.recipes[rid] for rid in self.used_in.get(item_id, ())]
+
+    def best_recipe(self, item_id: int) -> Optional[Recipe]:
+        """Recipe with the highest expected yield per attempt (lowest RID on ties)"""
+        best = None
+        for recipe in self.recipes_for(item_id):
+            if recipe.yield_per_attempt <= 0:
+                continue  # Рецепт с нулевым шансом не дает предмет
+            if best is None or recipe.yield_per_attempt > best.yield_per_attempt:
+                best = recipe
+        return best
+
+    def is_raw(self, item_id: int) -> bool:
+        return item_id in self.cyclic or self.best_recipe(item_id) is None
+
+    def unit_cost(self, item_id: int) -> Mapping[int, float]:
+        """Expected raw materials for one unit of an item ({item: 1} for raw items)"""
+        cost = self._unit_costs.get(item_id)
+        if cost is not None:
+            return cost
+        with self._lock:
+            # Снизу вверх по топологическому порядку: материалы уже посчитаны
+            for item in self._pending_chain(item_id):
+                self._unit_costs[item] = self._compute_unit_cost(item)
+        return self._unit_costs[item_id]
+
+    def _pending_chain(self, item_id: int) -> List[int]:
+        """Items below item_id (item_id included) without a cached cost, in topological order"""
+        seen, stack = set(), [item_id]
+        while stack:
+            item = stack.pop()
+            if item in seen or item in self._unit_costs:
+                continue
+            seen.add(item)
+            if not self.is_raw(item):
+                stack.extend(m for m, _ in self.best_recipe(item).materials)
+        return sorted(seen, key=lambda i: self.position.get(i, -1))
+
+    def _compute_unit_cost(self, item_id: int) -> Mapping[int, float]:
+        if self.is_raw(item_id):
+            return MappingProxyType({item_id: 1.0})
+        recipe = self.best_recipe(item_id)
+        attempts = 1.0 / recipe.yield_per_attempt
+        total: Dict[int, float] = defaultdict(float)
+        for material, count in recipe.materials:
+            for raw, amount in self._unit_costs[material].items():
+                total[raw] += attempts * count * amount
+        return MappingProxyType(dict(total))
+
+
+def _kahn(dependencies: Mapping[int, set]) -> Tuple[List[int], set]:
+    """Kahn's algorithm; returns the order and the items left unordered"""
+    dependents = defaultdict(set)
+    for item, needs in dependencies.items():
+        for need in needs:
+            dependents[need].add(item)
+    remaining = {item: len(needs) for item, needs in dependencies.items()}
+    queue = deque(sorted(item for item, count in remaining.items() if count == 0))
+    order = []
+    while queue:
+        item = queue.popleft()
+        order.append(item)
+        for product in sorted(dependents[item]):
+            remaining[product] -= 1
+            if remaining[product] == 0:
+                queue.append(product)
+    return order, {item for item, count in remaining.items() if count > 0}
+
+
+def _on_cycle(item: int, dependencies: Mapping[int, set], scope: set) -> bool:
+    """True if the item (transitively) needs itself"""
+    stack, seen = list(dependencies[item] & scope), set()
+    while stack:
+        need = stack.pop()
+        if need == item:
+            return True
+        if need not in seen:
+            seen.add(need)
+            stack.extend(dependencies[need] & scope)
+    return False
+
+
+def _topological_order(items, made_by, recipes) -> Tuple[List[int], set]:
+    """Items with materials before products, and the set of items on recipe cycles"""
+    dependencies = {item: set() for item in items}
+    for item in items:
+        for rid in made_by.get(item, ()):
+            dependencies[item].update(m for m, _ in recipes[rid].materials)
+
+    order, leftover = _kahn(dependencies)
+    if not leftover:
+        return order, set()
+    # Не упорядочены и сами циклы, и все, что от них зависит; сырьем считаем только циклы
+    cyclic = {item for item in leftover if _on_cycle(item, dependencies, leftover)}
+    order, _ = _kahn({item: (set() if item in cyclic else needs) for item, needs in dependencies.items()})
+    return order, cyclic
+
+
+def build_craft_graph(rows) -> CraftGraph:
+    """Graph from rows of RECIPES_QUERY (any order)"""
+    heads: Dict[int, tuple] = {}
+    material_rows: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    for row in rows:
+        heads.setdefault(row.RID, (row.RItemID0, row.RSuccess, row.RIsCreateCnt))
+        material_rows[row.RID].append((row.RItemID, row.ROrderNo))
+
+    recipes: Dict[int, Recipe] = {}
+    made_by: Dict[int, List[int]] = defaultdict(list)
+    used_in: Dict[int, List[int]] = defaultdict(list)
+    for rid in sorted(heads):
+        product, success, create_count = heads[rid]
+        ordered = tuple(sorted(set(material_rows[rid]), key=lambda m: (m[1], m[0])))
+        counts: Dict[int, int] = {}
+        for material, _ in ordered:
+            counts[material] = counts.get(material, 0) + 1
+        recipes[rid] = Recipe(
+            rid=rid,
+            product=product,
+            success=None if success is None else float(success),
+            create_count=create_count or 1,
+            materials=tuple(counts.items()),
+            material_rows=ordered,
+        )
+        made_by[product].append(rid)
+        for material in counts:
+            used_in[material].append(rid)
+
+    items = set(made_by) | set(used_in)
+    order, cyclic = _topological_order(items, made_by, recipes)
+
+    depth: Dict[int, int] = {}
+    for item in order:
+        if item in cyclic:
+            depth[item] = 0
+            continue
+        depth[item] = max(
+            (1 + depth.get(m, 0) for rid in made_by.get(item, ()) for m, _ in recipes[rid].materials),
+            default=0,
+        )
+
+    return CraftGraph(
+        recipes=MappingProxyType(recipes),
+        made_by=MappingProxyType({k: tuple(v) for k, v in made_by.items()}),
+        used_in=MappingProxyType({k: tuple(v) for k, v in used_in.items()}),
+        order=tuple(order),
+        position=MappingProxyType({item: i for i, item in enumerate(order)}),
+        depth=MappingProxyType(depth),
+        cyclic=frozenset(cyclic),
+    )
+
+
+def bill_of_materials(graph: CraftGraph, item_id: int, quantity: float = 1,
+                      max_depth: int = MAX_TREE_DEPTH, max_nodes: int = MAX_TREE_NODES) -> Dict:
+    """Full recipe tree for ``quantity`` units with expected attempts and materials.
+
+    Nodes past ``max_depth`` or the ``max_nodes`` budget are returned
+    unexpanded with ``truncated: True``; expected_materials() has the totals.
+    """
+    budget = [max_nodes]
+
+    def expand(item: int, amount: float, level: int) -> Dict:
+        budget[0] -= 1
+        node = {'item_id': item, 'quantity': amount}
+        recipe = None if graph.is_raw(item) else graph.best_recipe(item)
+        if recipe is None:
+            node['raw'] = True
+            return node
+        if level >= max_depth or budget[0] <= 0:
+            node.update({'raw': False, 'truncated': True})
+            return node
+        attempts = amount / recipe.yield_per_attempt
+        node.update({
+            'raw': False,
+            'rid': recipe.rid,
+            'success': recipe.success,
+            'create_count': recipe.create_count,
+            'attempts': attempts,
+            'materials': [expand(m, attempts * count, level + 1) for m, count in recipe.materials],
+        })
+        return node
+
+    return expand(item_id, quantity, 0)
+
+
+def expected_materials(graph: CraftGraph, item_id: int, quantity: float = 1) -> Dict[int, float]:
+    """Expected raw materials for ``quantity`` units of an item"""
+    return {raw: amount * quantity for raw, amount in graph.unit_cost(item_id).items()}
+
+
+def buildable_from(graph: CraftGraph, inventory: Mapping[int, int]) -> Tuple[List[Dict], List[int]]:
+    """What an inventory can build.
+
+    Returns recipes whose materials are all in the inventory (with how many
+    attempts the counts allow), and every item reachable by chaining recipes
+    from the inventory items, ignoring quantities, in topological order.
+    """
+    have = {item for item, count in inventory.items() if count and count > 0}
+
+    direct = []
+    candidate_rids = sorted({rid for item in have for rid in graph.used_in.get(item, ())})
+    for rid in candidate_rids:
+        recipe = graph.recipes[rid]
+        if all(m in have for m, _ in recipe.materials):
+            direct.append({
+                'rid': rid,
+                'product': recipe.product,
+                'success': recipe.success,
+                'create_count': recipe.create_count,
+                'max_attempts': min(inventory[m] // count for m, count in recipe.materials),
+            })
+
+    # Транзитивно: что можно получить, если крафтить промежуточные предметы
+    available = set(have)
+    missing = {}
+    queue = deque(have)
+    while queue:
+        item = queue.popleft()
+        for rid in graph.used_in.get(item, ()):
+            recipe = graph.recipes[rid]
+            if recipe.product in available or recipe.yield_per_attempt <= 0:
+                continue
+            if rid not in missing:
+                missing[rid] = {m for m, _ in recipe.materials}
+            missing[rid] -= available
+            if not missing[rid]:
+                available.add(recipe.product)
+                queue.append(recipe.product)
+    reachable = sorted(available - have, key=lambda i: graph.position.get(i, -1))
+    return direct, reachable
+
+
+def _load_graph() -> CraftGraph:
+    return build_craft_graph(execute_query(RECIPES_QUERY))
+
+
+def _fingerprint() -> tuple:
+    return tuple(value for query in FINGERPRINT_QUERIES for value in execute_query(query, fetch_one=True))
+
+
+_holder: Optional[SnapshotHolder] = None
+_holder_lock = threading.Lock()
+
+
+def get_graph_holder() -> SnapshotHolder:
+    """Process-wide holder of the craft graph"""
+    global _holder
+    if _holder is None:
+        with _holder_lock:
+            if _holder is None:
+                _holder = SnapshotHolder(
+                    'craft_graph',
+                    load=_load_graph,
+                    fingerprint=_fingerprint,
+                    ttl=current_app.config.get('CRAFT_GRAPH_TTL', 600),
+                )
+    return _holder
+
+
+def is_graph_enabled() -> bool:
+    return current_app.config.get('CRAFT_GRAPH_ENABLED', True)
+
+
+def get_craft_graph() -> CraftGraph:
+    """Current craft graph (loaded on first use)"""
+    return get_graph_holder().get()
@@ -1,10 +1,68 @@
 from typing import List, Dict, Optional
-from flask import current_app
+from services.cache import cached, tag_ids
 from services.database import execute_query
-from services.item_service import get_item_resource
+from services.asset_manifest import NO_ITEM_IMAGE, asset_url
+from services.resource_loader import get_resource_loader
+from services.craft_graph import (
+    bill_of_materials, buildable_from, expected_materials,
+    get_craft_graph, is_graph_enabled,
+)
 
+
+def _round_success(value) -> Optional[float]:
+    return None if value is None else round(float(value), 1)
+
+
+def _base_items_from_graph(item_id: int) -> List[Dict]:
+    """check_base_items_for_craft() over the craft graph, without SQL"""
+    recipes = get_craft_graph().recipes_for(item_id)
+    loader = get_resource_loader().want_items(
+        [item_id] + [m for recipe in recipes for m, _ in recipe.material_rows]
+    )
+    no_image = asset_url(NO_ITEM_IMAGE)
+    unique_results = {}
+    for recipe in recipes:
+        for material, order_no in recipe.material_rows:
+            if material not in unique_results:
+                unique_results[material] = {
+                    'RID': recipe.rid,
+                    'RItemID0': recipe.product,
+                    'IName': loader.item_name(recipe.product),
+                    'RItemID': material,
+                    'CraftItems': loader.item_name(material),
+                    'RSuccess': _round_success(recipe.success),
+                    'RIsCreateCnt': recipe.create_count,
+                    'ROrderNo': order_no,
+                    'ImagePath': loader.item_pic_url(material, no_image)
+                }
+    return list(unique_results.values())
+
+
+def _next_items_from_graph(item_id: int) -> List[Dict]:
+    """check_next_craft_item() over the craft graph, without SQL"""
+    recipes = get_craft_graph().recipes_using(item_id)
+    loader = get_resource_loader().want_items(recipe.product for recipe in recipes)
+    no_image = asset_url(NO_ITEM_IMAGE)
+    unique_results = {}
+    for recipe in recipes:
+        if recipe.product not in unique_results:
+            unique_results[recipe.product] = {
+                'RID': recipe.rid,
+                'RItemID0': recipe.product,
+                'IName': loader.item_name(recipe.product),
+                'RSuccess': _round_success(recipe.success),
+                'RIsCreateCnt': recipe.create_count,
+                'ImagePath': loader.item_pic_url(recipe.product, no_image)
+            }
+    return list(unique_results.values())
+
+
+@cached(tags=tag_ids('item'))
 def check_base_items_for_craft(item_id: int) -> List[Dict]:
     """Get crafting recipe for an item"""
+    if is_graph_enabled():
+        return _base_items_from_graph(item_id)
+
     query = """
     SELECT DISTINCT
         a.RID,
@@ -28,6 +86,9 @@ def check_base_items_for_craft(item_id: int) -> List[Dict]:
 
     rows = execute_query(query, (item_id,))
     unique_results = {}
+    # Иконки всех предметов рецепта - одним запросом
+    loader = get_resource_loader().want_items(row.RItemID for row in rows)
+    no_image = asset_url(NO_ITEM_IMAGE)
 
     for row in rows:
         # Use RItemID as key for uniqueness
@@ -35,13 +96,7 @@ def check_base_items_for_craft(item_id: int) -> List[Dict]:
 
         # Update record only if it doesn't exist
         if key not in unique_results:
-            item_resource = get_item_resource(row.RItemID)
-            
-            if item_resource:
-                file_name = item_resource.RFileName.split('.')[0]
-                image_path = f"{current_app.config['GITHUB_URL']}{file_name}_{item_resource.RPosX}_{item_resource.RPosY}.png"
-            else:
-                image_path = f"{current_app.config['GITHUB_URL']}no_item_image.png"
+            image_path = loader.item_pic_url(row.RItemID, no_image)
 
             unique_results[key] = {
                 'RID': row.RID,
@@ -57,8 +112,12 @@ def check_base_items_for_craft(item_id: int) -> List[Dict]:
 
     return list(unique_results.values())
 
+@cached(tags=tag_ids('item'))
 def check_next_craft_item(item_id: int) -> List[Dict]:
     """Get items that can be crafted using this item"""
+    if is_graph_enabled():
+        return _next_items_from_graph(item_id)
+
     query = """
     SELECT DISTINCT
         a.RID,
@@ -79,6 +138,8 @@ def check_next_craft_item(item_id: int) -> List[Dict]:
 
     rows = execute_query(query, (item_id,))
     unique_results = {}
+    loader = get_resource_loader().want_items(row.RItemID0 for row in rows)
+    no_image = asset_url(NO_ITEM_IMAGE)
 
     for row in rows:
         # Use RItemID0 as key for uniqueness
@@ -86,13 +147,7 @@ def check_next_craft_item(item_id: int) -> List[Dict]:
 
         # Update record only if it doesn't exist
         if key not in unique_results:
-            item_resource = get_item_resource(row.RItemID0)
-
-            if item_resource:
-                file_name = item_resource.RFileName.split('.')[0]
-                image_path = f"{current_app.config['GITHUB_URL']}{file_name}_{item_resource.RPosX}_{item_resource.RPosY}.png"
-            else:
-                image_path = f"{current_app.config['GITHUB_URL']}no_item_image.png"
+            image_path = loader.item_pic_url(row.RItemID0, no_image)
 
             unique_results[key] = {
                 'RID': row.RID,
@@ -103,4 +158,48 @@ def check_next_craft_item(item_id: int) -> List[Dict]:
                 'ImagePath': image_path
             }
 
-    return list(unique_results.values())
\ No newline at end of file
+    return list(unique_results.values())
+
+
+def _describe_items(item_ids) -> Dict[int, Dict]:
+    """ID -> name and icon for the items of a craft answer, in one batch"""
+    loader = get_resource_loader().want_items(item_ids)
+    no_image = asset_url(NO_ITEM_IMAGE)
+    return {
+        item_id: {'IName': loader.item_name(item_id), 'ImagePath': loader.item_pic_url(item_id, no_image)}
+        for item_id in item_ids
+    }
+
+
+def get_craft_tree(item_id: int, quantity: float = 1) -> Dict:
+    """Full recipe tree of an item with expected attempts at every level"""
+    tree = bill_of_materials(get_craft_graph(), item_id, quantity)
+    nodes, stack = [], [tree]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get('materials', ()))
+    names = _describe_items({node['item_id'] for node in nodes})
+    for node in nodes:
+        node.update(names[node['item_id']])
+    return tree
+
+
+def get_craft_materials(item_id: int, quantity: float = 1) -> List[Dict]:
+    """Expected raw materials for crafting an item, largest amounts first"""
+    materials = expected_materials(get_craft_graph(), item_id, quantity)
+    names = _describe_items(list(materials))
+    return sorted(
+        ({'item_id': raw, 'quantity': amount, **names[raw]} for raw, amount in materials.items()),
+        key=lambda m: (-m['quantity'], m['item_id']),
+    )
+
+
+def get_buildable_items(inventory: Dict[int, int]) -> Dict:
+    """Recipes an inventory can run now, and items reachable by chaining recipes"""
+    direct, reachable = buildable_from(get_craft_graph(), inventory)
+    names = _describe_items({r['product'] for r in direct} | set(reachable))
+    return {
+        'recipes': [dict(recipe, **names[recipe['product']]) for recipe in direct],
+        'reachable': [dict(item_id=item_id, **names[item_id]) for item_id in reachable],
+    }
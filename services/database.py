@@ -1,19 +1,74 @@
+import threading
+import time
 import pyodbc
 from contextlib import contextmanager
 from flask import current_app
 
+from services.cache import report_error
+from services.db_pool import ConnectionPool
+from services.query_stats import count_rows, record_acquire, record_query
+
+# Пулы соединений на процесс, по строке подключения
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_connection_string() -> str:
+    """Build ODBC connection string from app config"""
+    return ';'.join(f'{k}={v}' for k, v in current_app.config['DATABASE_CONFIG'].items())
+
+def get_pool() -> ConnectionPool:
+    """Get (or lazily create) the process-wide connection pool for the current app"""
+    conn_str = get_connection_string()
+    pool = _pools.get(conn_str)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(conn_str)
+            if pool is None:
+                pool_config = current_app.config.get('DB_POOL', {})
+                pool = ConnectionPool(conn_str, **pool_config)
+                _pools[conn_str] = pool
+    return pool
+
+def is_sqlite_backend() -> bool:
+    """True if the app reads from the local SQLite snapshot instead of MSSQL"""
+    return current_app.config.get('DB_BACKEND', 'mssql') == 'sqlite'
+
+def get_pool_stats() -> dict:
+    """Stats of the current app's connection pool"""
+    if is_sqlite_backend():
+        from services.sqlite_backend import get_sqlite_backend
+        return get_sqlite_backend().info()
+    return get_pool().stats()
+
 @contextmanager
 def get_db_connection():
-    """Context manager for database connections"""
-    conn_str = ';'.join(f'{k}={v}' for k, v in current_app.config['DATABASE_CONFIG'].items())
-    conn = pyodbc.connect(conn_str)
-    try:
+    """Context manager for pooled database connections"""
+    started = time.perf_counter()
+    with get_pool().connection() as conn:
+        # Сколько ждали соединение из пула (видно в Server-Timing как db-acquire)
+        record_acquire(time.perf_counter() - started)
         yield conn
-    finally:
-        conn.close()
 
 def execute_query(query: str, params=None, fetch_one=False):
     """Execute a database query and return results"""
+    started = time.perf_counter()
+    result, failed = None, True
+    try:
+        result = _execute_query(query, params, fetch_one)
+        failed = False
+        return result
+    except Exception:
+        # Вызывающие часто глотают ошибку и возвращают []/None - такой результат не кэшируется
+        report_error()
+        raise
+    finally:
+        record_query(query, time.perf_counter() - started, count_rows(result), failed)
+
+def _execute_query(query: str, params=None, fetch_one=False):
+    if is_sqlite_backend():
+        from services.sqlite_backend import get_sqlite_backend
+        return get_sqlite_backend().execute(query, params, fetch_one)
+
     with get_db_connection() as conn:
         cursor = conn.cursor()
         try:
@@ -21,10 +76,10 @@ def execute_query(query: str, params=None, fetch_one=False):
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
-            
+
             # Определяем тип запроса
             query_type = query.strip().upper().split()[0]
-            
+
             # Для SELECT запросов возвращаем результаты
             if query_type == 'SELECT':
                 if fetch_one:
@@ -44,4 +99,80 @@ def execute_query(query: str, params=None, fetch_one=False):
             print(f"Database error: {str(e)}")
             print(f"Query: {query}")
             print(f"Params: {params}")
-            raise
\ No newline at end of file
+            raise
+        finally:
+            cursor.close()
+
+class UnitOfWork:
+    """Statements of one transaction on one pooled connection"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+
+    def execute(self, query: str, params=None) -> int:
+        """Run one statement inside the transaction, return affected rows"""
+        started = time.perf_counter()
+        try:
+            if params:
+                self.cursor.execute(query, params)
+            else:
+                self.cursor.execute(query)
+        except Exception:
+            record_query(query, time.perf_counter() - started, error=True)
+            raise
+        record_query(query, time.perf_counter() - started, max(self.cursor.rowcount, 0))
+        return self.cursor.rowcount
+
+    def execute_batch(self, statements) -> None:
+        """Send several (query, params) statements to the server in one round-trip
+
+        Statements are joined into a single T-SQL batch. XACT_ABORT makes any
+        failing statement abort the whole transaction on the server side, and
+        NOCOUNT keeps intermediate row counts out of the result stream.
+        """
+        queries, params = ['SET NOCOUNT ON; SET XACT_ABORT ON;'], []
+        for query, query_params in statements:
+            queries.append(query.strip().rstrip(';') + ';')
+            params.extend(query_params or ())
+        batch = '\n'.join(queries)
+        started = time.perf_counter()
+        try:
+            self.cursor.execute(batch, params)
+        except Exception:
+            record_query(batch, time.perf_counter() - started, error=True)
+            raise
+        record_query(batch, time.perf_counter() - started)
+
+    def close(self):
+        self.cursor.close()
+
+@contextmanager
+def transaction():
+    """One connection, one transaction: commit on success, rollback on any error
+
+    Usage::
+
+        with transaction() as uow:
+            uow.execute("DELETE FROM TblDialog WHERE mMId = ?", (mid,))
+            uow.execute("INSERT INTO TblDialog ...", (...))
+    """
+    if is_sqlite_backend():
+        from services.sqlite_backend import ReadOnlyBackendError
+        print("Transaction error: the SQLite snapshot backend is read-only")
+        raise ReadOnlyBackendError("The SQLite snapshot backend is read-only")
+
+    with get_db_connection() as conn:
+        uow = UnitOfWork(conn)
+        try:
+            yield uow
+            conn.commit()
+        except Exception as e:
+            try:
+                conn.rollback()
+            except pyodbc.Error as rollback_error:
+                print(f"Rollback failed: {rollback_error}")
+            print(f"Transaction error: {e}")
+            raise
+        finally:
+            uow.close()
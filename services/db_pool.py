@@ -0,0 +1,230 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import pyodbc
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out within the pool timeout"""
+
+
+class PooledConnection:
+    """pyodbc connection plus the bookkeeping the pool needs for recycling"""
+    __slots__ = ('conn', 'created_at', 'last_used', 'uses')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+
+
+class ConnectionPool:
+    """Thread-safe pool of ODBC connections.
+
+    - min_size connections are opened up front, at most max_size exist at once;
+    - a connection that was idle longer than health_check_interval is pinged
+      with ``SELECT 1`` on checkout and replaced if the ping fails;
+    - a connection is recycled after max_uses checkouts or max_age seconds;
+    - every thread gets back the connection it released last, if it is still idle
+      (per-thread affinity under a threaded server).
+    """
+
+    def __init__(self, conn_str: str, min_size: int = 1, max_size: int = 10,
+                 max_uses: int = 1000, max_age: float = 1800, timeout: float = 30,
+                 health_check_interval: float = 30,
+                 connect: Optional[Callable] = None):
+        self.conn_str = conn_str
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._connect = connect or pyodbc.connect
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: Dict[int, PooledConnection] = {}  # id(pooled) -> pooled, порядок = порядок возврата
+        self._size = 0
+        self._local = threading.local()
+        self._closed = False
+
+        self._stats = {
+            'created': 0,
+            'discarded': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time': 0.0,
+            'health_check_failures': 0,
+        }
+
+        for _ in range(self.min_size):
+            try:
+                pooled = self._open()
+            except pyodbc.Error as e:
+                print(f"Connection pool prefill failed: {e}")
+                break
+            with self._cond:
+                self._size += 1
+                self._idle[id(pooled)] = pooled
+
+    def _open(self) -> PooledConnection:
+        pooled = PooledConnection(self._connect(self.conn_str))
+        with self._cond:
+            self._stats['created'] += 1
+        return pooled
+
+    def _expired(self, pooled: PooledConnection) -> bool:
+        if self.max_uses and pooled.uses >= self.max_uses:
+            return True
+        if self.max_age and time.monotonic() - pooled.created_at >= self.max_age:
+            return True
+        return False
+
+    def _healthy(self, pooled: PooledConnection) -> bool:
+        if time.monotonic() - pooled.last_used < self.health_check_interval:
+            return True
+        try:
+            cursor = pooled.conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except pyodbc.Error:
+            with self._cond:
+                self._stats['health_check_failures'] += 1
+            return False
+
+    def _close_quietly(self, pooled: PooledConnection):
+        try:
+            pooled.conn.close()
+        except pyodbc.Error:
+            pass
+
+    def _take_idle(self) -> Optional[PooledConnection]:
+        """Pick an idle connection, preferring the one this thread used last. Caller holds the lock."""
+        if not self._idle:
+            return None
+        preferred = getattr(self._local, 'last', None)
+        if preferred is not None and id(preferred) in self._idle:
+            return self._idle.pop(id(preferred))
+        # LIFO: последним вернули - самое "тёплое" соединение
+        key = next(reversed(self._idle))
+        return self._idle.pop(key)
+
+    def acquire(self) -> PooledConnection:
+        """Check out a connection, waiting up to ``timeout`` seconds when the pool is exhausted"""
+        deadline = time.monotonic() + self.timeout
+        waited_from = None
+
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+
+                pooled = self._take_idle()
+                if pooled is None and self._size < self.max_size:
+                    self._size += 1
+                    create = True
+                else:
+                    create = False
+
+                if pooled is None and not create:
+                    if waited_from is None:
+                        waited_from = time.monotonic()
+                        self._stats['waits'] += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['wait_time'] += time.monotonic() - waited_from
+                        raise PoolTimeout(
+                            f"Timed out after {self.timeout}s waiting for a database connection "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+                    continue
+
+                if waited_from is not None:
+                    self._stats['wait_time'] += time.monotonic() - waited_from
+
+            if create:
+                try:
+                    pooled = self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif self._expired(pooled) or not self._healthy(pooled):
+                self._discard(pooled)
+                continue
+
+            pooled.uses += 1
+            self._local.last = pooled
+            with self._cond:
+                self._stats['checkouts'] += 1
+            return pooled
+
+    def release(self, pooled: PooledConnection, discard: bool = False):
+        """Return a connection to the pool; broken or worn-out connections are closed instead"""
+        if not discard:
+            try:
+                # Закрываем неявную транзакцию, чтобы следующий владелец получил чистое соединение
+                pooled.conn.rollback()
+            except pyodbc.Error:
+                discard = True
+
+        if discard or self._closed or self._expired(pooled):
+            self._discard(pooled)
+            return
+
+        pooled.last_used = time.monotonic()
+        with self._cond:
+            self._idle[id(pooled)] = pooled
+            self._cond.notify()
+
+    def _discard(self, pooled: PooledConnection):
+        self._close_quietly(pooled)
+        with self._cond:
+            self._size -= 1
+            self._stats['discarded'] += 1
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager yielding a raw pyodbc connection"""
+        pooled = self.acquire()
+        discard = False
+        try:
+            yield pooled.conn
+        except (pyodbc.OperationalError, pyodbc.InterfaceError):
+            # Соединение могло умереть - не возвращаем его в пул
+            discard = True
+            raise
+        finally:
+            self.release(pooled, discard=discard)
+
+    def stats(self) -> Dict:
+        """Snapshot of pool counters"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+            })
+        return stats
+
+    def close(self):
+        """Close all idle connections; checked-out ones are closed when released"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle.values())
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._close_quietly(pooled)
@@ -0,0 +1,214 @@
+"""Process-wide drop graph: monster -> items and item -> monsters.
+
+Monster and item detail pages used to run the same 7-way join
+(DT_Monster, DT_MonsterDrop, TP_DropGroup, DT_DropGroup, DT_DropItem, DT_Item,
+DT_ItemResource) on every view. Here the edges of that join are read once
+into parallel NumPy columns, one entry per (MID, DGroup, DDrop, DItem) row,
+sorted by MID. Two CSR-style indexes point into them:
+
+* ``monster_ids`` / ``monster_ptr`` - edges of a monster are the slice
+  ``monster_ptr[i]:monster_ptr[i + 1]``;
+* ``item_ids`` / ``item_ptr`` / ``item_order`` - the same over a permutation
+  of edges sorted by (DItem, MID, DGroup).
+
+Every edge carries its effective per-kill probability
+(group ``DPercent`` x item ``DPercent``, both in percent). Names and icons are
+not stored: they come from the catalogs through the request's ResourceLoader.
+The graph is rebuilt when the count/checksum of the drop tables, or of the
+DT_Item event flags and DT_Monster classes it depends on, changes.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from flask import current_app
+
+from services.database import execute_query
+from services.snapshot import SnapshotHolder
+
+DROP_TABLES = ('DT_MonsterDrop', 'TP_DropGroup', 'DT_DropGroup', 'DT_DropItem')
+
+# Столбцы, от которых зависит граф, по таблицам (для проверки изменений)
+FINGERPRINT_COLUMNS = dict(
+    {table: '*' for table in DROP_TABLES},
+    DT_Item='IID, IIsEvent',    # Фильтр событийных предметов
+    DT_Monster='MID, mClass',   # monster_classes
+)
+
+EDGE_COLUMNS = ('mid', 'dgroup', 'ddrop', 'item', 'number', 'group_percent', 'item_percent', 'probability')
+
+
+def _edges_query() -> str:
+    db = current_app.config['DATABASE_NAME']
+    return f"""
+        SELECT
+            a.MID,
+            a.mClass,
+            q.DGroup,
+            q.DPercent AS GroupDropChance,
+            w.DDropType,
+            w.DName,
+            e.DDrop,
+            e.DPercent AS ItemDropChance,
+            r.DItem,
+            r.DNumber
+        FROM {db}.dbo.DT_Monster a
+        JOIN {db}.dbo.DT_MonsterDrop q ON a.MID = q.MID
+        JOIN {db}.dbo.TP_DropGroup w ON q.DGroup = w.DGroup
+        JOIN {db}.dbo.DT_DropGroup e ON w.DGroup = e.DGroup
+        JOIN {db}.dbo.DT_DropItem r ON e.DDrop = r.DDrop
+        JOIN {db}.dbo.DT_Item c ON r.DItem = c.IID
+        WHERE c.IIsEvent = 0
+    """
+
+
+def _csr(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Unique values of a sorted key column and offsets of their runs"""
+    unique, starts = np.unique(keys, return_index=True)
+    return unique, np.append(starts, len(keys)).astype(np.intp)
+
+
+def _run(keys: np.ndarray, ptr: np.ndarray, key: int) -> slice:
+    i = int(np.searchsorted(keys, key))
+    if i < len(keys) and keys[i] == key:
+        return slice(ptr[i], ptr[i + 1])
+    return slice(0, 0)
+
+
+@dataclass(frozen=True)
+class DropGraph:
+    """Immutable drop edges with indexes in both directions"""
+    mid: np.ndarray                                 # Ребра отсортированы по (MID, DItem, DGroup, DDrop)
+    dgroup: np.ndarray
+    ddrop: np.ndarray
+    item: np.ndarray
+    number: np.ndarray
+    group_percent: np.ndarray
+    item_percent: np.ndarray
+    probability: np.ndarray                         # Шанс за одно убийство, 0..1
+    monster_ids: np.ndarray
+    monster_ptr: np.ndarray
+    item_ids: np.ndarray
+    item_ptr: np.ndarray
+    item_order: np.ndarray                          # Перестановка ребер по (DItem, MID, DGroup)
+    groups: Mapping[int, Tuple[int, str]]           # DGroup -> (DDropType, DName)
+    monster_classes: Mapping[int, int]              # MID -> mClass
+    loaded_at: float = field(default_factory=time.time)
+
+    def __len__(self) -> int:
+        return len(self.mid)
+
+    def monster_edges(self, monster_id: int) -> np.ndarray:
+        """Edge positions of a monster, by DItem"""
+        run = _run(self.monster_ids, self.monster_ptr, monster_id)
+        return np.arange(run.start, run.stop, dtype=np.intp)
+
+    def item_edges(self, item_id: int) -> np.ndarray:
+        """Edge positions that drop an item, by (MID, DGroup)"""
+        return self.item_order[_run(self.item_ids, self.item_ptr, item_id)]
+
+    def edge(self, position: int) -> Dict:
+        """Raw fields of one edge"""
+        dgroup = int(self.dgroup[position])
+        drop_type, name = self.groups.get(dgroup, (None, None))
+        return {
+            'MID': int(self.mid[position]),
+            'DGroup': dgroup,
+            'DDropType': drop_type,
+            'DName': name,
+            'DDrop': int(self.ddrop[position]),
+            'DItem': int(self.item[position]),
+            'DNumber': int(self.number[position]),
+            'DPercentGroup': float(self.group_percent[position]),
+            'DPercentItem': float(self.item_percent[position]),
+            'probability': float(self.probability[position]),
+        }
+
+    def edges(self, positions: np.ndarray) -> List[Dict]:
+        return [self.edge(p) for p in positions.tolist()]
+
+
+def build_drop_graph(rows) -> DropGraph:
+    """Graph from rows of the edge query (any order)"""
+    rows = list(rows)
+    count = len(rows)
+
+    def column(getter, dtype):
+        return np.fromiter((getter(row) or 0 for row in rows), dtype=dtype, count=count)
+
+    raw = {
+        'mid': column(lambda r: r.MID, np.int64),
+        'dgroup': column(lambda r: r.DGroup, np.int64),
+        'ddrop': column(lambda r: r.DDrop, np.int64),
+        'item': column(lambda r: r.DItem, np.int64),
+        'number': column(lambda r: r.DNumber, np.int64),
+        'group_percent': column(lambda r: r.GroupDropChance, np.float64),
+        'item_percent': column(lambda r: r.ItemDropChance, np.float64),
+    }
+    raw['probability'] = np.clip(raw['group_percent'] / 100.0 * raw['item_percent'] / 100.0, 0.0, 1.0)
+
+    order = np.lexsort((raw['ddrop'], raw['dgroup'], raw['item'], raw['mid']))
+    columns = {name: raw[name][order] for name in EDGE_COLUMNS}
+    item_order = np.lexsort((columns['dgroup'], columns['mid'], columns['item'])).astype(np.intp)
+
+    monster_ids, monster_ptr = _csr(columns['mid'])
+    item_ids, item_ptr = _csr(columns['item'][item_order])
+    for array in (*columns.values(), monster_ids, monster_ptr, item_ids, item_ptr, item_order):
+        array.flags.writeable = False
+
+    return DropGraph(
+        **columns,
+        monster_ids=monster_ids,
+        monster_ptr=monster_ptr,
+        item_ids=item_ids,
+        item_ptr=item_ptr,
+        item_order=item_order,
+        groups=MappingProxyType({row.DGroup: (row.DDropType, row.DName) for row in rows}),
+        monster_classes=MappingProxyType({row.MID: row.mClass for row in rows}),
+    )
+
+
+def _load_graph() -> DropGraph:
+    return build_drop_graph(execute_query(_edges_query()))
+
+
+def _fingerprint() -> tuple:
+    db = current_app.config['DATABASE_NAME']
+    token = ()
+    for table, columns in FINGERPRINT_COLUMNS.items():
+        token += tuple(execute_query(
+            f"SELECT COUNT_BIG(*), CHECKSUM_AGG(BINARY_CHECKSUM({columns})) FROM {db}.dbo.{table}",
+            fetch_one=True,
+        ))
+    return token
+
+
+_holder: Optional[SnapshotHolder] = None
+_holder_lock = threading.Lock()
+
+
+def get_graph_holder() -> SnapshotHolder:
+    """Process-wide holder of the drop graph"""
+    global _holder
+    if _holder is None:
+        with _holder_lock:
+            if _holder is None:
+                _holder = SnapshotHolder(
+                    'drop_graph',
+                    load=_load_graph,
+                    fingerprint=_fingerprint,
+                    ttl=current_app.config.get('DROP_GRAPH_TTL', 600),
+                )
+    return _holder
+
+
+def is_graph_enabled() -> bool:
+    return current_app.config.get('DROP_GRAPH_ENABLED', True)
+
+
+def get_drop_graph() -> DropGraph:
+    """Current drop graph (loaded on first use)"""
+    return get_graph_holder().get()
@@ -0,0 +1,140 @@
+"""Concurrent loading of a page's independent sub-queries.
+
+Detail pages call a dozen unrelated getters, each doing its own query.
+``FanOut`` submits them to a bounded, process-wide thread pool (every task
+runs in the app context and checks out its own pooled DB connection) and
+joins them before rendering, so page latency becomes the slowest query
+instead of the sum.
+
+Per-task timings are appended to ``g.fanout_timings`` and sent back in the
+``Server-Timing`` response header, together with the request's SQL and sheet
+totals from services.query_stats (workers count into the request's stats).
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import current_app, g, has_request_context
+
+from services.cache import error_count
+from services.query_stats import bind_stats, current_stats, timing_entries
+
+_MISSING = object()
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+@dataclass
+class TaskTiming:
+    name: str
+    duration: float         # Секунды выполнения в потоке пула
+    wait: float = 0.0       # Сколько задача ждала свободный поток
+    status: str = 'ok'      # ok / degraded (ошибка проглочена, результат - заглушка) / error / timeout
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Process-wide pool shared by all requests (FANOUT_MAX_WORKERS threads)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config.get('FANOUT_MAX_WORKERS', 8),
+                    thread_name_prefix='fanout',
+                )
+    return _executor
+
+
+class FanOut:
+    """Request-scoped group of concurrent tasks.
+
+    ``submit`` starts a task, ``result`` waits for it (at most until the
+    optional deadline, ``timeout`` seconds after the FanOut was created).
+    A task error is re-raised by ``result`` unless a default is given; a
+    task that misses the deadline returns its default (or raises
+    ``TimeoutError`` if it has none).
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.app = current_app._get_current_object()
+        self.executor = get_executor()
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self._futures: Dict[str, Any] = {}
+        self._submitted_at: Dict[str, float] = {}
+        self.timings: Dict[str, TaskTiming] = {}
+        self.query_stats = current_stats()
+
+    def _run(self, name: str, fn: Callable, args, kwargs):
+        started = time.monotonic()
+        wait = started - self._submitted_at[name]
+        errors = error_count()
+        try:
+            with self.app.app_context(), bind_stats(self.query_stats):
+                value = fn(*args, **kwargs)
+        except Exception:
+            self.timings[name] = TaskTiming(name, time.monotonic() - started, wait, 'error')
+            raise
+        status = 'ok' if error_count() == errors else 'degraded'
+        self.timings[name] = TaskTiming(name, time.monotonic() - started, wait, status)
+        return value
+
+    def submit(self, name: str, fn: Callable, *args, **kwargs) -> 'FanOut':
+        self._submitted_at[name] = time.monotonic()
+        self._futures[name] = self.executor.submit(self._run, name, fn, args, kwargs)
+        return self
+
+    def _remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def result(self, name: str, default: Any = _MISSING) -> Any:
+        """Value of a task; waits for it until the deadline"""
+        future = self._futures[name]
+        try:
+            return future.result(timeout=self._remaining())
+        except FutureTimeout:
+            future.cancel()
+            self.timings.setdefault(name, TaskTiming(name, time.monotonic() - self._submitted_at[name],
+                                                     status='timeout'))
+            print(f"Sub-query {name} missed the page deadline")
+            if default is _MISSING:
+                raise TimeoutError(f"Sub-query {name} missed the page deadline")
+            return default
+        except Exception as e:
+            if default is _MISSING:
+                raise
+            print(f"Error in sub-query {name}: {e}")
+            return default
+
+    def results(self, default: Any = _MISSING,
+                defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """All task values by name (see ``result``); records timings for the response.
+
+        ``defaults`` gives per-task fallbacks and takes precedence over ``default``.
+        """
+        defaults = defaults or {}
+        try:
+            return {name: self.result(name, defaults.get(name, default)) for name in self._futures}
+        finally:
+            self.record_timings()
+
+    @property
+    def timed_out(self) -> List[str]:
+        return [name for name, timing in self.timings.items() if timing.status == 'timeout']
+
+    def record_timings(self):
+        if has_request_context():
+            timings = g.setdefault('fanout_timings', [])
+            timings.extend(t for t in self.timings.values() if t not in timings)
+
+
+def server_timing_header() -> Optional[str]:
+    """``Server-Timing`` value: SQL/sheet totals and the sub-queries run during this request"""
+    entries = timing_entries()
+    entries.extend(f'{t.name};dur={t.duration * 1000:.1f};desc="{t.status}"'
+                   for t in g.get('fanout_timings') or [])
+    return ', '.join(entries) or None
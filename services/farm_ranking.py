@@ -0,0 +1,162 @@
+"""Effective drop rates and "best farm spot" ranking over the drop graph.
+
+For every (item, monster) pair the drop graph edges are reduced once, with
+NumPy segment sums, into
+
+* ``expected_per_kill`` - sum of ``probability x DNumber`` over the pair's edges;
+* ``chance_per_kill`` - chance of at least one drop, ``1 - prod(1 - p)``;
+* ``kills_per_hour`` - ``3600 / mTick`` of the monster's spawn (0 if unknown).
+
+The table is rebuilt only when the drop graph or the monster respawn ticks
+are swapped, so ranking an item is a slice plus an argsort over its pairs.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+from services.asset_manifest import monster_pic_url
+from services.drop_graph import DropGraph, get_drop_graph
+from services.monster_catalog import get_monster_ticks, is_catalog_enabled as is_monster_catalog_enabled
+from services.resource_loader import get_resource_loader
+from services.utils import get_monster_locations
+
+SECONDS_PER_HOUR = 3600.0
+
+SORT_KEYS = ('hour', 'kill')
+
+
+@dataclass(frozen=True)
+class FarmTable:
+    """Per (item, monster) drop rates, sorted by (item, MID)"""
+    graph: DropGraph
+    ticks: Mapping[int, int]
+    item: np.ndarray
+    mid: np.ndarray
+    expected_per_kill: np.ndarray
+    chance_per_kill: np.ndarray
+    tick: np.ndarray
+    kills_per_hour: np.ndarray
+    expected_per_hour: np.ndarray
+    item_ids: np.ndarray
+    item_ptr: np.ndarray
+
+    def pairs(self, item_id: int) -> slice:
+        i = int(np.searchsorted(self.item_ids, item_id))
+        if i < len(self.item_ids) and self.item_ids[i] == item_id:
+            return slice(self.item_ptr[i], self.item_ptr[i + 1])
+        return slice(0, 0)
+
+
+def build_farm_table(graph: DropGraph, ticks: Mapping[int, int]) -> FarmTable:
+    """Reduce drop graph edges to per-pair rates"""
+    order = np.lexsort((graph.mid, graph.item))
+    item, mid = graph.item[order], graph.mid[order]
+    probability = graph.probability[order]
+
+    # Начало каждой пары (item, MID) в отсортированных ребрах
+    boundary = np.ones(len(order), dtype=bool)
+    boundary[1:] = (item[1:] != item[:-1]) | (mid[1:] != mid[:-1])
+    starts = np.flatnonzero(boundary)
+
+    if len(starts):
+        expected = np.add.reduceat(probability * graph.number[order], starts)
+        with np.errstate(divide='ignore'):
+            log_miss = np.add.reduceat(np.log1p(-probability), starts)
+        chance = 1.0 - np.exp(log_miss)
+    else:
+        expected = chance = np.zeros(0, dtype=np.float64)
+
+    pair_item, pair_mid = item[starts], mid[starts]
+    tick = np.fromiter((ticks.get(m, 0) or 0 for m in pair_mid.tolist()), dtype=np.float64, count=len(starts))
+    kills_per_hour = np.divide(SECONDS_PER_HOUR, tick, out=np.zeros_like(tick), where=tick > 0)
+
+    unique, item_starts = np.unique(pair_item, return_index=True)
+    columns = {
+        'item': pair_item,
+        'mid': pair_mid,
+        'expected_per_kill': expected,
+        'chance_per_kill': chance,
+        'tick': tick,
+        'kills_per_hour': kills_per_hour,
+        'expected_per_hour': expected * kills_per_hour,
+        'item_ids': unique,
+        'item_ptr': np.append(item_starts, len(starts)).astype(np.intp),
+    }
+    for array in columns.values():
+        array.flags.writeable = False
+    return FarmTable(graph=graph, ticks=ticks, **columns)
+
+
+_table: Optional[FarmTable] = None
+_table_lock = threading.Lock()
+
+
+def get_farm_table() -> FarmTable:
+    """Table for the current drop graph and respawn ticks (rebuilt when either is swapped)"""
+    global _table
+    graph = get_drop_graph()
+    ticks = get_monster_ticks() if is_monster_catalog_enabled() else None
+    table = _table
+    if table is None or table.graph is not graph or (ticks is not None and table.ticks is not ticks):
+        with _table_lock:
+            table = _table
+            if table is None or table.graph is not graph or (ticks is not None and table.ticks is not ticks):
+                # Без каталога монстров тики читаются один раз на граф
+                table = build_farm_table(graph, ticks if ticks is not None else get_monster_ticks())
+                _table = table
+    return table
+
+
+def rank_farm_spots(item_id: int, sort: str = 'hour', limit: int = 20,
+                    location: str = '') -> List[Dict]:
+    """Monsters that drop an item, best first.
+
+    ``sort='hour'`` ranks by expected items per hour (monsters without a known
+    respawn tick go last), ``sort='kill'`` by expected items per kill.
+    ``location`` keeps only monsters with a matching location name.
+    """
+    table = get_farm_table()
+    run = table.pairs(item_id)
+    positions = np.arange(run.start, run.stop, dtype=np.intp)
+    if not len(positions):
+        return []
+
+    if sort == 'kill':
+        keys = (-table.expected_per_hour[positions], -table.expected_per_kill[positions])
+    else:
+        keys = (-table.expected_per_kill[positions], -table.expected_per_hour[positions])
+    positions = positions[np.lexsort(keys)]  # Последний ключ - главный
+
+    locations = get_monster_locations()
+    needle = location.casefold()
+    if needle:
+        positions = np.fromiter(
+            (p for p in positions.tolist()
+             if any(needle in str(loc.get('Location') or '').casefold()
+                    or needle in str(loc.get('LocationLevel') or '').casefold()
+                    for loc in locations.get(int(table.mid[p]), []))),
+            dtype=np.intp,
+        )
+    positions = positions[:limit]
+
+    loader = get_resource_loader().want_monsters(table.mid[positions].tolist())
+    results = []
+    for rank, p in enumerate(positions.tolist(), start=1):
+        mid = int(table.mid[p])
+        expected = float(table.expected_per_kill[p])
+        results.append({
+            'rank': rank,
+            'MID': mid,
+            'MName': loader.monster_name(mid),
+            'Pic': monster_pic_url(mid),
+            'Locations': locations.get(mid, []),
+            'mTick': int(table.tick[p]),
+            'KillsPerHour': float(table.kills_per_hour[p]),
+            'ChancePerKill': float(table.chance_per_kill[p]),
+            'ExpectedPerKill': expected,
+            'ExpectedPerHour': float(table.expected_per_hour[p]),
+            'KillsPerItem': 1.0 / expected if expected > 0 else None,
+        })
+    return results
@@ -0,0 +1,186 @@
+"""Process-wide read-only catalog of DT_Item rows and their RType=2 icons.
+
+Listing pages read items from here instead of querying DT_Item on every
+request. The catalog is loaded once, then every ITEM_CATALOG_TTL seconds a
+cheap change-detection query (row count + CHECKSUM_AGG) is run in the
+background; when it differs only the changed rows are re-read (per-row
+BINARY_CHECKSUM diff) and the new snapshot is swapped in atomically.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+from flask import current_app
+
+from models.item import ITEM_COLUMNS, DT_Item, DT_ItemResource
+from services.columnar import ColumnarTable, Selection
+from services.database import execute_query
+from services.snapshot import SnapshotHolder
+
+# MSSQL ограничивает запрос 2100 параметрами
+MAX_IN_PARAMS = 1000
+
+ITEMS_FINGERPRINT_QUERY = "SELECT COUNT_BIG(*), MAX(IID), CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM DT_Item"
+RESOURCES_FINGERPRINT_QUERY = """
+    SELECT COUNT_BIG(*), CHECKSUM_AGG(BINARY_CHECKSUM(*))
+    FROM DT_ItemResource WHERE RType = 2
+"""
+ROW_CHECKSUMS_QUERY = "SELECT IID, BINARY_CHECKSUM(*) AS RowChecksum FROM DT_Item"
+
+# Типы колонок для фильтров; остальные числовые колонки - float64
+ITEM_COLUMN_DTYPES = {
+    'IID': np.int64,
+    'IType': np.int64,
+    'ILevel': np.int64,
+    'IMaxStack': np.int64,
+    'IQuestNo': np.int64,
+    'IIsEvent': bool,
+    'IIsTest': bool,
+    'IIsIndict': bool,
+    'IIsCharge': bool,
+    'IIsPartyDrop': bool,
+}
+
+
+@dataclass(frozen=True)
+class ItemCatalogSnapshot:
+    """Immutable view of DT_Item; items are shared between requests and must not be mutated"""
+    items: Tuple[DT_Item, ...]                      # Отсортированы по IID
+    by_id: Mapping[int, DT_Item]
+    resources: Mapping[int, DT_ItemResource]
+    checksums: Mapping[int, int]
+    resources_token: tuple
+    table: ColumnarTable                            # Колонки для фильтров, в порядке items
+    loaded_at: float = field(default_factory=time.time)
+
+    def get(self, item_id: int) -> Optional[DT_Item]:
+        return self.by_id.get(item_id)
+
+    def file_path(self, item_id: int) -> str:
+        """Icon URL for an item, or the no-image placeholder"""
+        resource = self.resources.get(item_id)
+        if resource is not None:
+            return resource.file_path
+        return f"{current_app.config['GITHUB_URL']}no_item_image.png"
+
+    def items_by_type(self, item_types: Iterable[int], search_term: str = '') -> Selection:
+        """Items of the given types whose name contains search_term (case-insensitive), by IID"""
+        positions = np.flatnonzero(np.isin(self.table.column('IType'), list(item_types)))
+        needle = search_term.casefold()
+        items = self.items
+        positions = np.fromiter(
+            (i for i in positions.tolist()
+             if items[i].IName is not None and (not needle or needle in items[i].IName.casefold())),
+            dtype=np.intp,
+        )
+        return self.table.take(positions)
+
+
+def _chunks(values: List[int], size: int = MAX_IN_PARAMS):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _load_item_rows(item_ids: Optional[List[int]] = None) -> Dict[int, DT_Item]:
+    """Read DT_Item rows (all, or only the given IDs) as IID -> DT_Item"""
+    if item_ids is None:
+        rows = execute_query(f"SELECT {ITEM_COLUMNS} FROM DT_Item")
+        return {row.IID: DT_Item.from_row(row) for row in rows}
+
+    items = {}
+    for chunk in _chunks(item_ids):
+        placeholders = ','.join('?' * len(chunk))
+        rows = execute_query(f"SELECT {ITEM_COLUMNS} FROM DT_Item WHERE IID IN ({placeholders})", chunk)
+        items.update((row.IID, DT_Item.from_row(row)) for row in rows)
+    return items
+
+
+def _load_resources() -> Dict[int, DT_ItemResource]:
+    rows = execute_query("SELECT ROwnerID, RFileName, RPosX, RPosY FROM DT_ItemResource WHERE RType = 2")
+    return {
+        row.ROwnerID: DT_ItemResource(row.ROwnerID, row.RFileName, row.RPosX, row.RPosY)
+        for row in rows
+    }
+
+
+def _load_checksums() -> Dict[int, int]:
+    return {row.IID: row.RowChecksum for row in execute_query(ROW_CHECKSUMS_QUERY)}
+
+
+def _resources_token() -> tuple:
+    return tuple(execute_query(RESOURCES_FINGERPRINT_QUERY, fetch_one=True))
+
+
+def _build_snapshot(items: Dict[int, DT_Item], resources: Dict[int, DT_ItemResource],
+                    checksums: Dict[int, int], resources_token: tuple) -> ItemCatalogSnapshot:
+    ordered = tuple(items[iid] for iid in sorted(items))
+    return ItemCatalogSnapshot(
+        items=ordered,
+        by_id=MappingProxyType({item.IID: item for item in ordered}),
+        resources=MappingProxyType(resources),
+        checksums=MappingProxyType(checksums),
+        resources_token=resources_token,
+        table=ColumnarTable(ordered, ITEM_COLUMN_DTYPES),
+    )
+
+
+def _load_catalog() -> ItemCatalogSnapshot:
+    """Full load of DT_Item + icons"""
+    return _build_snapshot(_load_item_rows(), _load_resources(), _load_checksums(), _resources_token())
+
+
+def _refresh_catalog(old: ItemCatalogSnapshot) -> ItemCatalogSnapshot:
+    """Incremental refresh: re-read only rows whose BINARY_CHECKSUM changed"""
+    checksums = _load_checksums()
+    changed = [iid for iid, checksum in checksums.items() if old.checksums.get(iid) != checksum]
+
+    items = {iid: item for iid, item in old.by_id.items() if iid in checksums}
+    removed = len(old.by_id) - len(items)
+    items.update(_load_item_rows(changed))
+
+    resources_token = _resources_token()
+    resources = dict(old.resources) if resources_token == old.resources_token else _load_resources()
+
+    print(f"Item catalog refreshed: {len(changed)} changed, {removed} removed")
+    return _build_snapshot(items, resources, checksums, resources_token)
+
+
+def _fingerprint() -> tuple:
+    return tuple(execute_query(ITEMS_FINGERPRINT_QUERY, fetch_one=True)) + _resources_token()
+
+
+_holder: Optional[SnapshotHolder] = None
+_holder_lock = threading.Lock()
+
+
+def get_catalog_holder() -> SnapshotHolder:
+    """Process-wide holder of the item catalog"""
+    global _holder
+    if _holder is None:
+        with _holder_lock:
+            if _holder is None:
+                _holder = SnapshotHolder(
+                    'item_catalog',
+                    load=_load_catalog,
+                    fingerprint=_fingerprint,
+                    refresh=_refresh_catalog,
+                    ttl=current_app.config.get('ITEM_CATALOG_TTL', 300),
+                )
+    return _holder
+
+
+def is_catalog_enabled() -> bool:
+    return current_app.config.get('ITEM_CATALOG_ENABLED', True)
+
+
+def get_item_catalog() -> ItemCatalogSnapshot:
+    """Current catalog snapshot (loaded on first use)"""
+    return get_catalog_holder().get()
+
+
+def refresh_item_catalog() -> bool:
+    """Run change detection now; returns True if a new snapshot was swapped in"""
+    return get_catalog_holder().check()
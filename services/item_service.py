@@ -1,22 +1,73 @@
 from typing import List, Dict, Optional, Tuple, Union
 from os.path import splitext
-from functools import lru_cache
 from flask import current_app
 
-from models.item import (DT_Item, DT_ItemResource, TblSpecificProcItem, DT_ItemAbnormalResist,
+from models.item import (ITEM_COLUMNS, DT_Item, DT_ItemResource, TblSpecificProcItem, DT_ItemAbnormalResist,
 DT_Bead, DT_ItemBeadModule, TblBeadHoleProb, DT_ItemAttributeAdd, 
 DT_ItemAttributeResist, DT_ItemProtect, DT_ItemSlain, DT_ItemPanalty)
 
+from services.cache import cached, tag_ids
 from services.database import execute_query
-from services.utils import get_skill_icon_path, clean_description, get_google_sheets_data
+from services.columnar import Predicate, select_records
+from services.item_catalog import ITEM_COLUMN_DTYPES, get_item_catalog, is_catalog_enabled
+from services.asset_manifest import sprite_url
+from services.resource_loader import get_resource_loader
+from services.utils import get_skill_icon_path, clean_description, get_attribute_type_names
 from config.settings import ATTRIBUTE_TYPE_WEAPON_URL, ATTRIBUTE_TYPE_ARMOR_URL
 
 # Фильтры
-def apply_filters(items, filters):
-    """Optimized filter function with debugging"""
-    #print(f"Applying filters: {filters}")
-    #print(f"Initial items count: {len(items)}")
+# Булевы фильтры: параметр -> (колонка, конвертер значения)
+BOOL_FILTERS = {
+    'stackableFilter': ('IMaxStack', lambda x: int(x) if x in ['0', '1'] else None),
+    'eventItemFilter': ('IIsEvent', lambda x: bool(int(x))),
+    'testItemFilter': ('IIsTest', lambda x: bool(int(x))),
+    'indictFilter': ('IIsIndict', lambda x: bool(int(x))),
+    'chargeFilter': ('IIsCharge', lambda x: bool(int(x))),
+    'partyDropFilter': ('IIsPartyDrop', lambda x: bool(int(x)))
+}
+
+# Числовые фильтры: <name>Min / <name>Max
+NUMERIC_FILTERS = [
+    'IDHIT', 'IDDD', 'IRHIT', 'IRDD', 'IMHIT', 'IMDD', 'IHPPlus', 'IMPPlus',
+    'ISTR', 'IDEX', 'IINT', 'IHPRegen', 'IMPRegen', 'IAttackRate', 'IMoveRate', 'ICritical'
+]
+
+
+def compile_item_filters(filters: Dict) -> List[Predicate]:
+    """Turn request filter args into column predicates for the columnar engine"""
+    predicates = []
+
+    if type_filter := filters.get('typeFilter'):
+        predicates.append(('IType', 'eq', int(type_filter)))
+
+    if filters.get('levelMin') or filters.get('levelMax'):
+        predicates.append(('ILevel', 'ge', int(filters.get('levelMin', 0))))
+        predicates.append(('ILevel', 'le', int(filters.get('levelMax', 999999))))
+
+    for filter_name, (column, converter) in BOOL_FILTERS.items():
+        if filter_val := filters.get(filter_name):
+            val = converter(filter_val)
+            if val is not None:
+                predicates.append((column, 'eq', val))
+
+    for column in NUMERIC_FILTERS:
+        if min_val := filters.get(f"{column}Min"):
+            predicates.append((column, 'ge', float(min_val)))
+        if max_val := filters.get(f"{column}Max"):
+            predicates.append((column, 'le', float(max_val)))
+
+    if filters.get('weightMin') or filters.get('weightMax'):
+        predicates.append(('IWeight', 'ge', float(filters.get('weightMin', 0))))
+        predicates.append(('IWeight', 'le', float(filters.get('weightMax', 999999))))
+
+    if quest_no := filters.get('questNoFilter'):
+        predicates.append(('IQuestNo', 'eq', int(quest_no)))
+
+    return predicates
+
 
+def apply_filters(items, filters):
+    """Filter items with one vectorized mask over the catalog columns"""
     if not items or not filters:
         return items
 
@@ -25,111 +76,8 @@ def apply_filters(items, filters):
     if not filters:
         return items
 
-    filtered_items = items
-
     try:
-        # Process filters in order of most restrictive first
-        if type_filter := filters.get('typeFilter'):
-            #print(f"Applying type filter: {type_filter}")
-            type_val = int(type_filter)
-            filtered_items = [item for item in filtered_items if item.IType == type_val]
-            #print(f"After type filter: {len(filtered_items)} items")
-            if not filtered_items:
-                return []
-
-        # Level filter (common restriction)
-        if filters.get('levelMin') or filters.get('levelMax'):
-            level_min = int(filters.get('levelMin', 0))
-            level_max = int(filters.get('levelMax', 999999))
-            #print(f"Applying level filter: min={level_min}, max={level_max}")
-            filtered_items = [item for item in filtered_items 
-                            if level_min <= item.ILevel <= level_max]
-            #print(f"After level filter: {len(filtered_items)} items")
-            if not filtered_items:
-                return []
-
-        # Boolean filters (quick to process)
-        bool_fields = {
-            'stackableFilter': ('IMaxStack', lambda x: int(x) if x in ['0', '1'] else None),
-            'eventItemFilter': ('IIsEvent', lambda x: bool(int(x))),
-            'testItemFilter': ('IIsTest', lambda x: bool(int(x))),
-            'indictFilter': ('IIsIndict', lambda x: bool(int(x))),
-            'chargeFilter': ('IIsCharge', lambda x: bool(int(x))),
-            'partyDropFilter': ('IIsPartyDrop', lambda x: bool(int(x)))
-        }
-
-        for filter_name, (attr, converter) in bool_fields.items():
-            if filter_val := filters.get(filter_name):
-                #print(f"Applying boolean filter {filter_name}: {filter_val}")
-                val = converter(filter_val)
-                if val is not None:
-                    filtered_items = [item for item in filtered_items 
-                                    if getattr(item, attr) == val]
-                    #print(f"After {filter_name}: {len(filtered_items)} items")
-                    if not filtered_items:
-                        return []
-
-        # Numeric range filters
-        numeric_fields = {
-            'IDHIT': ('IDHIT', float), 
-            'IDDD': ('IDDD', float),
-            'IRHIT': ('IRHIT', float), 
-            'IRDD': ('IRDD', float),
-            'IMHIT': ('IMHIT', float), 
-            'IMDD': ('IMDD', float),
-            'IHPPlus': ('IHPPlus', float),
-            'IMPPlus': ('IMPPlus', float),
-            'ISTR': ('ISTR', float),
-            'IDEX': ('IDEX', float),
-            'IINT': ('IINT', float),
-            'IHPRegen': ('IHPRegen', float),
-            'IMPRegen': ('IMPRegen', float),
-            'IAttackRate': ('IAttackRate', float),
-            'IMoveRate': ('IMoveRate', float),
-            'ICritical': ('ICritical', float)
-        }
-
-        for field_base, (attr, converter) in numeric_fields.items():
-            min_key = f"{field_base}Min"
-            max_key = f"{field_base}Max"
-            
-            if min_val := filters.get(min_key):
-                #print(f"Applying min filter {min_key}: {min_val}")
-                min_val = converter(min_val)
-                filtered_items = [item for item in filtered_items 
-                                if converter(getattr(item, attr, 0) or 0) >= min_val]
-                #print(f"After {min_key}: {len(filtered_items)} items")
-                if not filtered_items:
-                    return []
-                    
-            if max_val := filters.get(max_key):
-                #print(f"Applying max filter {max_key}: {max_val}")
-                max_val = converter(max_val)
-                filtered_items = [item for item in filtered_items 
-                                if converter(getattr(item, attr, 0) or 0) <= max_val]
-                #print(f"After {max_key}: {len(filtered_items)} items")
-                if not filtered_items:
-                    return []
-
-        # Weight filter (special handling for float)
-        if filters.get('weightMin') or filters.get('weightMax'):
-            weight_min = float(filters.get('weightMin', 0))
-            weight_max = float(filters.get('weightMax', 999999))
-            #print(f"Applying weight filter: min={weight_min}, max={weight_max}")
-            filtered_items = [item for item in filtered_items 
-                            if weight_min <= float(item.IWeight or 0) <= weight_max]
-            #print(f"After weight filter: {len(filtered_items)} items")
-
-        # Quest No filter
-        if quest_no := filters.get('questNoFilter'):
-            #print(f"Applying quest filter: {quest_no}")
-            quest_val = int(quest_no)
-            filtered_items = [item for item in filtered_items 
-                            if item.IQuestNo == quest_val]
-            #print(f"After quest filter: {len(filtered_items)} items")
-
-        #print(f"Final filtered items count: {len(filtered_items)}")
-        return filtered_items
+        return select_records(items, compile_item_filters(filters), ITEM_COLUMN_DTYPES)
 
     except Exception as e:
         print(f"Error in apply_filters: {e}")
@@ -234,7 +182,7 @@ def item_to_dict(item):
 
 
 
-#@lru_cache(maxsize=10000)
+@cached(maxsize=10000, tags=tag_ids('item'))
 def get_item_by_id(item_ids: Union[int, List[int]]) -> Union[Optional[DT_Item], List[Optional[DT_Item]]]:
     """Get item by ID with caching. Now supports both single ID and list of IDs"""
     single_id = isinstance(item_ids, int)
@@ -245,24 +193,7 @@ def get_item_by_id(item_ids: Union[int, List[int]]) -> Union[Optional[DT_Item],
         
     placeholders = ','.join('?' * len(ids))
     query = f"""
-    SELECT 
-        IID, IName, IType, ILevel, IDHIT, IDDD, IRHIT, IRDD, IMHIT, IMDD,
-        IHPPlus, IMPPlus, ISTR, IDEX, IINT, IMaxStack, IWeight, IUseType,
-        IUseNum, IRecycle, IHPRegen, IMPRegen, IAttackRate, IMoveRate,
-        ICritical, ITermOfValidity, ITermOfValidityMi, IDesc, IStatus,
-        IFakeID, IFakeName, IUseMsg, IRange, IUseClass, IDropEffect,
-        IUseLevel, IUseEternal, IUseDelay, IUseInAttack, IIsEvent,
-        IIsIndict, IAddWeight, ISubType, IIsCharge, INationOp,
-        IPShopItemType, IQuestNo, IIsTest, IQuestNeedCnt, IContentsLv,
-        IIsConfirm, IIsSealable, IAddDDWhenCritical, mSealRemovalNeedCnt,
-        mIsPracticalPeriod, mIsReceiveTown, IIsReinforceDestroy,
-        IAddPotionRestore, IAddMaxHpWhenTransform, IAddMaxMpWhenTransform,
-        IAddAttackRateWhenTransform, IAddMoveRateWhenTransform, ISupportType,
-        ITermOfValidityLv, mIsUseableUTGWSvr, IAddShortAttackRange,
-        IAddLongAttackRange, IWeaponPoisonType, IDPV, IMPV, IRPV, IDDV,
-        IMDV, IRDV, IHDPV, IHMPV, IHRPV, IHDDV, IHMDV, IHRDV,
-        ISubDDWhenCritical, IGetItemFeedback, IEnemySubCriticalHit,
-        IIsPartyDrop, IMaxBeadHoleCount, ISubTypeOption, mIsDeleteArenaSvr
+    SELECT {ITEM_COLUMNS}
     FROM DT_Item 
     WHERE IID IN ({placeholders})
     """
@@ -270,97 +201,7 @@ def get_item_by_id(item_ids: Union[int, List[int]]) -> Union[Optional[DT_Item],
     rows = execute_query(query, ids, fetch_one=False)
     
     # Создаем словарь id -> item для сохранения порядка
-    items_dict = {}
-    for row in rows:
-        items_dict[row.IID] = DT_Item(
-            IID=row.IID,
-            IName=row.IName,
-            IType=row.IType,
-            ILevel=row.ILevel,
-            IDHIT=row.IDHIT,
-            IDDD=row.IDDD,
-            IRHIT=row.IRHIT,
-            IRDD=row.IRDD,
-            IMHIT=row.IMHIT,
-            IMDD=row.IMDD,
-            IHPPlus=row.IHPPlus,
-            IMPPlus=row.IMPPlus,
-            ISTR=row.ISTR,
-            IDEX=row.IDEX,
-            IINT=row.IINT,
-            IMaxStack=row.IMaxStack,
-            IWeight=float(row.IWeight),
-            IUseType=row.IUseType,
-            IUseNum=row.IUseNum,
-            IRecycle=row.IRecycle,
-            IHPRegen=row.IHPRegen,
-            IMPRegen=row.IMPRegen,
-            IAttackRate=row.IAttackRate,
-            IMoveRate=row.IMoveRate,
-            ICritical=row.ICritical,
-            ITermOfValidity=row.ITermOfValidity,
-            ITermOfValidityMi=row.ITermOfValidityMi,
-            IDesc=row.IDesc.replace('\\n', ' ⭑ ') if row.IDesc else '',
-            IStatus=row.IStatus,
-            IFakeID=row.IFakeID,
-            IFakeName=row.IFakeName,
-            IUseMsg=row.IUseMsg,
-            IRange=row.IRange,
-            IUseClass=row.IUseClass,
-            IDropEffect=row.IDropEffect,
-            IUseLevel=row.IUseLevel,
-            IUseEternal=bool(row.IUseEternal),
-            IUseDelay=row.IUseDelay,
-            IUseInAttack=bool(row.IUseInAttack),
-            IIsEvent=bool(row.IIsEvent),
-            IIsIndict=bool(row.IIsIndict),
-            IAddWeight=float(row.IAddWeight),
-            ISubType=row.ISubType,
-            IIsCharge=bool(row.IIsCharge),
-            INationOp=row.INationOp,
-            IPShopItemType=row.IPShopItemType,
-            IQuestNo=row.IQuestNo,
-            IIsTest=bool(row.IIsTest),
-            IQuestNeedCnt=row.IQuestNeedCnt,
-            IContentsLv=row.IContentsLv,
-            IIsConfirm=bool(row.IIsConfirm),
-            IIsSealable=bool(row.IIsSealable),
-            IAddDDWhenCritical=row.IAddDDWhenCritical,
-            mSealRemovalNeedCnt=row.mSealRemovalNeedCnt,
-            mIsPracticalPeriod=bool(row.mIsPracticalPeriod),
-            mIsReceiveTown=bool(row.mIsReceiveTown),
-            IIsReinforceDestroy=bool(row.IIsReinforceDestroy),
-            IAddPotionRestore=row.IAddPotionRestore,
-            IAddMaxHpWhenTransform=row.IAddMaxHpWhenTransform,
-            IAddMaxMpWhenTransform=row.IAddMaxMpWhenTransform,
-            IAddAttackRateWhenTransform=row.IAddAttackRateWhenTransform,
-            IAddMoveRateWhenTransform=row.IAddMoveRateWhenTransform,
-            ISupportType=row.ISupportType,
-            ITermOfValidityLv=row.ITermOfValidityLv,
-            mIsUseableUTGWSvr=bool(row.mIsUseableUTGWSvr),
-            IAddShortAttackRange=row.IAddShortAttackRange,
-            IAddLongAttackRange=row.IAddLongAttackRange,
-            IWeaponPoisonType=row.IWeaponPoisonType,
-            IDPV=row.IDPV,
-            IMPV=row.IMPV,
-            IRPV=row.IRPV,
-            IDDV=row.IDDV,
-            IMDV=row.IMDV,
-            IRDV=row.IRDV,
-            IHDPV=row.IHDPV,
-            IHMPV=row.IHMPV,
-            IHRPV=row.IHRPV,
-            IHDDV=row.IHDDV,
-            IHMDV=row.IHMDV,
-            IHRDV=row.IHRDV,
-            ISubDDWhenCritical=row.ISubDDWhenCritical,
-            IGetItemFeedback=row.IGetItemFeedback,
-            IEnemySubCriticalHit=row.IEnemySubCriticalHit,
-            IIsPartyDrop=bool(row.IIsPartyDrop),
-            IMaxBeadHoleCount=row.IMaxBeadHoleCount,
-            ISubTypeOption=row.ISubTypeOption,
-            mIsDeleteArenaSvr=bool(row.mIsDeleteArenaSvr)
-        )
+    items_dict = {row.IID: DT_Item.from_row(row) for row in rows}
     
     if single_id:
         return items_dict.get(item_ids)
@@ -369,37 +210,40 @@ def get_item_by_id(item_ids: Union[int, List[int]]) -> Union[Optional[DT_Item],
 # ! Загрузка предметов (ГЛАВНАЯ СТРАНИЦА ПО /items/)
 def get_items_by_type(item_types: List[int], search_term: str = '') -> Tuple[List[DT_Item], Dict[int, str]]:
     """Generic function to fetch items by type with optional search"""
-    # Используем параметризованный запрос для безопасности
+    # Основной путь - каталог в памяти, без запросов к БД
+    if is_catalog_enabled():
+        catalog = get_item_catalog()
+        items = catalog.items_by_type(item_types, search_term)
+        return items, {item.IID: catalog.file_path(item.IID) for item in items}
+
+    # Один запрос на все типы сразу: предметы + иконки (RType = 2)
     placeholders = ','.join('?' * len(item_types))
     
     query = f"""
-    SELECT IID
-    FROM DT_ITem
-    WHERE IType IN ({placeholders})
-    AND IName LIKE ?
-    ORDER BY IID
+    SELECT {ITEM_COLUMNS},
+        r.RFileName, r.RPosX, r.RPosY
+    FROM DT_Item AS i
+    LEFT JOIN DT_ItemResource AS r ON (r.ROwnerID = i.IID AND r.RType = 2)
+    WHERE i.IType IN ({placeholders})
+    AND i.IName LIKE ?
+    ORDER BY i.IID
     """
     
     # Создаем список параметров: сначала item_types, затем search_term
-    params = item_types + [f'%{search_term}%']
+    params = list(item_types) + [f'%{search_term}%']
     
     rows = execute_query(query, params, fetch_one=False)
-    item_ids = [row.IID for row in rows]
     
-    if not item_ids:
-        return [], {}
-        
-    # Получаем все предметы и ресурсы одним запросом для всех ID
-    items = get_item_by_id(item_ids)
-    resources = get_item_resource(item_ids)
-   
-    # Формируем словарь путей к файлам
+    items = []
     file_paths = {}
-    for item_id in item_ids:
-        if item_id in resources:
-            file_paths[item_id] = resources[item_id].file_path
+    for row in rows:
+        if row.IID in file_paths:  # Несколько иконок у предмета - берем первую
+            continue
+        items.append(DT_Item.from_row(row))
+        if row.RFileName:
+            file_paths[row.IID] = DT_ItemResource(row.IID, row.RFileName, row.RPosX, row.RPosY).file_path
         else:
-            file_paths[item_id] = f"{current_app.config['GITHUB_URL']}no_item_image.png"
+            file_paths[row.IID] = f"{current_app.config['GITHUB_URL']}no_item_image.png"
                
     return items, file_paths
 
@@ -407,7 +251,7 @@ def get_items_by_type(item_types: List[int], search_term: str = '') -> Tuple[Lis
 
 
 
-#@lru_cache(maxsize=1000)
+@cached(tags=tag_ids('item'))
 def get_item_resource(item_ids: Union[int, List[int]]) -> Union[Optional[DT_ItemResource], Dict[int, DT_ItemResource]]:
     """Get item resource by ID with caching. Now supports both single ID and list of IDs"""
     single_id = isinstance(item_ids, int)
@@ -435,20 +279,19 @@ def get_item_resource(item_ids: Union[int, List[int]]) -> Union[Optional[DT_Item
         return resources_dict.get(item_ids)
     return resources_dict
 
-#@lru_cache(maxsize=1000)
 # * Получаем ссылку на изображение предмета, по его IID
+@cached(tags=tag_ids('item'))
 def get_item_pic_url(item_id):
     if isinstance(item_id, int):
-        item_id = get_item_resource(item_id)
+        item_id = get_resource_loader().item_resource(item_id)
     
     if hasattr(item_id, 'RFileName') and hasattr(item_id, 'RPosX') and hasattr(item_id, 'RPosY'):
-        item_pic_url = f"{current_app.config['GITHUB_URL']}{item_id.RFileName}_{item_id.RPosX}_{item_id.RPosY}.png"
-        return item_pic_url
+        return sprite_url(item_id.RFileName, item_id.RPosX, item_id.RPosY)
     else:
         raise ValueError(f"Объект item_id ({item_id}) не содержит необходимых атрибутов (RFileName, RPosX, RPosY)")
 
 
-#@lru_cache(maxsize=1000)
+@cached(tags=tag_ids('item'))
 def get_item_model_resource(item_id: int) -> Optional[DT_ItemResource]:
     """Get item resource by ID with caching"""
     query = "SELECT * FROM DT_ItemResource WHERE ROwnerID = ? AND RType = 0"
@@ -464,7 +307,7 @@ def get_item_model_resource(item_id: int) -> Optional[DT_ItemResource]:
     return None
 
 
-#@lru_cache(maxsize=1000)
+@cached(tags=tag_ids('item'))
 def get_specific_proc_item(item_id: int) -> Optional[TblSpecificProcItem]:
     """Get TblSpecificProcItem"""
     query = """
@@ -509,6 +352,7 @@ def get_specific_proc_item(item_id: int) -> Optional[TblSpecificProcItem]:
 
 
 # DT_ItemAbnormalResist Check
+@cached(tags=tag_ids('item'))
 def get_itemabnormalResist_data(item_id: int) -> Optional[List[DT_ItemAbnormalResist]]:
     """Get item resource by MID with caching"""
     query = """
@@ -600,6 +444,7 @@ def get_itemabnormalResist_data(item_id: int) -> Optional[List[DT_ItemAbnormalRe
     return None
 
 # DT_Bead Check
+@cached(tags=tag_ids('item'))
 def get_rune_bead_data(item_id: int) -> Optional[DT_Bead]:
     """Get detailed bead/rune data by item ID with caching"""
     query = """
@@ -721,6 +566,7 @@ def get_rune_bead_data(item_id: int) -> Optional[DT_Bead]:
 
 
 # DT_ItemBeadModule Check
+@cached(tags=tag_ids('item'))
 def get_item_bead_module_data(item_id: int) -> Optional[List[DT_ItemBeadModule]]:
     query = """
         SELECT
@@ -764,6 +610,7 @@ def get_item_bead_module_data(item_id: int) -> Optional[List[DT_ItemBeadModule]]
 
 
 # TblBeadHoleProb Check
+@cached(tags=tag_ids('item'))
 def get_item_bead_holeprob_data(item_id: int) -> Optional[List[TblBeadHoleProb]]:
     query = """
     SELECT 
@@ -798,8 +645,9 @@ def get_item_bead_holeprob_data(item_id: int) -> Optional[List[TblBeadHoleProb]]
 
 
 # DT_ItemAttributeAdd Check
+@cached(tags=tag_ids('item'))
 def get_item_attribute_add_data(item_id: int) -> Optional[List[DT_ItemAttributeAdd]]:
-    attribute_type_weapon_df = get_google_sheets_data(ATTRIBUTE_TYPE_WEAPON_URL)
+    attribute_type_names = get_attribute_type_names(ATTRIBUTE_TYPE_WEAPON_URL)
 
     query = """
     SELECT
@@ -819,7 +667,7 @@ def get_item_attribute_add_data(item_id: int) -> Optional[List[DT_ItemAttributeA
     row = execute_query(query, (item_id,), fetch_one=True)
     
     if row:
-        AName = attribute_type_weapon_df[attribute_type_weapon_df['AType'] == row[1]]['AName'].iloc[0] if not attribute_type_weapon_df.empty else ''
+        AName = attribute_type_names.get(row[1], '')
 
         return DT_ItemAttributeAdd(
             row.AID,
@@ -835,8 +683,9 @@ def get_item_attribute_add_data(item_id: int) -> Optional[List[DT_ItemAttributeA
 
 
 # DT_ItemAttributeResist Check
+@cached(tags=tag_ids('item'))
 def get_item_attribute_resist_data(item_id: int) -> Optional[List[DT_ItemAttributeResist]]:
-    attribute_type_weapon_df = get_google_sheets_data(ATTRIBUTE_TYPE_ARMOR_URL)
+    attribute_type_names = get_attribute_type_names(ATTRIBUTE_TYPE_ARMOR_URL)
 
     query = """
     SELECT
@@ -856,7 +705,7 @@ def get_item_attribute_resist_data(item_id: int) -> Optional[List[DT_ItemAttribu
     row = execute_query(query, (item_id,), fetch_one=True)
     
     if row:
-        AName = attribute_type_weapon_df[attribute_type_weapon_df['AType'] == row[1]]['AName'].iloc[0] if not attribute_type_weapon_df.empty else ''
+        AName = attribute_type_names.get(row[1], '')
 
         return DT_ItemAttributeResist(
             row.AID,
@@ -873,6 +722,7 @@ def get_item_attribute_resist_data(item_id: int) -> Optional[List[DT_ItemAttribu
 
 
 # DT_ItemProtect Check
+@cached(tags=tag_ids('item'))
 def get_item_protect_data(item_id: int) -> Optional[List[DT_ItemProtect]]:
     
     query = """
@@ -917,6 +767,7 @@ def get_item_protect_data(item_id: int) -> Optional[List[DT_ItemProtect]]:
 
 
 # DT_ItemSlain Check
+@cached(tags=tag_ids('item'))
 def get_item_slain_data(item_id: int) -> Optional[List[DT_ItemSlain]]:
     
     query = """
@@ -958,6 +809,7 @@ def get_item_slain_data(item_id: int) -> Optional[List[DT_ItemSlain]]:
 
 
 # DT_ItemPanalty Check
+@cached(tags=tag_ids('item'))
 def get_item_panalty_data(item_id: int) -> Optional[List[DT_ItemPanalty]]:
     
     query = """
@@ -1062,12 +914,7 @@ def get_item_panalty_data(item_id: int) -> Optional[List[DT_ItemPanalty]]:
 
 # Получить имя предмета по IID
 def get_item_name(item_id: int):
-    query = "SELECT IName FROM DT_Item WHERE IID = ?"
-    iname = execute_query(query, (item_id,), fetch_one=True)
-    
-    if iname:
-        return iname[0]
-    return None
+    return get_resource_loader().item_name(item_id)
 
 
 
@@ -1,7 +1,9 @@
 from typing import List, Dict, Tuple
 from flask import current_app
+from services.cache import cached, tag_ids
 from services.database import execute_query
-from services.item_service import get_item_resource
+from services.asset_manifest import sprite_url
+from services.resource_loader import get_resource_loader
 from services.utils import get_payment_type_name
 
 def get_merchant_sell_list() -> Tuple[List[Tuple], Dict]:
@@ -41,6 +43,7 @@ def get_merchant_sell_list() -> Tuple[List[Tuple], Dict]:
 
     return merchants_data, file_paths
 
+@cached(tags=tag_ids('item'))
 def get_merchant_sellers(item_id: int) -> List[Dict]:
     """Get merchants selling a specific item"""
     query = f"""
@@ -72,6 +75,7 @@ def get_merchant_sellers(item_id: int) -> List[Dict]:
     
     return merchants
 
+@cached(tags=tag_ids('monster'))
 def get_merchant_items(merchant_id: int) -> List[Dict]:
     """Get all items sold by a specific merchant"""
     query = f"""
@@ -91,14 +95,16 @@ def get_merchant_items(merchant_id: int) -> List[Dict]:
     
     rows = execute_query(query, (merchant_id,))
     merchant_items = []
+    # Иконки всех товаров - одним запросом
+    loader = get_resource_loader().want_items(row.ItemID for row in rows)
 
     for row in rows:
         merch_pic = None
-        merch_item_pics = get_item_resource(row.ItemID)
+        merch_item_pics = loader.item_resource(row.ItemID)
 
         if merch_item_pics:
             if merch_item_pics.RFileName and merch_item_pics.RPosX is not None and merch_item_pics.RPosY is not None:
-                merch_pic = f"{current_app.config['GITHUB_URL']}{merch_item_pics.RFileName.split('.')[0]}_{merch_item_pics.RPosX}_{merch_item_pics.RPosY}.png"
+                merch_pic = sprite_url(merch_item_pics.RFileName, merch_item_pics.RPosX, merch_item_pics.RPosY)
 
         merchant_items.append({
             "MerchantListID": row.ListID,
@@ -0,0 +1,143 @@
+"""Process-wide read-only catalog of DT_Monster rows with a columnar filter table.
+
+Respawn ticks come from one aggregate over TblMonsterSpot and are stored as
+the ``mTick`` column, so the tick range filter needs no per-monster query.
+Like the item catalog, a cheap count/checksum query is re-run every
+MONSTER_CATALOG_TTL seconds in the background and the snapshot is rebuilt
+when it changes (DT_Monster is small enough to always reload in full).
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+from flask import current_app
+
+from models.monster import MONSTER_COLUMNS, Monster
+from services.columnar import ColumnarTable, Selection
+from services.database import execute_query
+from services.snapshot import SnapshotHolder
+
+MONSTERS_FINGERPRINT_QUERY = "SELECT COUNT_BIG(*), MAX(MID), CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM DT_Monster"
+
+# Типы колонок для фильтров; остальные числовые колонки - float64
+MONSTER_COLUMN_DTYPES = {
+    'MID': np.int64,
+    'mLevel': np.int64,
+    'MExp': np.int64,
+    'MClass': np.int64,
+    'MRaceType': np.int64,
+    'mAttackType': np.int64,
+    'mTick': np.int64,
+    'mIsEvent': bool,
+    'mIsTest': bool,
+    'mIsShowHp': bool,
+}
+
+
+def _spot_table() -> str:
+    return f"{current_app.config['DATABASE_NAME']}.dbo.TblMonsterSpot"
+
+
+@dataclass(frozen=True)
+class MonsterCatalogSnapshot:
+    """Immutable view of DT_Monster; monsters are shared between requests and must not be mutated"""
+    monsters: Tuple[Monster, ...]                   # Отсортированы по MID
+    by_id: Mapping[int, Monster]
+    ticks: Mapping[int, int]                        # MID -> mTick (сек.), 0 если нет точки появления
+    table: ColumnarTable
+    loaded_at: float = field(default_factory=time.time)
+
+    def get(self, monster_id: int) -> Optional[Monster]:
+        return self.by_id.get(monster_id)
+
+    def file_path(self, monster_id: int) -> str:
+        return f"{current_app.config['GITHUB_URL']}{monster_id}.png"
+
+    def monsters_by_class(self, class_ids: Iterable[int], search_term: str = '') -> Selection:
+        """Monsters of the given classes whose name or MID contains search_term, by MID"""
+        positions = np.flatnonzero(np.isin(self.table.column('MClass'), list(class_ids)))
+        needle = search_term.casefold()
+        if needle:
+            monsters = self.monsters
+            positions = np.fromiter(
+                (i for i in positions.tolist()
+                 if needle in str(monsters[i].MID)
+                 or (monsters[i].MName is not None and needle in monsters[i].MName.casefold())),
+                dtype=np.intp,
+            )
+        return self.table.take(positions)
+
+
+def _load_ticks() -> Dict[int, int]:
+    """MID -> respawn tick: normal spot if there is one, otherwise the event spot"""
+    rows = execute_query(
+        f"SELECT mMID, mIsEvent, MIN(mTick) AS mTick FROM {_spot_table()} GROUP BY mMID, mIsEvent"
+    )
+    ticks = {}
+    for row in sorted(rows, key=lambda r: int(r.mIsEvent), reverse=True):
+        ticks[row.mMID] = row.mTick or 0  # mIsEvent = 0 записывается последним и побеждает
+    return ticks
+
+
+def _load_catalog() -> MonsterCatalogSnapshot:
+    rows = execute_query(f"SELECT {MONSTER_COLUMNS} FROM DT_Monster ORDER BY MID")
+    monsters = tuple(Monster.from_row(row) for row in rows)
+    ticks = _load_ticks()
+    tick_column = np.fromiter((ticks.get(m.MID, 0) for m in monsters), dtype=np.int64, count=len(monsters))
+    return MonsterCatalogSnapshot(
+        monsters=monsters,
+        by_id=MappingProxyType({m.MID: m for m in monsters}),
+        ticks=MappingProxyType(ticks),
+        table=ColumnarTable(monsters, MONSTER_COLUMN_DTYPES, columns={'mTick': tick_column}),
+    )
+
+
+def _fingerprint() -> tuple:
+    spots = execute_query(
+        f"SELECT COUNT_BIG(*), CHECKSUM_AGG(BINARY_CHECKSUM(mMID, mIsEvent, mTick)) FROM {_spot_table()}",
+        fetch_one=True,
+    )
+    return tuple(execute_query(MONSTERS_FINGERPRINT_QUERY, fetch_one=True)) + tuple(spots)
+
+
+_holder: Optional[SnapshotHolder] = None
+_holder_lock = threading.Lock()
+
+
+def get_catalog_holder() -> SnapshotHolder:
+    """Process-wide holder of the monster catalog"""
+    global _holder
+    if _holder is None:
+        with _holder_lock:
+            if _holder is None:
+                _holder = SnapshotHolder(
+                    'monster_catalog',
+                    load=_load_catalog,
+                    fingerprint=_fingerprint,
+                    ttl=current_app.config.get('MONSTER_CATALOG_TTL', 300),
+                )
+    return _holder
+
+
+def is_catalog_enabled() -> bool:
+    return current_app.config.get('MONSTER_CATALOG_ENABLED', True)
+
+
+def get_monster_catalog() -> MonsterCatalogSnapshot:
+    """Current catalog snapshot (loaded on first use)"""
+    return get_catalog_holder().get()
+
+
+def get_monster_ticks() -> Mapping[int, int]:
+    """MID -> respawn tick, from the catalog when it is enabled"""
+    if is_catalog_enabled():
+        return get_monster_catalog().ticks
+    return _load_ticks()
+
+
+def refresh_monster_catalog() -> bool:
+    """Run change detection now; returns True if a new snapshot was swapped in"""
+    return get_catalog_holder().check()
@@ -1,23 +1,77 @@
 from typing import List, Dict, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 import requests
 from flask import current_app
-from models.monster import Monster
+from models.monster import MONSTER_COLUMNS, Monster
+from services.cache import cached, tag_ids
 from services.database import execute_query, get_db_connection
-from services.utils import get_google_sheets_data, get_skill_icon_path, clean_description
-from config.settings import MONSTER_CLASS_URL, ATTRIBUTE_TYPE_WEAPON_URL, ATTRIBUTE_TYPE_ARMOR_URL
+from services.columnar import ColumnarTable, Predicate, Selection, select_records
+from services.monster_catalog import MONSTER_COLUMN_DTYPES, get_monster_catalog, get_monster_ticks, is_catalog_enabled
+from services.asset_manifest import NO_ITEM_IMAGE, asset_url, monster_pic_url
+from services.drop_graph import get_drop_graph, is_graph_enabled as is_drop_graph_enabled
+from services.resource_loader import get_resource_loader
+from services.utils import get_monster_class_names, get_attribute_type_names, get_skill_icon_path, clean_description
+from config.settings import ATTRIBUTE_TYPE_WEAPON_URL, ATTRIBUTE_TYPE_ARMOR_URL
 from models.monster import DT_MonsterResource, DT_MonsterAbnormalResist, DT_MonsterAttributeAdd, DT_MonsterAttributeResist, DT_MonsterProtect, DT_MonsterSlain
 
 
 
+def _int_or_none(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+# Диапазоны: параметр -> (колонка, операция); нечисловые значения игнорируются
+MONSTER_RANGE_FILTERS = {
+    'mLevelMin': ('mLevel', 'ge'),
+    'mLevelMax': ('mLevel', 'le'),
+    'MExpMin': ('MExp', 'ge'),
+    'MExpMax': ('MExp', 'le'),
+    'mTickMin': ('mTick', 'ge'),   # Время респауна, сек.
+    'mTickMax': ('mTick', 'le'),
+}
+
+MONSTER_FLAG_FILTERS = {
+    'eventMonsterFilter': 'mIsEvent',
+    'testMonsterFilter': 'mIsTest',
+    'showHpFilter': 'mIsShowHp',
+}
+
+
+def compile_monster_filters(filters: Dict) -> List[Predicate]:
+    """Turn request filter args into column predicates for the columnar engine"""
+    predicates = []
+
+    for filter_name, (column, op) in MONSTER_RANGE_FILTERS.items():
+        value = _int_or_none(filters.get(filter_name))
+        if value is not None:
+            predicates.append((column, op, value))
+
+    if class_filter := filters.get('classFilter'):
+        predicates.append(('MClass', 'eq', int(class_filter)))
+
+    if race_filter := filters.get('raceFilter'):
+        predicates.append(('MRaceType', 'eq', int(race_filter)))
+
+    if (attack_type := _int_or_none(filters.get('attackTypeFilter'))) is not None:
+        predicates.append(('mAttackType', 'eq', attack_type))
+
+    for filter_name, column in MONSTER_FLAG_FILTERS.items():
+        if filters.get(filter_name) == '1':
+            predicates.append((column, 'eq', True))
+
+    return predicates
+
+
 def apply_monster_filters(monsters: List[Monster], filters: Dict) -> List[Monster]:
-    """Apply filters to monster list with improved numeric handling"""
+    """Filter monsters with one vectorized mask over the catalog columns"""
     
     if not monsters or not filters:
         return monsters
 
-    filtered_monsters = monsters
-
     try:
         # Remove empty filters
         filters = {k: v for k, v in filters.items() if v and k != '' and v != ''}
@@ -25,77 +79,18 @@ def apply_monster_filters(monsters: List[Monster], filters: Dict) -> List[Monste
         if not filters:
             return monsters
 
-        # Debug log
-        #print("Applied filters:", filters)
-
-        # Level range
-        if level_min := filters.get('mLevelMin'):
-            try:
-                level_min = int(level_min)
-                filtered_monsters = [m for m in filtered_monsters if m.mLevel >= level_min]
-            except (ValueError, TypeError):
-                pass
-                
-        if level_max := filters.get('mLevelMax'):
-            try:
-                level_max = int(level_max)
-                filtered_monsters = [m for m in filtered_monsters if m.mLevel <= level_max]
-            except (ValueError, TypeError):
-                pass
-
-        # Experience range
-        if exp_min := filters.get('MExpMin'):
-            try:
-                exp_min = int(exp_min)
-                filtered_monsters = [m for m in filtered_monsters if m.MExp >= exp_min]
-            except (ValueError, TypeError):
-                pass
-                
-        if exp_max := filters.get('MExpMax'):
-            try:
-                exp_max = int(exp_max)
-                filtered_monsters = [m for m in filtered_monsters if m.MExp <= exp_max]
-            except (ValueError, TypeError):
-                pass
-
-        # # Respawn Time range
-        # if tick_min := filters.get('mTickMin'):
-        #     try:
-        #         tick_min = int(tick_min)
-        #         filtered_monsters = [m for m in filtered_monsters if get_monster_mtick(m.MID) >= tick_min]
-        #     except (ValueError, TypeError):
-        #         pass
-                
-        # if tick_max := filters.get('mTickMax'):
-        #     try:
-        #         tick_max = int(tick_max)
-        #         filtered_monsters = [m for m in filtered_monsters if get_monster_mtick(m.MID) <= tick_max]
-        #     except (ValueError, TypeError):
-        #         pass
-
-        # Other filters remain the same...
-        if class_filter := filters.get('classFilter'):
-            filtered_monsters = [m for m in filtered_monsters if m.MClass == int(class_filter)]
-
-        if race_filter := filters.get('raceFilter'):
-            filtered_monsters = [m for m in filtered_monsters if m.MRaceType == int(race_filter)]
-
-        if attack_type := filters.get('attackTypeFilter'):
-            try:
-                attack_type = int(attack_type)
-                filtered_monsters = [m for m in filtered_monsters if m.mAttackType == attack_type]
-            except ValueError:
-                pass
-
-        # Boolean filters
-        if filters.get('eventMonsterFilter') == '1':
-            filtered_monsters = [m for m in filtered_monsters if bool(m.mIsEvent)]
-        if filters.get('testMonsterFilter') == '1':
-            filtered_monsters = [m for m in filtered_monsters if bool(m.mIsTest)]
-        if filters.get('showHpFilter') == '1':
-            filtered_monsters = [m for m in filtered_monsters if bool(m.mIsShowHp)]
-
-        return filtered_monsters
+        predicates = compile_monster_filters(filters)
+        if not predicates:
+            return monsters
+
+        if isinstance(monsters, Selection) or not any(column == 'mTick' for column, _, _ in predicates):
+            return select_records(monsters, predicates, MONSTER_COLUMN_DTYPES)
+
+        # Список не из каталога - колонку mTick собираем одним агрегатным запросом
+        ticks = get_monster_ticks()
+        tick_column = np.fromiter((ticks.get(m.MID, 0) for m in monsters), dtype=np.int64, count=len(monsters))
+        table = ColumnarTable(monsters, MONSTER_COLUMN_DTYPES, columns={'mTick': tick_column})
+        return table.select(predicates)
 
     except Exception as e:
         print(f"Error in apply_monster_filters: {e}")
@@ -176,6 +171,7 @@ def monster_to_dict(monster: Monster) -> dict:
 
 
 
+@cached(tags=tag_ids('monster'))
 def get_monster_resource(monster_id: int) -> Optional[DT_MonsterResource]:
     """Get monster resource by MID with caching"""
     query = "SELECT RFileName FROM DT_MonsterResource WHERE ROwnerID = ?"
@@ -191,10 +187,10 @@ def get_monster_resource_url(RFileName):
     monster_model_no = f"{current_app.config['GITHUB_URL']}models/m{int(RFileName):05}"
     
 def get_monster_pic_url(monster_id: int):
-    monster_pic_url = f"{current_app.config['GITHUB_URL']}{monster_id}.png"
-    return monster_pic_url
+    return monster_pic_url(monster_id)
 
 # Respawn Time Info
+@cached(tags=tag_ids('monster'))
 def get_monster_mtick(monster_id: int, mIsEvent: int) -> Union[tuple[int, int], tuple[int, int]]:
     query = f"SELECT mTick, mVarRespawnTick FROM {current_app.config['DATABASE_NAME']}.dbo.TblMonsterSpot WHERE mMID = ? AND mIsEvent = ?"
     result = execute_query(query, (monster_id, mIsEvent), fetch_one=True)
@@ -206,74 +202,11 @@ def get_monster_mtick(monster_id: int, mIsEvent: int) -> Union[tuple[int, int],
 
 
 
+@cached(tags=tag_ids('monster'))
 def get_monster_by_id(monster_id: int) -> Optional[Monster]:
     """Get monster by ID"""
-    query = """
-    SELECT 
-        MID,
-        MName,
-        mLevel,
-        MClass,
-        MExp,
-        MHIT,
-        MMinD,
-        MMaxD,
-        MAttackRateOrg,
-        MMoveRateOrg,
-        MAttackRateNew,
-        MMoveRateNew,
-        MHP,
-        MMP,
-        MMoveRange,
-        MGbjType,
-        MRaceType,
-        MAiType,
-        MCastingDelay,
-        MChaotic,
-        MSameRace1,
-        MSameRace2,
-        MSameRace3,
-        MSameRace4,
-        mSightRange,
-        mAttackRange,
-        mSkillRange,
-        mBodySize,
-        mDetectTransF,
-        mDetectTransP,
-        mDetectChao,
-        mAiEx,
-        mScale,
-        mIsResistTransF,
-        mIsEvent,
-        mIsTest,
-        mHPNew,
-        mMPNew,
-        mBuyMerchanID,
-        mSellMerchanID,
-        mChargeMerchanID,
-        mTransformWeight,
-        mNationOp,
-        mHPRegen,
-        mMPRegen,
-        IContentsLv,
-        mIsEventTest,
-        mIsShowHp,
-        mSupportType,
-        mVolitionOfHonor,
-        mWMapIconType,
-        mIsAmpliableTermOfValidity,
-        mAttackType,
-        mTransType,
-        mDPV,
-        mMPV,
-        mRPV,
-        mDDV,
-        mMDV,
-        mRDV,
-        mSubDDWhenCritical,
-        mEnemySubCriticalHit,
-        mEventQuest,
-        mEScale
+    query = f"""
+    SELECT {MONSTER_COLUMNS}
     FROM DT_Monster 
     WHERE MID = ?
     """
@@ -281,77 +214,109 @@ def get_monster_by_id(monster_id: int) -> Optional[Monster]:
     row = execute_query(query, (monster_id,), fetch_one=True)
     #print(row)
     if row:
-        return Monster(
-            MID=row.MID,
-            MName=row.MName,
-            mLevel=row.mLevel,
-            MClass=row.MClass,
-            MExp=row.MExp,
-            MHIT=row.MHIT,
-            MMinD=row.MMinD,
-            MMaxD=row.MMaxD,
-            MAttackRateOrg=row.MAttackRateOrg,
-            MMoveRateOrg=row.MMoveRateOrg,
-            MAttackRateNew=row.MAttackRateNew,
-            MMoveRateNew=row.MMoveRateNew,
-            MHP=row.MHP,
-            MMP=row.MMP,
-            MMoveRange=row.MMoveRange,
-            MGbjType=row.MGbjType,
-            MRaceType=row.MRaceType,
-            MAiType=row.MAiType,
-            MCastingDelay=row.MCastingDelay,
-            MChaotic=row.MChaotic,
-            MSameRace1=row.MSameRace1,
-            MSameRace2=row.MSameRace2,
-            MSameRace3=row.MSameRace3,
-            MSameRace4=row.MSameRace4,
-            mSightRange=row.mSightRange,
-            mAttackRange=row.mAttackRange,
-            mSkillRange=row.mSkillRange,
-            mBodySize=row.mBodySize,
-            mDetectTransF=int(row.mDetectTransF),
-            mDetectTransP=int(row.mDetectTransP),
-            mDetectChao=int(row.mDetectChao),
-            mAiEx=row.mAiEx,
-            mScale=row.mScale,
-            mIsResistTransF=int(row.mIsResistTransF),
-            mIsEvent=int(row.mIsEvent),
-            mIsTest=int(row.mIsTest),
-            mHPNew=row.mHPNew,
-            mMPNew=row.mMPNew,
-            mBuyMerchanID=row.mBuyMerchanID,
-            mSellMerchanID=row.mSellMerchanID,
-            mChargeMerchanID=row.mChargeMerchanID,
-            mTransformWeight=row.mTransformWeight,
-            mNationOp=row.mNationOp,
-            mHPRegen=row.mHPRegen,
-            mMPRegen=row.mMPRegen,
-            IContentsLv=row.IContentsLv,
-            mIsEventTest=int(row.mIsEventTest),
-            mIsShowHp=int(row.mIsShowHp),
-            mSupportType=row.mSupportType,
-            mVolitionOfHonor=row.mVolitionOfHonor,
-            mWMapIconType=row.mWMapIconType,
-            mIsAmpliableTermOfValidity=int(row.mIsAmpliableTermOfValidity),
-            mAttackType=row.mAttackType,
-            mTransType=row.mTransType,
-            mDPV=row.mDPV,
-            mMPV=row.mMPV,
-            mRPV=row.mRPV,
-            mDDV=row.mDDV,
-            mMDV=row.mMDV,
-            mRDV=row.mRDV,
-            mSubDDWhenCritical=row.mSubDDWhenCritical,
-            mEnemySubCriticalHit=row.mEnemySubCriticalHit,
-            mEventQuest=int(row.mEventQuest),
-            mEScale=row.mEScale
-        )
+        return Monster.from_row(row)
     return None
 
+def _any_drop_chance(probabilities) -> float:
+    """Chance that at least one of several independent drops happens"""
+    return float(1.0 - np.prod(1.0 - np.asarray(probabilities, dtype=np.float64)))
+
+
+def _monster_drops_from_graph(monster_id: int) -> List[Dict]:
+    """get_monster_drops() over the drop graph, without SQL"""
+    graph = get_drop_graph()
+    positions = graph.monster_edges(monster_id)
+    if not len(positions):
+        return []
+    monster_class_info = get_monster_class_names().get(graph.monster_classes.get(monster_id), '')
+    loader = get_resource_loader().want_items(graph.item[positions].tolist()).want_monsters((monster_id,))
+    no_image = asset_url(NO_ITEM_IMAGE)
+
+    unique_results = {}
+    probabilities = {}
+    for edge in graph.edges(positions):
+        key = edge['DItem']
+        if key not in unique_results:
+            unique_results[key] = {
+                "MID": monster_id,
+                "MName": loader.monster_name(monster_id),
+                "MClass": monster_class_info,
+                "DDropType": edge['DDropType'],
+                "DPercentGroup": edge['DPercentGroup'],
+                "DGroup": edge['DGroup'],
+                "DName": edge['DName'],
+                "DDrop": edge['DDrop'],
+                "DPercentItem": round(edge['DPercentItem'], 1),
+                "DItem": key,
+                "IName": loader.item_name(key),
+                "DNumber": edge['DNumber'],
+                "Pic": loader.item_pic_url(key, no_image),
+                "count": 1
+            }
+            probabilities[key] = [edge['probability']]
+        else:
+            unique_results[key]["count"] += 1
+            unique_results[key]["DNumber"] += edge['DNumber']
+            probabilities[key].append(edge['probability'])
+
+    # Ребра уже отсортированы по DItem
+    results = list(unique_results.values())
+    for row in results:
+        row["Probability"] = _any_drop_chance(probabilities[row["DItem"]])
+    return results
+
+
+def _monster_drop_info_from_graph(item_id: int) -> List[Dict]:
+    """get_monster_drop_info() over the drop graph, without SQL"""
+    graph = get_drop_graph()
+    positions = graph.item_edges(item_id)
+    if not len(positions):
+        return []
+    monster_class_names = get_monster_class_names()
+    loader = get_resource_loader().want_monsters(graph.mid[positions].tolist()).want_items((item_id,))
+
+    unique_results = {}
+    probabilities = {}
+    for edge in graph.edges(positions):
+        mid = edge['MID']
+        key = (mid, edge['DGroup'])
+        if key not in unique_results:
+            unique_results[key] = {
+                "MID": mid,
+                "MName": loader.monster_name(mid),
+                "MClass": monster_class_names.get(graph.monster_classes.get(mid), ''),
+                "DDropType": edge['DDropType'],
+                "DPercentGroup": edge['DPercentGroup'],
+                "DGroup": edge['DGroup'],
+                "DName": edge['DName'],
+                "DDrop": edge['DDrop'],
+                "DPercentItem": round(edge['DPercentItem'], 1),
+                "DItem": item_id,
+                "IName": loader.item_name(item_id),
+                "DNumber": edge['DNumber'],
+                "Pic": monster_pic_url(mid),
+                "count": 1
+            }
+            probabilities[key] = [edge['probability']]
+        else:
+            unique_results[key]["count"] += 1
+            probabilities[key].append(edge['probability'])
+
+    # Ребра предмета уже отсортированы по (MID, DGroup)
+    results = list(unique_results.values())
+    for row in results:
+        row["Probability"] = _any_drop_chance(probabilities[(row["MID"], row["DGroup"])])
+    return results
+
+
+@cached(tags=tag_ids('monster'))
 def get_monster_drops(monster_id: int) -> List[Dict]:
     """Get all drops for a specific monster"""
-    monster_class_df = get_google_sheets_data(MONSTER_CLASS_URL)
+    # Основной путь - граф дропа в памяти
+    if is_drop_graph_enabled():
+        return _monster_drops_from_graph(monster_id)
+
+    monster_class_names = get_monster_class_names()
     
     query = f"""
     SELECT
@@ -386,9 +351,7 @@ def get_monster_drops(monster_id: int) -> List[Dict]:
 
     for row in rows:
         # Get monster class info from Google Sheets data
-        monster_class_info = monster_class_df[
-            monster_class_df['MClass'] == row.mClass
-        ]['MName'].iloc[0] if not monster_class_df.empty else ''
+        monster_class_info = monster_class_names.get(row.mClass, '')
 
         key = row.DItem
         pic = None
@@ -421,9 +384,13 @@ def get_monster_drops(monster_id: int) -> List[Dict]:
     return results
 
 
+@cached(tags=tag_ids('item'))
 def get_monster_drop_info(item_id: int) -> List[Dict]:
-    """Get all drops for a specific monster"""
-    monster_class_df = get_google_sheets_data(MONSTER_CLASS_URL)
+    """Get all monsters that drop a specific item"""
+    if is_drop_graph_enabled():
+        return _monster_drop_info_from_graph(item_id)
+
+    monster_class_names = get_monster_class_names()
    
     query = f"""
         SELECT
@@ -453,9 +420,7 @@ def get_monster_drop_info(item_id: int) -> List[Dict]:
     unique_results = {}
     for row in rows:
         # Получаем информацию о классе монстра из данных Google Sheets
-        monster_class_info = monster_class_df[
-            monster_class_df['MClass'] == row.mClass
-        ]['MName'].iloc[0] if not monster_class_df.empty else ''
+        monster_class_info = monster_class_names.get(row.mClass, '')
        
         # Используем комбинацию MID и DGroup как ключ
         key = (row.MID, row.DropGroupID)
@@ -492,14 +457,20 @@ def get_monster_drop_info(item_id: int) -> List[Dict]:
 
 def get_monsters_by_class(class_ids: List[int], search_term: str = '') -> Tuple[List[Monster], Dict]:
     """Get monsters by class IDs with optional search"""
+    # Основной путь - каталог в памяти, без запросов к БД
+    if is_catalog_enabled():
+        catalog = get_monster_catalog()
+        monsters = catalog.monsters_by_class(class_ids, search_term)
+        return monsters, {m.MID: catalog.file_path(m.MID) for m in monsters}
+
     class_str = ','.join(str(c) for c in class_ids)
     #print(f"XXXXXXX {class_str}")
     # Base query
     query = """
-        SELECT *
+        SELECT {}
         FROM DT_Monster 
         WHERE MClass IN ({})
-    """.format(class_str)
+    """.format(MONSTER_COLUMNS, class_str)
     
     # Add search condition if provided
     params = []
@@ -520,72 +491,7 @@ def get_monsters_by_class(class_ids: List[int], search_term: str = '') -> Tuple[
     file_paths = {}
     
     for row in rows:
-        monster = Monster(
-            MID=row.MID,
-            MName=row.MName,
-            mLevel=row.mLevel,
-            MClass=row.MClass,
-            MExp=row.MExp,
-            MHIT=row.MHIT,
-            MMinD=row.MMinD,
-            MMaxD=row.MMaxD,
-            MAttackRateOrg=row.MAttackRateOrg,
-            MMoveRateOrg=row.MMoveRateOrg,
-            MAttackRateNew=row.MAttackRateNew,
-            MMoveRateNew=row.MMoveRateNew,
-            MHP=row.MHP,
-            MMP=row.MMP,
-            MMoveRange=row.MMoveRange,
-            MGbjType=row.MGbjType,
-            MRaceType=row.MRaceType,
-            MAiType=row.MAiType,
-            MCastingDelay=row.MCastingDelay,
-            MChaotic=row.MChaotic,
-            MSameRace1=row.MSameRace1,
-            MSameRace2=row.MSameRace2,
-            MSameRace3=row.MSameRace3,
-            MSameRace4=row.MSameRace4,
-            mSightRange=row.mSightRange,
-            mAttackRange=row.mAttackRange,
-            mSkillRange=row.mSkillRange,
-            mBodySize=row.mBodySize,
-            mDetectTransF=int(row.mDetectTransF),
-            mDetectTransP=int(row.mDetectTransP),
-            mDetectChao=int(row.mDetectChao),
-            mAiEx=row.mAiEx,
-            mScale=row.mScale,
-            mIsResistTransF=int(row.mIsResistTransF),
-            mIsEvent=int(row.mIsEvent),
-            mIsTest=int(row.mIsTest),
-            mHPNew=row.mHPNew,
-            mMPNew=row.mMPNew,
-            mBuyMerchanID=row.mBuyMerchanID,
-            mSellMerchanID=row.mSellMerchanID,
-            mChargeMerchanID=row.mChargeMerchanID,
-            mTransformWeight=row.mTransformWeight,
-            mNationOp=row.mNationOp,
-            mHPRegen=row.mHPRegen,
-            mMPRegen=row.mMPRegen,
-            IContentsLv=row.IContentsLv,
-            mIsEventTest=int(row.mIsEventTest),
-            mIsShowHp=int(row.mIsShowHp),
-            mSupportType=row.mSupportType,
-            mVolitionOfHonor=row.mVolitionOfHonor,
-            mWMapIconType=row.mWMapIconType,
-            mIsAmpliableTermOfValidity=int(row.mIsAmpliableTermOfValidity),
-            mAttackType=row.mAttackType,
-            mTransType=row.mTransType,
-            mDPV=row.mDPV,
-            mMPV=row.mMPV,
-            mRPV=row.mRPV,
-            mDDV=row.mDDV,
-            mMDV=row.mMDV,
-            mRDV=row.mRDV,
-            mSubDDWhenCritical=row.mSubDDWhenCritical,
-            mEnemySubCriticalHit=row.mEnemySubCriticalHit,
-            mEventQuest=int(row.mEventQuest),
-            mEScale=row.mEScale
-        )
+        monster = Monster.from_row(row)
         monsters.append(monster)
         file_paths[row.MID] = f"{current_app.config['GITHUB_URL']}{row.MID}.png"
 
@@ -593,6 +499,7 @@ def get_monsters_by_class(class_ids: List[int], search_term: str = '') -> Tuple[
 
 
 
+@cached(tags=tag_ids('monster'))
 def get_monsterabnormalResist_data(monster_id: int) -> Optional[List[DT_MonsterAbnormalResist]]:
     """Get monster resource by MID with caching"""
     query = """
@@ -688,8 +595,9 @@ def get_monsterabnormalResist_data(monster_id: int) -> Optional[List[DT_MonsterA
 
 
 # DT_MonsterAttributeAdd Check
+@cached(tags=tag_ids('monster'))
 def get_monster_attribute_add_data(monster_id: int) -> Optional[List[DT_MonsterAttributeAdd]]:
-    attribute_type_weapon_df = get_google_sheets_data(ATTRIBUTE_TYPE_WEAPON_URL)
+    attribute_type_names = get_attribute_type_names(ATTRIBUTE_TYPE_WEAPON_URL)
 
     query = """
     SELECT
@@ -709,7 +617,7 @@ def get_monster_attribute_add_data(monster_id: int) -> Optional[List[DT_MonsterA
     row = execute_query(query, (monster_id,), fetch_one=True)
     
     if row:
-        AName = attribute_type_weapon_df[attribute_type_weapon_df['AType'] == row[1]]['AName'].iloc[0] if not attribute_type_weapon_df.empty else ''
+        AName = attribute_type_names.get(row[1], '')
 
         return DT_MonsterAttributeAdd(
             row.AID,
@@ -725,8 +633,9 @@ def get_monster_attribute_add_data(monster_id: int) -> Optional[List[DT_MonsterA
 
 
 # DT_MonsterAttributeResist Check
+@cached(tags=tag_ids('monster'))
 def get_monster_attribute_resist_data(monster_id: int) -> Optional[List[DT_MonsterAttributeResist]]:
-    attribute_type_weapon_df = get_google_sheets_data(ATTRIBUTE_TYPE_ARMOR_URL)
+    attribute_type_names = get_attribute_type_names(ATTRIBUTE_TYPE_ARMOR_URL)
 
     query = """
     SELECT
@@ -746,7 +655,7 @@ def get_monster_attribute_resist_data(monster_id: int) -> Optional[List[DT_Monst
     row = execute_query(query, (monster_id,), fetch_one=True)
     
     if row:
-        AName = attribute_type_weapon_df[attribute_type_weapon_df['AType'] == row[1]]['AName'].iloc[0] if not attribute_type_weapon_df.empty else ''
+        AName = attribute_type_names.get(row[1], '')
 
         return DT_MonsterAttributeResist(
             row.AID,
@@ -761,6 +670,7 @@ def get_monster_attribute_resist_data(monster_id: int) -> Optional[List[DT_Monst
     
     
 # DT_ItemProtect Check
+@cached(tags=tag_ids('monster'))
 def get_monster_protect_data(monster_id: int) -> Optional[List[DT_MonsterProtect]]:
     
     query = """
@@ -805,6 +715,7 @@ def get_monster_protect_data(monster_id: int) -> Optional[List[DT_MonsterProtect
     
 
 # DT_MonsterSlain Check
+@cached(tags=tag_ids('monster'))
 def get_monster_slain_data(item_id: int) -> Optional[List[DT_MonsterSlain]]:
     
     query = """
@@ -850,9 +761,4 @@ def get_monster_slain_data(item_id: int) -> Optional[List[DT_MonsterSlain]]:
 
 # Получить имя монстра по MID
 def get_monster_name(monster_id: int):
-    query = "SELECT MName FROM DT_Monster WHERE MID = ?"
-    mname = execute_query(query, (monster_id,), fetch_one=True)
-    
-    if mname:
-        return mname[0].replace("\\n", " ").replace("/n", " ")
-    return None
+    return get_resource_loader().monster_name(monster_id)
@@ -0,0 +1,338 @@
+"""Per-request SQL and Google Sheets instrumentation.
+
+``execute_query`` (and ``UnitOfWork``) report every statement here with its
+duration and row count; ``get_db_connection`` reports how long the pool took
+to hand out a connection and ``SheetCache`` reports sheet reads/downloads.
+Statements are grouped by fingerprint: the SQL with literals, IN-lists and
+whitespace normalized, so ``WHERE IID = 5`` and ``WHERE IID = 7`` are one
+entry.
+
+Each request gets a ``RequestStats`` (``init_query_stats`` installs the
+hooks). It is bound to a context variable, and ``FanOut`` re-binds it in its
+worker threads, so sub-queries of a detail page count for that page. The
+totals go out in the ``Server-Timing`` header (see
+``services.fanout.server_timing_header``) and, with DEBUG_TIMING_ENABLED, as
+a JSON footer on ``?_debug=timing``. Everything is also summed process-wide
+(per fingerprint and per endpoint) for ``/api/stats``; statements run
+outside a request (catalog reloads, background refreshes) only count there.
+"""
+import contextvars
+import hashlib
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from flask import Flask, current_app, g, request
+
+# Сколько разных отпечатков хранить на процесс; остальные суммируются в '(other)'
+MAX_FINGERPRINTS = 500
+# Сколько самых дорогих отпечатков попадает в Server-Timing
+TIMING_TOP = 3
+
+_LINE_COMMENT = re.compile(r'--[^\n]*')
+_LITERAL = re.compile(r"N?'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_SPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=4096)
+def normalize_query(query: str) -> str:
+    """SQL with comments dropped, literals and IN-lists replaced by ? and whitespace collapsed"""
+    query = _LINE_COMMENT.sub(' ', query)
+    query = _LITERAL.sub('?', query)
+    query = _IN_LIST.sub('(?+)', query)
+    return _SPACE.sub(' ', query).strip()
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(query: str) -> str:
+    """Short stable id of the normalized statement"""
+    return hashlib.sha1(normalize_query(query).encode('utf-8')).hexdigest()[:8]
+
+
+def count_rows(result) -> int:
+    """Rows behind an ``execute_query`` result (list, single row, None or write status)"""
+    if result is None or isinstance(result, bool):
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    return 1
+
+
+class QueryTotals:
+    """Counters of one fingerprint"""
+    __slots__ = ('sql', 'count', 'errors', 'total', 'max', 'rows')
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0  # Секунды
+        self.max = 0.0
+        self.rows = 0
+
+    def add(self, duration: float, rows: int, error: bool):
+        self.count += 1
+        self.errors += error
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.rows += rows
+
+    def to_dict(self, fp: str) -> Dict:
+        return {
+            'fingerprint': fp,
+            'sql': self.sql,
+            'count': self.count,
+            'errors': self.errors,
+            'total_ms': round(self.total * 1000, 3),
+            'mean_ms': round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max * 1000, 3),
+            'rows': self.rows,
+        }
+
+
+class StatsCollector:
+    """Query, connection and sheet counters; shared by the threads of a request or the whole process"""
+
+    def __init__(self, max_fingerprints: Optional[int] = None):
+        self.max_fingerprints = max_fingerprints
+        self.queries: Dict[str, QueryTotals] = {}
+        self.query_count = 0
+        self.query_time = 0.0
+        self.rows = 0
+        self.acquire_count = 0
+        self.acquire_time = 0.0
+        self.sheet_reads = 0
+        self.sheet_downloads = 0
+        self.sheet_time = 0.0
+        self._lock = threading.Lock()
+
+    def add_query(self, query: str, duration: float, rows: int, error: bool = False):
+        fp = fingerprint(query)
+        with self._lock:
+            self.query_count += 1
+            self.query_time += duration
+            self.rows += rows
+            totals = self.queries.get(fp)
+            if totals is None:
+                if self.max_fingerprints is not None and len(self.queries) >= self.max_fingerprints:
+                    fp = '(other)'
+                    totals = self.queries.get(fp)
+                if totals is None:
+                    totals = self.queries[fp] = QueryTotals(normalize_query(query) if fp != '(other)' else '')
+            totals.add(duration, rows, error)
+
+    def add_acquire(self, duration: float):
+        with self._lock:
+            self.acquire_count += 1
+            self.acquire_time += duration
+
+    def add_sheet(self, duration: float, download: bool):
+        with self._lock:
+            if download:
+                self.sheet_downloads += 1
+            else:
+                self.sheet_reads += 1
+            self.sheet_time += duration
+
+    def top(self, limit: Optional[int] = None) -> List[tuple]:
+        """(fingerprint, totals) by total time, most expensive first"""
+        with self._lock:
+            items = list(self.queries.items())
+        items.sort(key=lambda item: item[1].total, reverse=True)
+        return items[:limit] if limit else items
+
+    def summary(self) -> Dict:
+        return {
+            'queries': self.query_count,
+            'db_ms': round(self.query_time * 1000, 3),
+            'rows': self.rows,
+            'acquire': {'count': self.acquire_count, 'total_ms': round(self.acquire_time * 1000, 3)},
+            'sheets': {'reads': self.sheet_reads, 'downloads': self.sheet_downloads,
+                       'total_ms': round(self.sheet_time * 1000, 3)},
+        }
+
+
+class RequestStats(StatsCollector):
+    """Counters of one HTTP request"""
+
+    def __init__(self):
+        super().__init__()
+        self.started = time.perf_counter()
+
+    def to_dict(self) -> Dict:
+        data = {'total_ms': round((time.perf_counter() - self.started) * 1000, 3)}
+        data.update(self.summary())
+        data['by_fingerprint'] = [totals.to_dict(fp) for fp, totals in self.top()]
+        return data
+
+
+class ProcessStats(StatsCollector):
+    """Process-wide sums plus per-endpoint request counters"""
+
+    def __init__(self):
+        super().__init__(max_fingerprints=MAX_FINGERPRINTS)
+        self.since = time.time()
+        self.endpoints: Dict[str, Dict] = {}
+
+    def add_request(self, endpoint: str, stats: RequestStats):
+        elapsed = time.perf_counter() - stats.started
+        with self._lock:
+            entry = self.endpoints.setdefault(endpoint, {
+                'requests': 0, 'queries': 0, 'max_queries': 0, 'db_ms': 0.0, 'sheets_ms': 0.0, 'total_ms': 0.0,
+            })
+            entry['requests'] += 1
+            entry['queries'] += stats.query_count
+            entry['max_queries'] = max(entry['max_queries'], stats.query_count)
+            entry['db_ms'] += stats.query_time * 1000
+            entry['sheets_ms'] += stats.sheet_time * 1000
+            entry['total_ms'] += elapsed * 1000
+
+    def to_dict(self, limit: Optional[int] = None) -> Dict:
+        data = {'since': self.since, 'uptime_s': round(time.time() - self.since, 1)}
+        data.update(self.summary())
+        with self._lock:
+            endpoints = {name: dict(entry) for name, entry in self.endpoints.items()}
+        for entry in endpoints.values():
+            requests = entry['requests']
+            entry['queries_per_request'] = round(entry['queries'] / requests, 2)
+            entry['mean_ms'] = round(entry['total_ms'] / requests, 3)
+            for key in ('db_ms', 'sheets_ms', 'total_ms'):
+                entry[key] = round(entry[key], 3)
+        data['endpoints'] = dict(sorted(endpoints.items(), key=lambda item: item[1]['db_ms'], reverse=True))
+        data['by_fingerprint'] = [totals.to_dict(fp) for fp, totals in self.top(limit)]
+        return data
+
+
+_process = ProcessStats()
+_current: contextvars.ContextVar = contextvars.ContextVar('request_query_stats', default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    """Stats of the request this thread works for, or None"""
+    return _current.get()
+
+
+@contextmanager
+def bind_stats(stats: Optional[RequestStats]):
+    """Count statements of this thread into ``stats`` (used by FanOut workers)"""
+    token = _current.set(stats)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def record_query(query: str, duration: float, rows: int = 0, error: bool = False):
+    stats = _current.get()
+    if stats is not None:
+        stats.add_query(query, duration, rows, error)
+    _process.add_query(query, duration, rows, error)
+
+
+def record_acquire(duration: float):
+    stats = _current.get()
+    if stats is not None:
+        stats.add_acquire(duration)
+    _process.add_acquire(duration)
+
+
+def record_sheet(duration: float, download: bool = False):
+    stats = _current.get()
+    if stats is not None:
+        stats.add_sheet(duration, download)
+    _process.add_sheet(duration, download)
+
+
+def process_stats(limit: Optional[int] = None) -> Dict:
+    """Process-wide totals, per endpoint and per fingerprint (top ``limit`` by time)"""
+    return _process.to_dict(limit)
+
+
+def debug_timing_enabled() -> bool:
+    return current_app.config.get('DEBUG_TIMING_ENABLED', False)
+
+
+def timing_entries() -> List[str]:
+    """``Server-Timing`` metrics of the current request (SQL text only in debug mode)"""
+    stats = g.get('query_stats')
+    if stats is None:
+        return []
+    entries = [f'db;dur={stats.query_time * 1000:.1f};desc="{stats.query_count} queries, {stats.rows} rows"']
+    if stats.acquire_count:
+        entries.append(f'db-acquire;dur={stats.acquire_time * 1000:.1f};desc="{stats.acquire_count} connections"')
+    if stats.sheet_reads or stats.sheet_downloads:
+        entries.append(f'sheets;dur={stats.sheet_time * 1000:.1f};'
+                       f'desc="{stats.sheet_reads} reads, {stats.sheet_downloads} downloads"')
+    show_sql = debug_timing_enabled()
+    for fp, totals in stats.top(TIMING_TOP):
+        desc = f'{totals.count}x'
+        if show_sql:
+            # Кавычки и обратные слэши ломают quoted-string заголовка
+            desc += ' ' + totals.sql[:80].replace('\\', ' ').replace('"', "'")
+        entries.append(f'sql-{fp};dur={totals.total * 1000:.1f};desc="{desc}"')
+    return entries
+
+
+def _fanout_timings() -> List[Dict]:
+    return [{'name': t.name, 'duration_ms': round(t.duration * 1000, 3), 'wait_ms': round(t.wait * 1000, 3),
+             'status': t.status} for t in g.get('fanout_timings') or []]
+
+
+def _replace_body(response, data: bytes):
+    """New body for a debug response: the page cache's ETag no longer matches it, and it must not be stored"""
+    response.set_data(data)
+    response.headers.pop('ETag', None)
+    response.headers['Cache-Control'] = 'no-store'
+
+
+def _add_debug_footer(response):
+    stats = g.get('query_stats')
+    if stats is None or response.status_code != 200 or response.direct_passthrough or response.is_streamed:
+        return response
+    timing = stats.to_dict()
+    timing['fanout'] = _fanout_timings()
+
+    if response.is_json:
+        body = response.get_json(silent=True)
+        if isinstance(body, dict):
+            body['_debug_timing'] = timing
+            _replace_body(response, json.dumps(body, ensure_ascii=False, default=str).encode('utf-8'))
+    elif response.mimetype == 'text/html':
+        # </ внутри SQL не должен закрывать тег script
+        payload = json.dumps(timing, ensure_ascii=False, default=str).replace('</', '<\\/')
+        footer = f'\n<script type="application/json" id="debug-timing">{payload}</script>\n'
+        _replace_body(response, response.get_data() + footer.encode('utf-8'))
+    return response
+
+
+def init_query_stats(app: Flask):
+    """Per-request collection: bind a RequestStats, add the debug footer, sum into the process stats"""
+
+    @app.before_request
+    def start_query_stats():
+        g.query_stats = RequestStats()
+        g.query_stats_token = _current.set(g.query_stats)
+
+    @app.after_request
+    def add_debug_timing(response):
+        if request.args.get('_debug') == 'timing' and debug_timing_enabled():
+            return _add_debug_footer(response)
+        return response
+
+    @app.teardown_request
+    def finish_query_stats(error=None):
+        stats = g.pop('query_stats', None)
+        token = g.pop('query_stats_token', None)
+        if stats is not None:
+            _process.add_request(request.endpoint or '(unmatched)', stats)
+        if token is not None:
+            try:
+                _current.reset(token)
+            except ValueError:
+                # Токен из другого контекста (потоковый ответ) - просто снимаем привязку
+                _current.set(None)
@@ -0,0 +1,176 @@
+"""Process-wide catalog of assembled quests for /quests and /api/quest/<no>.
+
+Quests, rewards, conditions are read with separate narrow queries and
+grouped in dicts by mQuestNo / mRewardNo; item names and icons of all
+rewards and requirements are resolved in one batch, NPC names come from the
+same loader. Every quest is serialized to JSON once, when the catalog is
+built. A count/checksum query over the quest tables is re-run every
+QUEST_CATALOG_TTL seconds in the background and the catalog is rebuilt when
+it changes.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from flask import current_app
+
+from services.asset_manifest import NO_MONSTER_IMAGE, asset_url, monster_pic_url
+from services.database import execute_query
+from services.resource_loader import ResourceLoader
+from services.snapshot import SnapshotHolder
+
+QUESTS_QUERY = """
+    SELECT
+        a.mQuestNo,
+        a.mQuestNm,
+        b.mDesc AS class_desc,
+        a.mLevel1,
+        a.mLevel2,
+        a.mQuestDesc,
+        a.mDifficulty,
+        a.mRewardNo,
+        r.mPlaceNm AS place_name,
+        a.mFindNPC,
+        a.mCompletionNPC
+    FROM TblQuest AS a
+    LEFT OUTER JOIN FNLParm1602.dbo.TP_PlayerClass AS b ON (b.mClassNo = a.mClass)
+    LEFT OUTER JOIN TblPlace AS r ON (r.mPlaceNo = a.mPlace)
+    ORDER BY a.mQuestNo
+"""
+REWARDS_QUERY = "SELECT mRewardNo, mExp, mID, mCnt FROM TblQuestReward ORDER BY mRewardNo"
+CONDITIONS_QUERY = "SELECT mQuestNo, mID, mCnt FROM TblQuestCondition ORDER BY mQuestNo"
+
+FINGERPRINT_QUERY = """
+    SELECT
+        (SELECT COUNT_BIG(*) FROM TblQuest), (SELECT CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM TblQuest),
+        (SELECT COUNT_BIG(*) FROM TblQuestReward), (SELECT CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM TblQuestReward),
+        (SELECT COUNT_BIG(*) FROM TblQuestCondition), (SELECT CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM TblQuestCondition)
+"""
+
+
+@dataclass(frozen=True)
+class QuestCatalogSnapshot:
+    """Assembled quests (shared between requests, must not be mutated) and their JSON"""
+    quests: Tuple[Dict, ...]                        # Отсортированы по mQuestNo
+    by_no: Mapping[int, Dict]
+    json_by_no: Mapping[int, str]
+    loaded_at: float = field(default_factory=time.time)
+
+    def get(self, quest_no: int) -> Optional[Dict]:
+        return self.by_no.get(quest_no)
+
+
+def _group_items(rows, key_attr: str) -> Dict[int, Dict[Tuple[int, int], Dict]]:
+    """key -> {(item id, count): item}; repeated rows collapse into one entry"""
+    groups: Dict[int, Dict[Tuple[int, int], Dict]] = {}
+    for row in rows:
+        if not row.mID:
+            continue
+        count = row.mCnt or 1
+        groups.setdefault(getattr(row, key_attr), {}).setdefault(
+            (row.mID, count), {'id': row.mID, 'count': count})
+    return groups
+
+
+def _npc(loader: ResourceLoader, monster_id: Optional[int]) -> Optional[Dict]:
+    if not monster_id:
+        return None
+    return {'id': monster_id, 'name': loader.monster_name(monster_id), 'pic': monster_pic_url(monster_id)}
+
+
+def assemble_quests() -> List[Dict]:
+    """All quests in the shape the quest page expects"""
+    quests = execute_query(QUESTS_QUERY)
+    reward_rows = execute_query(REWARDS_QUERY)
+    condition_rows = execute_query(CONDITIONS_QUERY)
+
+    reward_exp: Dict[int, Optional[int]] = {}
+    for row in reward_rows:
+        reward_exp.setdefault(row.mRewardNo, row.mExp)
+    rewards = _group_items(reward_rows, 'mRewardNo')
+    conditions = _group_items(condition_rows, 'mQuestNo')
+
+    # Имена и иконки всех предметов и имена всех NPC - одним пакетом
+    loader = ResourceLoader()
+    loader.want_items(item_id for group in (*rewards.values(), *conditions.values()) for item_id, _ in group)
+    loader.want_monsters(npc for row in quests for npc in (row.mFindNPC, row.mCompletionNPC) if npc)
+    loader.load()
+    default_pic = asset_url(NO_MONSTER_IMAGE)
+
+    def item_list(group) -> List[Dict]:
+        items = []
+        for item in (group or {}).values():
+            name = loader.item_name(item['id'])
+            if name:  # Предметы, которых нет в DT_Item, не показываем
+                items.append(dict(item, name=name, pic=loader.item_pic_url(item['id'], default_pic)))
+        return items
+
+    assembled = {}
+    for row in quests:
+        if row.mQuestNo in assembled:
+            continue
+        assembled[row.mQuestNo] = {
+            'questNo': row.mQuestNo,
+            'questName': row.mQuestNm,
+            'level': f"{row.mLevel1}-{row.mLevel2}" if row.mLevel2 else str(row.mLevel1),
+            'class': row.class_desc or 'Все классы',
+            'difficulty': row.mDifficulty,
+            'description': row.mQuestDesc,
+            'place': row.place_name,
+            'rewards': {
+                'exp': reward_exp.get(row.mRewardNo),
+                'itemList': item_list(rewards.get(row.mRewardNo)),
+            },
+            'requirements': {
+                'itemList': item_list(conditions.get(row.mQuestNo)),
+            },
+            'npcs': {
+                'completion': _npc(loader, row.mCompletionNPC),
+                'find': _npc(loader, row.mFindNPC),
+            },
+        }
+    return list(assembled.values())
+
+
+def _load_catalog() -> QuestCatalogSnapshot:
+    quests = assemble_quests()
+    dumps = current_app.json.dumps
+    return QuestCatalogSnapshot(
+        quests=tuple(quests),
+        by_no=MappingProxyType({q['questNo']: q for q in quests}),
+        json_by_no=MappingProxyType({q['questNo']: dumps(q) for q in quests}),
+    )
+
+
+def _fingerprint() -> tuple:
+    return tuple(execute_query(FINGERPRINT_QUERY, fetch_one=True))
+
+
+_holder: Optional[SnapshotHolder] = None
+_holder_lock = threading.Lock()
+
+
+def get_catalog_holder() -> SnapshotHolder:
+    """Process-wide holder of the quest catalog"""
+    global _holder
+    if _holder is None:
+        with _holder_lock:
+            if _holder is None:
+                _holder = SnapshotHolder(
+                    'quest_catalog',
+                    load=_load_catalog,
+                    fingerprint=_fingerprint,
+                    ttl=current_app.config.get('QUEST_CATALOG_TTL', 600),
+                )
+    return _holder
+
+
+def is_catalog_enabled() -> bool:
+    return current_app.config.get('QUEST_CATALOG_ENABLED', True)
+
+
+def get_quest_catalog() -> QuestCatalogSnapshot:
+    """Current catalog snapshot (built on first use)"""
+    return get_catalog_holder().get()
@@ -0,0 +1,134 @@
+"""Request-scoped batch loader for item icons and item/monster names.
+
+Services that build a list of rows used to call ``get_item_resource(id)`` or
+``get_item_name(id)`` once per row. Instead they announce every ID of the
+pass first (``want_items`` / ``want_monsters``) and then read the values:
+all pending IDs are resolved together, from the in-memory catalogs when they
+are enabled or with one ``IN`` query per 1000 IDs otherwise.
+
+The loader lives in ``flask.g``, so it is shared by the code of one request
+(or one FanOut task) and resolved values are not fetched twice. Monster
+pictures and skill sprites need no lookup: their URLs come from the IDs and
+sprite columns already in the rows (see services.asset_manifest).
+"""
+from typing import Dict, Iterable, Optional
+
+from flask import g, has_app_context
+
+from models.item import DT_ItemResource
+from services.asset_manifest import sprite_url
+from services.database import execute_query
+from services.item_catalog import MAX_IN_PARAMS, get_item_catalog, is_catalog_enabled as is_item_catalog_enabled
+from services.monster_catalog import get_monster_catalog, is_catalog_enabled as is_monster_catalog_enabled
+
+
+def _clean_monster_name(name: Optional[str]) -> Optional[str]:
+    return name.replace("\\n", " ").replace("/n", " ") if name else None
+
+
+class ResourceLoader:
+    """Collects IDs during a pass and resolves them in one batch"""
+
+    def __init__(self):
+        self._item_resources: Dict[int, Optional[DT_ItemResource]] = {}
+        self._item_names: Dict[int, Optional[str]] = {}
+        self._monster_names: Dict[int, Optional[str]] = {}
+        self._pending_items = set()
+        self._pending_monsters = set()
+        self.stats = {'queries': 0, 'catalog_batches': 0}
+
+    def want_items(self, item_ids: Iterable[Optional[int]]) -> 'ResourceLoader':
+        """Schedule item IDs for the next batch (None and known IDs are ignored)"""
+        self._pending_items.update(i for i in item_ids if i is not None and i not in self._item_names)
+        return self
+
+    def want_monsters(self, monster_ids: Iterable[Optional[int]]) -> 'ResourceLoader':
+        self._pending_monsters.update(i for i in monster_ids if i is not None and i not in self._monster_names)
+        return self
+
+    def load(self):
+        """Resolve everything that is pending"""
+        if self._pending_items:
+            ids, self._pending_items = sorted(self._pending_items), set()
+            self._load_items(ids)
+        if self._pending_monsters:
+            ids, self._pending_monsters = sorted(self._pending_monsters), set()
+            self._load_monsters(ids)
+
+    def _load_items(self, ids):
+        if is_item_catalog_enabled():
+            catalog = get_item_catalog()
+            self.stats['catalog_batches'] += 1
+            for item_id in ids:
+                item = catalog.get(item_id)
+                self._item_names[item_id] = item.IName if item is not None else None
+                self._item_resources[item_id] = catalog.resources.get(item_id)
+            return
+
+        for item_id in ids:
+            self._item_names[item_id] = None
+            self._item_resources[item_id] = None
+        for start in range(0, len(ids), MAX_IN_PARAMS):
+            chunk = ids[start:start + MAX_IN_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            rows = execute_query(f"""
+                SELECT i.IID, i.IName, r.RFileName, r.RPosX, r.RPosY
+                FROM DT_Item AS i
+                LEFT JOIN DT_ItemResource AS r ON (r.ROwnerID = i.IID AND r.RType = 2)
+                WHERE i.IID IN ({placeholders})
+            """, chunk)
+            self.stats['queries'] += 1
+            for row in rows:
+                self._item_names[row.IID] = row.IName
+                if row.RFileName:
+                    self._item_resources[row.IID] = DT_ItemResource(row.IID, row.RFileName, row.RPosX, row.RPosY)
+
+    def _load_monsters(self, ids):
+        if is_monster_catalog_enabled():
+            catalog = get_monster_catalog()
+            self.stats['catalog_batches'] += 1
+            for monster_id in ids:
+                monster = catalog.get(monster_id)
+                self._monster_names[monster_id] = _clean_monster_name(monster.MName if monster else None)
+            return
+
+        for monster_id in ids:
+            self._monster_names[monster_id] = None
+        for start in range(0, len(ids), MAX_IN_PARAMS):
+            chunk = ids[start:start + MAX_IN_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            rows = execute_query(f"SELECT MID, MName FROM DT_Monster WHERE MID IN ({placeholders})", chunk)
+            self.stats['queries'] += 1
+            for row in rows:
+                self._monster_names[row.MID] = _clean_monster_name(row.MName)
+
+    def item_resource(self, item_id: int) -> Optional[DT_ItemResource]:
+        if item_id not in self._item_resources:
+            self.want_items((item_id,)).load()
+        return self._item_resources.get(item_id)
+
+    def item_name(self, item_id: int) -> Optional[str]:
+        if item_id not in self._item_names:
+            self.want_items((item_id,)).load()
+        return self._item_names.get(item_id)
+
+    def item_pic_url(self, item_id: int, default: Optional[str] = None) -> Optional[str]:
+        """Icon URL, or ``default`` if the item has no RType=2 resource"""
+        resource = self.item_resource(item_id)
+        if resource is None:
+            return default
+        return sprite_url(resource.RFileName, resource.RPosX, resource.RPosY)
+
+    def monster_name(self, monster_id: int) -> Optional[str]:
+        if monster_id not in self._monster_names:
+            self.want_monsters((monster_id,)).load()
+        return self._monster_names.get(monster_id)
+
+
+def get_resource_loader() -> ResourceLoader:
+    """Loader of the current app context (a fresh one outside of it)"""
+    if not has_app_context():
+        return ResourceLoader()
+    if 'resource_loader' not in g:
+        g.resource_loader = ResourceLoader()
+    return g.resource_loader
@@ -0,0 +1,200 @@
+"""Whole-response cache for entity detail pages with conditional GET.
+
+``/item/<id>``, ``/monster/<id>``, ``/skill/<id>`` and ``/abnormal/<aid>``
+run a dozen queries and a large template for data that only changes when the
+game database is patched. ``@cached_page(kind, arg)`` keeps the rendered
+body per (endpoint, path + query string, data version):
+
+* the data version is the snapshot generation (services.snapshot), so a
+  catalog/graph reload after a patch makes every cached page a miss;
+  ``invalidate_tags("monster:929")`` (chest saves) drops single pages;
+* responses carry a strong ``ETag`` (SHA-1 of the body, identical across
+  worker processes) and ``Cache-Control: public, max-age=..,
+  stale-while-revalidate=..``; a matching ``If-None-Match`` gets a 304;
+* within RESPONSE_CACHE_TTL an entry is served as is; for another
+  RESPONSE_CACHE_STALE seconds it is still served while one background
+  thread renders the page again.
+
+Only complete 200 pages are stored: a page whose FanOut sub-queries failed,
+timed out or degraded (see services.fanout), or whose own rendering hit a
+swallowed DB error (``services.cache.report_error``), is returned but not
+cached.
+"""
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from flask import current_app, g, make_response, request
+
+from services.cache import add_invalidation_listener, error_count
+from services.snapshot import data_generation
+
+
+class CachedPage:
+    __slots__ = ('body', 'mimetype', 'etag', 'created_at', 'tag')
+
+    def __init__(self, body: bytes, mimetype: str, tag: str):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.created_at = time.monotonic()
+        self.tag = tag
+
+
+class ResponseCache:
+    """LRU of rendered pages"""
+
+    def __init__(self):
+        self._entries: 'OrderedDict[tuple, CachedPage]' = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'not_modified': 0,
+                      'refreshes': 0, 'skipped': 0, 'evictions': 0, 'invalidations': 0}
+
+    def get(self, key: tuple) -> Optional[CachedPage]:
+        with self._lock:
+            page = self._entries.get(key)
+            if page is not None:
+                self._entries.move_to_end(key)
+            return page
+
+    def put(self, key: tuple, page: CachedPage, maxsize: int):
+        with self._lock:
+            self._entries[key] = page
+            self._entries.move_to_end(key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        tags = set(tags)
+        with self._lock:
+            keys = [key for key, page in self._entries.items() if page.tag in tags]
+            for key in keys:
+                del self._entries[key]
+            self.stats['invalidations'] += len(keys)
+        return len(keys)
+
+    def start_refresh(self, key: tuple) -> bool:
+        """Claim the background refresh of a key (False if one is already running)"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key: tuple):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> Dict:
+        with self._lock:
+            size = len(self._entries)
+        return dict(self.stats, size=size)
+
+
+_cache = ResponseCache()
+add_invalidation_listener(_cache.invalidate_tags)
+
+
+def get_response_cache() -> ResponseCache:
+    return _cache
+
+
+def _settings():
+    config = current_app.config
+    return (
+        config.get('RESPONSE_CACHE_ENABLED', True),
+        config.get('RESPONSE_CACHE_TTL', 300),
+        config.get('RESPONSE_CACHE_STALE', 3600),
+        config.get('RESPONSE_CACHE_MAXSIZE', 2000),
+    )
+
+
+def _complete() -> bool:
+    """False if a FanOut sub-query of this request failed, timed out or degraded"""
+    return all(t.status == 'ok' for t in g.get('fanout_timings', ()))
+
+
+def _render(view, kwargs, tag: str):
+    """Run the view; returns (response, page or None if it must not be cached)"""
+    errors = error_count()
+    response = make_response(view(**kwargs))
+    # Ошибка, проглоченная геттером в этом потоке: страница собрана из заглушек
+    degraded = error_count() != errors
+    if response.status_code != 200 or response.direct_passthrough or degraded or not _complete():
+        return response, None
+    return response, CachedPage(response.get_data(), response.mimetype, tag)
+
+
+def _send(page: CachedPage, ttl: float, stale: float, state: str):
+    response = current_app.response_class(page.body, mimetype=page.mimetype)
+    response.set_etag(page.etag)
+    response.headers['Cache-Control'] = f"public, max-age={int(ttl)}, stale-while-revalidate={int(stale)}"
+    response.headers['X-Response-Cache'] = state
+    response.make_conditional(request)
+    if response.status_code == 304:
+        _cache.stats['not_modified'] += 1
+    return response
+
+
+def _refresh_in_background(view, kwargs, key: tuple, tag: str, maxsize: int):
+    if not _cache.start_refresh(key):
+        return
+    app = current_app._get_current_object()
+    path, query_string = request.path, request.query_string
+
+    def run():
+        try:
+            with app.test_request_context(path, query_string=query_string):
+                _, page = _render(view, kwargs, tag)
+                if page is not None:
+                    _cache.put(key[:-1] + (data_generation(),), page, maxsize)
+                    _cache.stats['refreshes'] += 1
+        except Exception as e:
+            print(f"Error refreshing cached page {path}: {e}")
+        finally:
+            _cache.end_refresh(key)
+
+    threading.Thread(target=run, name=f"page-refresh-{path}", daemon=True).start()
+
+
+def cached_page(kind: str, arg: str):
+    """Cache a detail view; ``kind:<arg value>`` is the invalidation tag of its pages"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**kwargs):
+            enabled, ttl, stale, maxsize = _settings()
+            if not enabled or request.method not in ('GET', 'HEAD'):
+                return view(**kwargs)
+
+            tag = f"{kind}:{kwargs.get(arg)}"
+            base = (request.endpoint, request.full_path)
+            page = _cache.get(base + (data_generation(),))
+            if page is not None:
+                age = time.monotonic() - page.created_at
+                if age < ttl:
+                    _cache.stats['hits'] += 1
+                    return _send(page, ttl, stale, 'hit')
+                if age < ttl + stale:
+                    _cache.stats['stale_hits'] += 1
+                    _refresh_in_background(view, kwargs, base + (data_generation(),), tag, maxsize)
+                    return _send(page, ttl, stale, 'stale')
+
+            _cache.stats['misses'] += 1
+            response, page = _render(view, kwargs, tag)
+            if page is None:
+                _cache.stats['skipped'] += 1
+                return response
+            # Версия после рендера: страница могла сама догрузить каталог
+            _cache.put(base + (data_generation(),), page, maxsize)
+            return _send(page, ttl, stale, 'miss')
+        return wrapper
+    return decorator
@@ -0,0 +1,231 @@
+"""In-process name search over items, monsters, skills and abnormal effects.
+
+Names are normalized (casefold, ё -> е, punctuation -> space) and indexed
+three ways:
+
+- trigram postings (sorted NumPy arrays of entry numbers) for substrings of
+  3+ characters: the postings of every query trigram are intersected and
+  the few survivors are checked with a plain ``in``;
+- a sorted word list for 1-2 character prefixes;
+- a sorted list of IDs as strings for numeric queries (ID-prefix match).
+
+Results are ranked: exact ID, exact name, name prefix, ID prefix, word
+prefix, substring; then shorter names first. The index lives in a
+SnapshotHolder and is rebuilt when the names in the database change.
+"""
+import heapq
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from flask import current_app
+
+from services.database import execute_query
+from services.snapshot import SnapshotHolder
+
+# Вид -> запрос (ID, имя); порядок ключей - порядок в выдаче при равном ранге
+SEARCH_SOURCES = {
+    'item': "SELECT IID AS ID, IName AS Name FROM DT_Item",
+    'monster': "SELECT MID AS ID, MName AS Name FROM DT_Monster",
+    'skill': "SELECT SID AS ID, SName AS Name FROM DT_Skill",
+    'abnormal': "SELECT AID AS ID, ADesc AS Name FROM DT_Abnormal",
+}
+KIND_ORDER = {kind: i for i, kind in enumerate(SEARCH_SOURCES)}
+
+FINGERPRINT_QUERY = """
+    SELECT
+        (SELECT COUNT_BIG(*) FROM DT_Item), (SELECT CHECKSUM_AGG(BINARY_CHECKSUM(IID, IName)) FROM DT_Item),
+        (SELECT COUNT_BIG(*) FROM DT_Monster), (SELECT CHECKSUM_AGG(BINARY_CHECKSUM(MID, MName)) FROM DT_Monster),
+        (SELECT COUNT_BIG(*) FROM DT_Skill), (SELECT CHECKSUM_AGG(BINARY_CHECKSUM(SID, SName)) FROM DT_Skill),
+        (SELECT COUNT_BIG(*) FROM DT_Abnormal), (SELECT CHECKSUM_AGG(BINARY_CHECKSUM(AID, ADesc)) FROM DT_Abnormal)
+"""
+
+MAX_LIMIT = 100
+
+# Ранги совпадений (меньше - выше в выдаче)
+RANK_ID_EXACT, RANK_NAME_EXACT, RANK_NAME_PREFIX, RANK_ID_PREFIX, RANK_WORD_PREFIX, RANK_SUBSTRING = range(6)
+
+_NON_WORD = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def normalize(text: Optional[str]) -> str:
+    """Search form of a name: casefolded, ё -> е, punctuation collapsed to single spaces"""
+    if not text:
+        return ''
+    text = text.replace('\\n', ' ').replace('/n', ' ')
+    return _NON_WORD.sub(' ', text.casefold().replace('ё', 'е')).strip()
+
+
+def trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    kind: str
+    id: int
+    name: str
+    rank: int
+
+
+class SearchIndex:
+    """Immutable trigram/prefix/ID index over (kind, id, name) entries.
+
+    Entries are numbered in tie-break order (shorter name, kind, ID), so
+    within one rank the best hits are simply the smallest entry numbers.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, int, str]]):
+        prepared = sorted(
+            (len(norm), KIND_ORDER.get(kind, 99), entry_id, kind, name or '', norm)
+            for kind, entry_id, name in entries if entry_id is not None
+            for norm in (normalize(name),)
+        )
+        self.kinds: List[str] = [p[3] for p in prepared]
+        self.ids: List[int] = [p[2] for p in prepared]
+        self.names: List[str] = [p[4] for p in prepared]
+        self.normalized: List[str] = [p[5] for p in prepared]
+
+        postings = defaultdict(list)
+        words = []
+        for n, norm in enumerate(self.normalized):
+            for gram in trigrams(norm):
+                postings[gram].append(n)
+            for word in set(norm.split()):
+                words.append((word, n))
+
+        # Номера записей растут, поэтому списки уже отсортированы
+        self._postings: Dict[str, np.ndarray] = {
+            gram: np.array(numbers, dtype=np.int32) for gram, numbers in postings.items()
+        }
+        self._words, self._word_entries = self._sorted_keys(words)
+        self._names, self._name_entries = self._sorted_keys((norm, n) for n, norm in enumerate(self.normalized))
+        self._id_keys, self._id_entries = self._sorted_keys((str(i), n) for n, i in enumerate(self.ids))
+
+    @staticmethod
+    def _sorted_keys(pairs) -> Tuple[List[str], List[int]]:
+        pairs = sorted(pairs)
+        return [k for k, _ in pairs], [n for _, n in pairs]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def _prefix_range(keys: Sequence[str], prefix: str) -> range:
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + '\uffff', lo=start)
+        return range(start, end)
+
+    @staticmethod
+    def _exact_range(keys: Sequence[str], key: str) -> range:
+        start = bisect_left(keys, key)
+        end = bisect_right(keys, key, lo=start)
+        return range(start, end)
+
+    def _substring_candidates(self, query: str) -> List[int]:
+        grams = sorted(trigrams(query), key=lambda g: len(self._postings.get(g, ())))
+        if not grams:
+            return []
+        result = self._postings.get(grams[0])
+        if result is None:
+            return []
+        for gram in grams[1:]:
+            result = np.intersect1d(result, self._postings.get(gram, result[:0]), assume_unique=True)
+            if not len(result):
+                return []
+        normalized = self.normalized
+        return [n for n in result.tolist() if query in normalized[n]]
+
+    def _tiers(self, query: str, raw_query: str):
+        """(rank, entry numbers) groups from the best rank down"""
+        digits = raw_query.isdigit()
+        if digits:
+            yield RANK_ID_EXACT, [self._id_entries[i] for i in self._exact_range(self._id_keys, raw_query)]
+        yield RANK_NAME_EXACT, [self._name_entries[i] for i in self._exact_range(self._names, query)]
+        yield RANK_NAME_PREFIX, [self._name_entries[i] for i in self._prefix_range(self._names, query)]
+        if digits:
+            yield RANK_ID_PREFIX, [self._id_entries[i] for i in self._prefix_range(self._id_keys, raw_query)]
+
+        if ' ' not in query:
+            yield RANK_WORD_PREFIX, [self._word_entries[i] for i in self._prefix_range(self._words, query)]
+            if len(query) >= 3:
+                yield RANK_SUBSTRING, self._substring_candidates(query)
+        elif len(query) >= 3:
+            # Несколько слов: кандидатов мало, ранг считаем для каждого
+            candidates = self._substring_candidates(query)
+            yield RANK_WORD_PREFIX, [n for n in candidates if (' ' + self.normalized[n]).find(' ' + query) >= 0]
+            yield RANK_SUBSTRING, candidates
+
+    def search(self, raw_query: str, kinds: Optional[Iterable[str]] = None,
+               limit: int = 20) -> List[SearchHit]:
+        """Ranked matches for a query; ``kinds`` restricts to item/monster/skill/abnormal"""
+        raw_query = raw_query.strip()
+        query = normalize(raw_query)
+        if not query:
+            return []
+        limit = max(1, min(limit, MAX_LIMIT))
+        kinds = set(kinds) if kinds is not None else None
+
+        hits = []
+        seen = set()
+        for rank, entries in self._tiers(query, raw_query):
+            wanted = limit - len(hits)
+            fresh = (n for n in entries
+                     if n not in seen and (kinds is None or self.kinds[n] in kinds))
+            for n in heapq.nsmallest(wanted, fresh):
+                seen.add(n)
+                hits.append(SearchHit(self.kinds[n], self.ids[n], self.names[n], rank))
+            if len(hits) >= limit:
+                break
+        return hits
+
+
+def _load_index() -> SearchIndex:
+    """Full index; a failed source raises, so the holder keeps the previous index and retries"""
+    entries = []
+    for kind, query in SEARCH_SOURCES.items():
+        try:
+            rows = execute_query(query)
+        except Exception as e:
+            print(f"Error loading {kind} names for search: {e}")
+            raise
+        entries.extend((kind, row.ID, row.Name) for row in rows)
+    index = SearchIndex(entries)
+    print(f"Search index built: {len(index)} names")
+    return index
+
+
+def _fingerprint() -> tuple:
+    return tuple(execute_query(FINGERPRINT_QUERY, fetch_one=True))
+
+
+_holder: Optional[SnapshotHolder] = None
+_holder_lock = threading.Lock()
+
+
+def get_index_holder() -> SnapshotHolder:
+    """Process-wide holder of the search index"""
+    global _holder
+    if _holder is None:
+        with _holder_lock:
+            if _holder is None:
+                _holder = SnapshotHolder(
+                    'search_index',
+                    load=_load_index,
+                    fingerprint=_fingerprint,
+                    ttl=current_app.config.get('SEARCH_INDEX_TTL', 600),
+                )
+    return _holder
+
+
+def get_search_index() -> SearchIndex:
+    """Current index (built on first use)"""
+    return get_index_holder().get()
+
+
+def search(query: str, kinds: Optional[Iterable[str]] = None, limit: int = 20) -> List[SearchHit]:
+    return get_search_index().search(query, kinds, limit)
@@ -0,0 +1,251 @@
+"""Local snapshot cache for Google Sheets lookup tables.
+
+Every sheet is kept in memory and mirrored to ``<cache_dir>/<sheet_id>.pkl``.
+Requests are served from the snapshot; once it is older than the TTL a
+background thread re-downloads the sheet (conditional GET via ETag, plus a
+content hash so an unchanged sheet does not bump the version). In offline mode
+nothing is downloaded and the last snapshot on disk is served.
+
+Pre-seed snapshots at deploy time with::
+
+    python -m services.sheets_cache [--force]
+"""
+import argparse
+import hashlib
+import io
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import pandas as pd
+import requests
+
+from config.settings import SHEET_URLS, get_sheets_cache_config
+from services.cache import report_error
+from services.query_stats import record_sheet
+
+
+@dataclass
+class SheetSnapshot:
+    """One downloaded sheet"""
+    df: pd.DataFrame
+    fetched_at: float           # time.time() последней успешной проверки
+    etag: Optional[str] = None
+    content_hash: Optional[str] = None
+    version: int = 1            # Растёт только при изменении содержимого
+
+
+def get_sheet_id(url: str) -> str:
+    """Extract spreadsheet id from a Google Sheets URL"""
+    return url.split('/d/')[1].split('/')[0]
+
+
+def get_export_url(url: str) -> str:
+    """Convert the Google Sheets URL to CSV export format"""
+    return f"https://docs.google.com/spreadsheets/d/{get_sheet_id(url)}/export?format=csv"
+
+
+class SheetCache:
+    """Process-wide cache of Google Sheets DataFrames with on-disk snapshots"""
+
+    def __init__(self, cache_dir: str = 'cache/sheets', ttl: float = 3600,
+                 offline: bool = False, timeout: float = 10):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.offline = offline
+        self.timeout = timeout
+        self._snapshots: Dict[str, SheetSnapshot] = {}
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._failed_at: Dict[str, float] = {}  # Не долбим Google повторно сразу после ошибки
+        self.retry_after = min(ttl, 60)
+        self._indexes: Dict[tuple, tuple] = {}  # (url, kind, *args) -> (version, index)
+
+    def _snapshot_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, f"{get_sheet_id(url)}.pkl")
+
+    def _load_from_disk(self, url: str) -> Optional[SheetSnapshot]:
+        path = self._snapshot_path(url)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return SheetSnapshot(**pickle.load(f))
+        except Exception as e:
+            print(f"Error loading sheet snapshot {path}: {e}")
+            return None
+
+    def _save_to_disk(self, url: str, snapshot: SheetSnapshot):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._snapshot_path(url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                # Храним словарь, а не dataclass - снапшот читается и из CLI (__main__)
+                pickle.dump(dict(snapshot.__dict__), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)  # Атомарная замена - читатели не увидят половину файла
+        except Exception as e:
+            print(f"Error saving sheet snapshot {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _is_stale(self, snapshot: SheetSnapshot) -> bool:
+        return time.time() - snapshot.fetched_at >= self.ttl
+
+    def get(self, url: str) -> pd.DataFrame:
+        """Return the sheet as a DataFrame; never waits on Google once a snapshot exists"""
+        started = time.perf_counter()
+        snapshot = self._snapshots.get(url)
+        if snapshot is None:
+            snapshot = self._load_from_disk(url)
+            if snapshot is not None:
+                with self._lock:
+                    snapshot = self._snapshots.setdefault(url, snapshot)
+
+        if snapshot is None:
+            if self.offline:
+                print(f"Sheet {get_sheet_id(url)} has no snapshot and offline mode is on")
+                return pd.DataFrame()
+            # Холодный старт без снапшота - единственный случай синхронной загрузки
+            snapshot = self.refresh(url)
+            if snapshot is None:
+                report_error()  # Пустая таблица вместо данных - результаты на ней не кэшируются
+                return pd.DataFrame()
+            return snapshot.df
+
+        if not self.offline and self._is_stale(snapshot):
+            self.refresh_in_background(url)
+        record_sheet(time.perf_counter() - started)
+        return snapshot.df
+
+    def get_snapshot(self, url: str) -> Optional[SheetSnapshot]:
+        """Current snapshot (loading it if needed), or None"""
+        self.get(url)
+        return self._snapshots.get(url)
+
+    def refresh(self, url: str, force: bool = False) -> Optional[SheetSnapshot]:
+        """Download the sheet now; returns the (possibly unchanged) snapshot or None on failure"""
+        current = self._snapshots.get(url) or self._load_from_disk(url)
+        headers = {}
+        if current is not None and current.etag and not force:
+            headers['If-None-Match'] = current.etag
+
+        started = time.perf_counter()
+        try:
+            response = requests.get(get_export_url(url), headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and current is not None:
+                snapshot = SheetSnapshot(current.df, time.time(), current.etag,
+                                         current.content_hash, current.version)
+            else:
+                response.raise_for_status()
+                content_hash = hashlib.sha1(response.content).hexdigest()
+                if current is not None and current.content_hash == content_hash and not force:
+                    df, version = current.df, current.version
+                else:
+                    df = pd.read_csv(io.BytesIO(response.content))
+                    version = current.version + 1 if current is not None else 1
+                snapshot = SheetSnapshot(df, time.time(), response.headers.get('ETag'),
+                                         content_hash, version)
+        except Exception as e:
+            print(f"Error fetching Google Sheets data: {e}")
+            self._failed_at[url] = time.time()
+            return current
+        finally:
+            record_sheet(time.perf_counter() - started, download=True)
+
+        with self._lock:
+            self._failed_at.pop(url, None)
+            self._snapshots[url] = snapshot
+        self._save_to_disk(url, snapshot)
+        return snapshot
+
+    def refresh_in_background(self, url: str):
+        """Start a daemon thread refreshing the sheet, unless one is already running"""
+        with self._lock:
+            if url in self._refreshing:
+                return
+            if time.time() - self._failed_at.get(url, 0) < self.retry_after:
+                return
+            self._refreshing.add(url)
+
+        def run():
+            try:
+                self.refresh(url)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(url)
+
+        threading.Thread(target=run, name=f"sheet-refresh-{get_sheet_id(url)}", daemon=True).start()
+
+    def get_index(self, url: str, key: tuple, build):
+        """Index built from the current snapshot; rebuilt only when the sheet version changes"""
+        snapshot = self.get_snapshot(url)
+        if snapshot is None or snapshot.df.empty:
+            return {}
+        cached = self._indexes.get(key)
+        if cached is not None and cached[0] == snapshot.version:
+            return cached[1]
+        try:
+            index = build(snapshot.df)
+        except KeyError as e:
+            print(f"Sheet {get_sheet_id(url)} has no column {e}")
+            index = {}
+        self._indexes[key] = (snapshot.version, index)
+        return index
+
+    def lookup(self, url: str, key_col: str, value_col: str) -> Dict:
+        """Hash map key_col -> value_col (first row wins, like .iloc[0] on a mask)"""
+        def build(df):
+            df = df.drop_duplicates(subset=key_col, keep='first')
+            return {k: (None if pd.isna(v) else v)
+                    for k, v in zip(df[key_col].tolist(), df[value_col].tolist())}
+        return self.get_index(url, (url, 'lookup', key_col, value_col), build)
+
+    def seed(self, urls, force: bool = False) -> Dict[str, bool]:
+        """Download all given sheets synchronously (deploy-time warmup)"""
+        return {url: self.refresh(url, force=force) is not None for url in urls}
+
+
+_cache: Optional[SheetCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_sheet_cache() -> SheetCache:
+    """Process-wide SheetCache configured from environment variables"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SheetCache(**get_sheets_cache_config())
+    return _cache
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Pre-seed Google Sheets snapshots")
+    parser.add_argument('--force', action='store_true', help="re-download even if unchanged")
+    parser.add_argument('--dir', help="snapshot directory (default: SHEETS_CACHE_DIR)")
+    args = parser.parse_args()
+
+    cache = get_sheet_cache()
+    if args.dir:
+        cache.cache_dir = args.dir
+
+    failed = 0
+    for name, url in SHEET_URLS.items():
+        snapshot = cache.refresh(url, force=args.force)
+        if snapshot is None:
+            failed += 1
+            print(f"[FAIL] {name}")
+        else:
+            print(f"[OK]   {name}: {len(snapshot.df)} rows, version {snapshot.version}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,11 @@
 from typing import List, Dict, Optional, Tuple
 from flask import current_app
 from models.skill import Skill, DT_Attribute, DT_SkillSlain
+from services.cache import cached, tag_ids
 from services.database import execute_query
-from services.utils import get_skill_icon_path, clean_dict, get_google_sheets_data
+from services.utils import get_skill_icon_path, clean_dict, get_attribute_type_names
 from services.item_service import (get_item_resource, get_item_pic_url)
+from services.resource_loader import get_resource_loader
 from services.abnormal_service import (
     get_abnormal_skills
 )
@@ -17,6 +19,7 @@ from config.settings import ATTRIBUTE_TYPE_WEAPON_URL
 
 # Easy defs
 # Поиск SID по SPID с картинкой
+@cached(tags=tag_ids('skillpack'))
 def get_sid_by_spid(spid):
     query = """
     SELECT
@@ -119,6 +122,7 @@ def get_monster_reget_skill_pic_icon_datasource(skill_id: int) -> Optional[str]:
         return None
 
 
+@cached(tags=tag_ids('skill'))
 def get_skill_detail(skill_id: int) -> List[Optional[Skill]]:
     """Get detailed skill information"""
     query = """
@@ -185,10 +189,11 @@ def get_skill_detail(skill_id: int) -> List[Optional[Skill]]:
         return None
 
     skills = []
+    loader = get_resource_loader().want_items(row.IID for row in rows)
     
     for row in rows:
         item_id = row.IID
-        item_pic = get_item_resource(item_id) if item_id else None
+        item_pic = loader.item_resource(item_id) if item_id else None
 
         abnormal_data = clean_dict({
             "AbnormalID": row.AbnormalID,
@@ -261,6 +266,7 @@ def get_skill_detail(skill_id: int) -> List[Optional[Skill]]:
     return skills
 
 
+@cached(tags=tag_ids('abnormal'))
 def get_abnormal_in_skill(aid: int) -> Optional[Tuple]:
     """Get abnormal information for a skill"""
     if aid is None:
@@ -304,6 +310,7 @@ def get_abnormal_in_skill(aid: int) -> Optional[Tuple]:
         return None
 
 
+@cached(tags=tag_ids('item'))
 def get_item_skill(item_id: int) -> Optional[Tuple]:
     """Get skill details for an item"""
     if item_id is None:
@@ -395,6 +402,7 @@ def get_item_skill(item_id: int) -> Optional[Tuple]:
         return None
     
     
+@cached(tags=tag_ids('transform'))
 def get_transformlist_by_mttype(mttype: int) -> Optional[List[Tuple]]:
     query = """
         SELECT
@@ -427,6 +435,7 @@ def get_transformlist_by_mttype(mttype: int) -> Optional[List[Tuple]]:
         return None
     
 
+@cached(tags=tag_ids('skillpack'))
 def get_skill_use_by_spid_items(spid_id: int) -> Optional[Tuple]:
     """Get skill details by ID"""
     
@@ -471,6 +480,7 @@ def get_skill_use_by_spid_items(spid_id: int) -> Optional[Tuple]:
         return None
     
 
+@cached(tags=tag_ids('skillpack'))
 def get_skill_use_by_sid(spid_id: int) -> Optional[Tuple]:
     """Get skill details by ID"""
     if spid_id is None:
@@ -527,9 +537,10 @@ def get_skill_use_by_sid(spid_id: int) -> Optional[Tuple]:
     
     
 # DT_ItemAttributeAdd Check
+@cached(tags=tag_ids('skill'))
 def get_skill_attribute_data(item_id: int) -> Optional[List[DT_Attribute]]:
     
-    attribute_type_weapon_df = get_google_sheets_data(ATTRIBUTE_TYPE_WEAPON_URL)
+    attribute_type_names = get_attribute_type_names(ATTRIBUTE_TYPE_WEAPON_URL)
 
     query = """
     SELECT
@@ -548,7 +559,7 @@ def get_skill_attribute_data(item_id: int) -> Optional[List[DT_Attribute]]:
     row = execute_query(query, (item_id,), fetch_one=True)
     
     if row:
-        AName = attribute_type_weapon_df[attribute_type_weapon_df['AType'] == row[1]]['AName'].iloc[0] if not attribute_type_weapon_df.empty else ''
+        AName = attribute_type_names.get(row[1], '')
 
         return DT_Attribute(
             row.AttrbuteID,
@@ -565,6 +576,7 @@ def get_skill_attribute_data(item_id: int) -> Optional[List[DT_Attribute]]:
 
 
 # DT_SkillSlain Check
+@cached(tags=tag_ids('skill'))
 def get_skill_slain_data(item_id: int) -> Optional[List[DT_SkillSlain]]:
     
     query = """
@@ -0,0 +1,134 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from flask import current_app
+
+# Растет при каждой замене любого снимка в процессе (версия данных для кэша ответов)
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def _bump_generation():
+    global _generation
+    with _generation_lock:
+        _generation += 1
+
+
+def data_generation() -> int:
+    """Number of snapshot swaps in this process so far"""
+    return _generation
+
+
+class SnapshotHolder:
+    """Process-wide read-only snapshot with atomic swap.
+
+    ``load()`` builds a full snapshot. ``fingerprint()`` is a cheap
+    change-detection query (count/max/checksum); it is re-run at most every
+    ``ttl`` seconds in a background thread, and when the token differs
+    ``refresh(old)`` builds the next snapshot (incrementally if it can,
+    defaults to ``load()``). Readers always get a complete snapshot: the new
+    one replaces the old with a single reference assignment.
+    """
+
+    def __init__(self, name: str, load: Callable[[], Any],
+                 fingerprint: Optional[Callable[[], Any]] = None,
+                 refresh: Optional[Callable[[Any], Any]] = None,
+                 ttl: float = 300):
+        self.name = name
+        self._load = load
+        self._fingerprint = fingerprint
+        self._refresh = refresh or (lambda old: load())
+        self.ttl = ttl
+
+        self._snapshot = None
+        self._token = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()          # Только одна загрузка/обновление за раз
+        self._checking = False
+        self._checking_lock = threading.Lock()  # Отдельно, чтобы не ждать идущую загрузку
+        self.stats = {'loads': 0, 'refreshes': 0, 'checks': 0, 'errors': 0, 'last_load_time': 0.0}
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def get(self):
+        """Current snapshot; loads it on first use, schedules a change check when stale"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._build(initial=True)
+                snapshot = self._snapshot
+        elif self.ttl is not None and time.monotonic() - self._checked_at >= self.ttl:
+            self.check_in_background()
+        return snapshot
+
+    def _build(self, initial: bool, token=None):
+        """Build and swap in a new snapshot. Caller holds the lock."""
+        started = time.monotonic()
+        if token is None and self._fingerprint:
+            token = self._fingerprint()
+        if initial or self._snapshot is None:
+            snapshot = self._load()
+            self.stats['loads'] += 1
+        else:
+            snapshot = self._refresh(self._snapshot)
+            self.stats['refreshes'] += 1
+        self._snapshot, self._token = snapshot, token  # Атомарная замена ссылки
+        _bump_generation()
+        self._checked_at = time.monotonic()
+        self.stats['last_load_time'] = self._checked_at - started
+
+    def check(self) -> bool:
+        """Run the change-detection query now; refresh if data changed. Returns True if swapped."""
+        with self._lock:
+            self.stats['checks'] += 1
+            try:
+                if self._snapshot is None:
+                    self._build(initial=True)
+                    return True
+                token = self._fingerprint() if self._fingerprint else object()
+                if token == self._token:
+                    self._checked_at = time.monotonic()
+                    return False
+                self._build(initial=False, token=token)
+                return True
+            except Exception as e:
+                self.stats['errors'] += 1
+                self._checked_at = time.monotonic()  # Не повторяем сразу же на каждом запросе
+                print(f"Error refreshing snapshot {self.name}: {e}")
+                return False
+
+    def check_in_background(self):
+        """Run check() in a daemon thread inside the current app context"""
+        with self._checking_lock:
+            if self._checking:
+                return
+            self._checking = True
+        app = current_app._get_current_object()
+
+        def run():
+            try:
+                with app.app_context():
+                    self.check()
+            finally:
+                self._checking = False
+
+        threading.Thread(target=run, name=f"snapshot-{self.name}", daemon=True).start()
+
+    def reload(self):
+        """Force a full rebuild now"""
+        with self._lock:
+            self._build(initial=True)
+
+    def invalidate(self):
+        """Drop the snapshot; the next get() loads it again"""
+        with self._lock:
+            self._snapshot = None
+            self._token = None
+        _bump_generation()
+
+    def info(self) -> Dict:
+        return dict(self.stats, name=self.name, loaded=self.loaded, ttl=self.ttl)
@@ -0,0 +1,362 @@
+"""Read-only SQLite snapshot of FNLParm as an alternative to MSSQL.
+
+The exporter copies every table the app reads into one SQLite file::
+
+    python -m services.sqlite_backend --output cache/fnlparm.sqlite [--table DT_Item ...]
+
+With ``DB_BACKEND=sqlite`` (and ``SQLITE_PATH``) ``execute_query`` runs
+against that file instead of the pool: no ODBC driver, no MSSQL server,
+in-process reads, and any number of read nodes from one copied file.
+The file is opened read-only; writes (chest editor) fail with
+``ReadOnlyBackendError``.
+
+Queries are written for MSSQL and translated on the fly (cached per query):
+``<db>.dbo.`` / ``<db>.[dbo].`` prefixes are dropped, ``COUNT_BIG`` becomes ``COUNT``,
+``CAST(.. AS VARCHAR)`` becomes ``TEXT``. Change detection of the catalogs
+(``CHECKSUM_AGG(BINARY_CHECKSUM(..))`` and per-row ``BINARY_CHECKSUM``) is
+answered with the snapshot file's mtime, so re-exporting the file makes
+every catalog reload in full. Rows support
+attribute access like pyodbc rows. Unlike MSSQL, SQLite ``LIKE`` is
+case-insensitive only for ASCII letters.
+"""
+import argparse
+import datetime
+import decimal
+import os
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from flask import current_app
+
+# Таблицы FNLParm, которые читает сайт
+EXPORT_TABLES = (
+    'DT_Abnormal', 'DT_AbnormalModule', 'DT_Attribute', 'DT_AttributeAdd', 'DT_AttributeResist',
+    'DT_Bead', 'DT_BeadEffect', 'DT_DropGroup', 'DT_DropItem', 'DT_Item', 'DT_ItemAbnormalResist',
+    'DT_ItemAttributeAdd', 'DT_ItemAttributeResist', 'DT_ItemBeadEffect', 'DT_ItemBeadModule',
+    'DT_ItemPanalty', 'DT_ItemProtect', 'DT_ItemResource', 'DT_ItemSkill', 'DT_ItemSlain', 'DT_Module',
+    'DT_Monster', 'DT_MonsterAbnormalResist', 'DT_MonsterAttributeAdd', 'DT_MonsterAttributeResist',
+    'DT_MonsterDrop', 'DT_MonsterProtect', 'DT_MonsterResource', 'DT_MonsterSlain', 'DT_Protect',
+    'DT_Refine', 'DT_RefineMaterial', 'DT_Skill', 'DT_SkillAbnormal', 'DT_SkillAttribute', 'DT_SkillPack',
+    'DT_SkillPackSkill', 'DT_SkillSlain', 'DT_Slain',
+    'TP_AbnormalType', 'TP_BeadType', 'TP_DropGroup', 'TP_ModuleType', 'TP_PlayerClass', 'TP_SkillType',
+    'TP_SlainType', 'TP_SpecificProcItemType',
+    'TblBeadHoleProb', 'TblDialog', 'TblDialogScript', 'TblMerchantName', 'TblMerchantSellList',
+    'TblMonsterSpot', 'TblPlace', 'TblQuest', 'TblQuestCondition', 'TblQuestReward',
+    'TblSpecificProcItem', 'TblTransformList',
+)
+
+# Колонки, по которым сайт ищет строки - на них строятся индексы
+INDEXED_COLUMNS = (
+    'IID', 'MID', 'SID', 'AID', 'RID', 'ROwnerID', 'RItemID', 'RItemID0', 'DGroup', 'DDrop', 'DItem',
+    'mMID', 'mMId', 'mIID', 'mSID', 'mSPID', 'mQuestNo', 'mGroupID', 'mProcNo', 'AType', 'IType', 'MClass',
+)
+
+FETCH_BATCH = 5000
+
+
+class ReadOnlyBackendError(RuntimeError):
+    """Write attempted against the read-only snapshot"""
+
+
+class SnapshotExportError(RuntimeError):
+    """Some tables failed to export; the previous snapshot file was kept"""
+
+    def __init__(self, message: str, results: List[Tuple[str, Optional[int], float]]):
+        super().__init__(message)
+        self.results = results
+
+
+# --- Перевод запросов MSSQL -> SQLite ---
+
+_DB_PREFIX = re.compile(r'(?:\b\w+\.)?(?:\bdbo|\[dbo\])\.', re.IGNORECASE)
+_CHECKSUM_AGG = re.compile(r'CHECKSUM_AGG\s*\(\s*BINARY_CHECKSUM\s*\([^()]*\)\s*\)', re.IGNORECASE)
+_BINARY_CHECKSUM = re.compile(r'BINARY_CHECKSUM\s*\([^()]*\)', re.IGNORECASE)
+_COUNT_BIG = re.compile(r'\bCOUNT_BIG\s*\(', re.IGNORECASE)
+_VARCHAR = re.compile(r'\bAS\s+N?VARCHAR(\s*\(\s*\d+\s*\))?', re.IGNORECASE)
+_GETDATE = re.compile(r'\bGETDATE\s*\(\s*\)', re.IGNORECASE)
+_SET_OPTION = re.compile(r'\bSET\s+(NOCOUNT|XACT_ABORT)\s+(ON|OFF)\s*;', re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def translate(query: str) -> str:
+    """MSSQL query text -> SQLite; ``:fingerprint`` marks the snapshot version"""
+    query = _DB_PREFIX.sub('', query)
+    query = _CHECKSUM_AGG.sub(':fingerprint', query)
+    query = _BINARY_CHECKSUM.sub(':fingerprint', query)
+    query = _COUNT_BIG.sub('COUNT(', query)
+    query = _VARCHAR.sub('AS TEXT', query)
+    query = _GETDATE.sub('CURRENT_TIMESTAMP', query)
+    return _SET_OPTION.sub('', query)
+
+
+def _bind(query: str, fingerprint: int) -> str:
+    """Put the snapshot version in place of ``:fingerprint``"""
+    if ':fingerprint' not in query:
+        return query
+    # sqlite3 не смешивает ? и именованные параметры - подставляем число
+    return query.replace(':fingerprint', str(int(fingerprint)))
+
+
+# --- Строки как у pyodbc ---
+
+class Row:
+    """Read-only row with index, iteration and attribute access (like pyodbc.Row)"""
+    __slots__ = ('_values', '_columns')
+
+    def __init__(self, values: tuple, columns: Dict[str, int]):
+        self._values = values
+        self._columns = columns
+
+    def __getattr__(self, name):
+        columns = self._columns
+        index = columns.get(name)
+        if index is None:
+            index = columns.get(name.lower())
+            if index is None:
+                raise AttributeError(name)
+        return self._values[index]
+
+    def __getitem__(self, index):
+        return self._values[index]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __eq__(self, other):
+        return tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(self._values)
+
+    def __repr__(self):
+        return repr(self._values)
+
+    def __getstate__(self):
+        return self._values, self._columns
+
+    def __setstate__(self, state):
+        self._values, self._columns = state
+
+
+@lru_cache(maxsize=1024)
+def _column_index(names: Tuple[str, ...]) -> Dict[str, int]:
+    index = {}
+    for i, name in enumerate(names):
+        index.setdefault(name, i)
+        index.setdefault(name.lower(), i)  # Имена колонок в SQL регистронезависимы
+    return index
+
+
+def _row_factory(cursor, values):
+    return Row(values, _column_index(tuple(d[0] for d in cursor.description)))
+
+
+# --- Подключение ---
+
+class SQLiteBackend:
+    """Thread-local read-only connections to one snapshot file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.stats = {'connections': 0, 'queries': 0}
+
+    def fingerprint(self) -> int:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def _connection(self, stamp: int) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.stamp != stamp:
+            conn.close()  # Файл пересобран - открываем заново
+            conn = None
+        if conn is None:
+            if not os.path.exists(self.path):
+                raise FileNotFoundError(f"SQLite snapshot not found: {self.path} "
+                                        f"(python -m services.sqlite_backend)")
+            conn = sqlite3.connect(f"file:{os.path.abspath(self.path)}?mode=ro", uri=True,
+                                   check_same_thread=False)
+            conn.row_factory = _row_factory
+            self._local.conn, self._local.stamp = conn, stamp
+            with self._stats_lock:
+                self.stats['connections'] += 1
+        return conn
+
+    def execute(self, query: str, params=None, fetch_one: bool = False):
+        """execute_query() semantics: rows for SELECT, ReadOnlyBackendError for writes"""
+        if query.strip().upper().split()[0] not in ('SELECT', 'WITH'):
+            raise ReadOnlyBackendError("The SQLite snapshot backend is read-only")
+        stamp = self.fingerprint()
+        cursor = self._connection(stamp).execute(_bind(translate(query), stamp), list(params or ()))
+        with self._stats_lock:
+            self.stats['queries'] += 1
+        try:
+            if fetch_one:
+                return cursor.fetchone()
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def info(self) -> Dict:
+        return dict(self.stats, backend='sqlite', path=self.path, fingerprint=self.fingerprint())
+
+
+_backends: Dict[str, SQLiteBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_sqlite_backend() -> SQLiteBackend:
+    """Process-wide backend for SQLITE_PATH"""
+    path = current_app.config.get('SQLITE_PATH', 'cache/fnlparm.sqlite')
+    backend = _backends.get(path)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.setdefault(path, SQLiteBackend(path))
+    return backend
+
+
+# --- Экспорт MSSQL -> SQLite ---
+
+def _sqlite_value(value):
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat(sep=' ') if isinstance(value, datetime.datetime) else value.isoformat()
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    return value
+
+
+def _affinity(type_code) -> str:
+    if type_code in (int, bool):
+        return 'INTEGER'
+    if type_code in (float, decimal.Decimal):
+        return 'REAL'
+    if type_code in (bytes, bytearray):
+        return 'BLOB'
+    if type_code is str:
+        return 'TEXT'
+    return ''  # Дата/время и прочее хранятся как пришли, без приведения
+
+
+def export_table(source_conn, target: sqlite3.Connection, table: str) -> int:
+    """Copy one table (schema + rows + lookup indexes); returns row count"""
+    cursor = source_conn.cursor()
+    try:
+        cursor.execute(f"SELECT * FROM {table}")
+        columns = [(d[0], _affinity(d[1])) for d in cursor.description]
+        column_sql = ', '.join(f'"{name}" {affinity}'.rstrip() for name, affinity in columns)
+        target.execute(f'DROP TABLE IF EXISTS "{table}"')
+        target.execute(f'CREATE TABLE "{table}" ({column_sql})')
+
+        insert = f'INSERT INTO "{table}" VALUES ({", ".join("?" * len(columns))})'
+        count = 0
+        while True:
+            rows = cursor.fetchmany(FETCH_BATCH)
+            if not rows:
+                break
+            target.executemany(insert, ([_sqlite_value(v) for v in row] for row in rows))
+            count += len(rows)
+    finally:
+        cursor.close()
+
+    names = {name for name, _ in columns}
+    for column in INDEXED_COLUMNS:
+        if column in names:
+            target.execute(f'CREATE INDEX "ix_{table}_{column}" ON "{table}" ("{column}")')
+    return count
+
+
+def export_snapshot(output: str, tables: Sequence[str] = EXPORT_TABLES) -> List[Tuple[str, Optional[int], float]]:
+    """Build the snapshot file from the configured MSSQL database.
+
+    Written to a temp file and moved into place, so running read nodes keep
+    reading the old file until the new one is complete. Returns
+    (table, rows, seconds) per table. If any table fails, the temp file is
+    deleted, the old snapshot stays in place and SnapshotExportError
+    (with the per-table results, rows None on error) is raised.
+    """
+    from services.database import get_db_connection
+
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    target = sqlite3.connect(tmp_path)
+    target.execute('PRAGMA journal_mode = OFF')
+    target.execute('PRAGMA synchronous = OFF')
+    results = []
+    try:
+        try:
+            with get_db_connection() as source_conn:
+                for table in tables:
+                    started = time.monotonic()
+                    try:
+                        count = export_table(source_conn, target, table)
+                    except Exception as e:
+                        print(f"Error exporting {table}: {e}")
+                        count = None
+                    target.commit()
+                    results.append((table, count, time.monotonic() - started))
+            target.execute('ANALYZE')
+            target.commit()
+        finally:
+            target.close()
+        failed = [table for table, count, _ in results if count is None]
+        if failed:
+            raise SnapshotExportError(f"Tables failed to export: {', '.join(failed)}", results)
+    except Exception:
+        # Неполный снимок не должен заменить рабочий - его mtime перезагрузил бы каталоги на всех узлах
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, output)  # Атомарная замена готового файла
+    return results
+
+
+def main():
+    from dotenv import load_dotenv
+    from flask import Flask
+    from config.settings import load_config
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Export FNLParm tables into a read-only SQLite snapshot")
+    parser.add_argument('--output', help="snapshot file (default: SQLITE_PATH)")
+    parser.add_argument('--table', action='append', help="export only these tables (repeatable)")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    load_config(app)
+    app.config['DB_BACKEND'] = 'mssql'  # Источник - всегда MSSQL
+    output = args.output or app.config['SQLITE_PATH']
+
+    with app.app_context():
+        try:
+            results, error = export_snapshot(output, args.table or EXPORT_TABLES), None
+        except SnapshotExportError as e:
+            results, error = e.results, e
+
+    failed = [table for table, count, _ in results if count is None]
+    for table, count, took in results:
+        status = '[FAIL]' if count is None else '[OK]  '
+        print(f"{status} {table:<28} {'-' if count is None else count:>9} rows {took:6.1f}s")
+    print(f"{output}: {len(results) - len(failed)}/{len(results)} tables")
+    if error is not None:
+        print(f"[FAIL] {error}; {output} was not replaced")
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,71 @@
 import pandas as pd
-from typing import Optional
+from typing import Dict, List, Optional
 from flask import current_app
 
+from services.cache import report_error
+from services.sheets_cache import get_sheet_cache
+from services.asset_manifest import asset_url, sprite_url
+from config.settings import (MONSTER_CLASS_URL, MONSTER_RACE_URL, MONSTER_LOCATION_URL,
+                             SKILLAPPLYRACE_URL)
+
 def get_google_sheets_data(url: str) -> pd.DataFrame:
-    """Fetch data from Google Sheets"""
+    """Get Google Sheets data from the local snapshot cache"""
     try:
-        # Convert the Google Sheets URL to export format
-        sheet_id = url.split('/d/')[1].split('/')[0]
-        export_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
-        
-        # Read the CSV directly from the export URL
-        df = pd.read_csv(export_url)
-        return df
+        return get_sheet_cache().get(url)
     except Exception as e:
         print(f"Error fetching Google Sheets data: {e}")
+        report_error()
         return pd.DataFrame()
 
+# Индексы по таблицам Google Sheets (O(1) вместо фильтрации DataFrame на каждую строку)
+def get_sheet_lookup(url: str, key_col: str, value_col: str) -> Dict:
+    """Get prebuilt key -> value map for a Google Sheet"""
+    try:
+        return get_sheet_cache().lookup(url, key_col, value_col)
+    except Exception as e:
+        print(f"Error building Google Sheets lookup: {e}")
+        report_error()
+        return {}
+
+def get_monster_class_names() -> Dict[int, str]:
+    """MClass -> class name"""
+    return get_sheet_lookup(MONSTER_CLASS_URL, 'MClass', 'MName')
+
+def get_monster_race_descs() -> Dict[int, str]:
+    """MRaceType -> race description"""
+    return get_sheet_lookup(MONSTER_RACE_URL, 'MRaceType', 'mDesc')
+
+def get_monster_locations() -> Dict[int, List[dict]]:
+    """MID -> list of {"Location", "LocationLevel"}"""
+    def build(df):
+        locations = {}
+        for mid, place, level in zip(df['MID'].tolist(), df['mPlaceNmRus'].tolist(), df['mMapNmRus'].tolist()):
+            locations.setdefault(mid, []).append({
+                "Location": place,
+                "LocationLevel": None if pd.isna(level) else level
+            })
+        return locations
+    try:
+        return get_sheet_cache().get_index(MONSTER_LOCATION_URL, (MONSTER_LOCATION_URL, 'locations'), build)
+    except Exception as e:
+        print(f"Error building monster locations: {e}")
+        report_error()
+        return {}
+
+def get_attribute_type_names(url: str) -> Dict[int, str]:
+    """AType -> attribute name (ATTRIBUTE_TYPE_WEAPON_URL / ATTRIBUTE_TYPE_ARMOR_URL)"""
+    return get_sheet_lookup(url, 'AType', 'AName')
+
+def get_skill_apply_race_descs() -> Dict[int, str]:
+    """mApplyRace -> description"""
+    return get_sheet_lookup(SKILLAPPLYRACE_URL, 'mApplyRace', 'mDesc')
+
 def get_skill_icon_path(sprite_file: Optional[str], sprite_x: Optional[int], 
                        sprite_y: Optional[int], default_icon: str = "no_monster/no_monster_image.png") -> str:
     """Generate path to skill icon"""
     try:
         if not sprite_file:
-            return f"{current_app.config['GITHUB_URL']}{default_icon}"
+            return asset_url(default_icon)
 
         # Remove .dds extension if present
         if sprite_file.endswith(".dds"):
@@ -29,9 +73,9 @@ def get_skill_icon_path(sprite_file: Optional[str], sprite_x: Optional[int],
 
         # Check for valid coordinates
         if sprite_x is not None and sprite_y is not None:
-            return f"{current_app.config['GITHUB_URL']}{sprite_file}_{sprite_x}_{sprite_y}.png"
+            return sprite_url(sprite_file, sprite_x, sprite_y, fallback=default_icon)
         else:
-            return f"{current_app.config['GITHUB_URL']}{default_icon}"
+            return asset_url(default_icon)
 
     except Exception as e:
         print(f"Error creating icon path: {e}")
@@ -264,54 +264,71 @@ class ItemDataService {
         }
     }
 
-    // Загрузка всех страниц данных
+    // Загрузка всех предметов одним NDJSON-потоком (строка = предмет + иконка)
     async _fetchAllPages() {
-        const firstPageResponse = await this._fetchPage(1);
-        let allItems = [...firstPageResponse.items];
-
-        const totalPages = firstPageResponse.pages;
-        const remainingPages = Array.from({
-                length: totalPages - 1
-            },
-            (_, i) => i + 2
+        const response = await fetch(
+            `${window.location.pathname}?all=1&format=ndjson`, {
+                headers: {
+                    'X-Requested-With': 'XMLHttpRequest',
+                    'Accept': 'application/x-ndjson'
+                }
+            }
         );
 
-        const pageResponses = await Promise.all(
-            remainingPages.map(page => this._fetchPage(page))
-        );
+        if (!response.ok) {
+            throw new Error('Network response was not ok');
+        }
+
+        const items = [];
+        const resources = {};
+        let total = 0;
 
-        pageResponses.forEach(response => {
-            if (response.items) {
-                allItems = allItems.concat(response.items);
+        await readNdjson(response, line => {
+            if (line.error) {
+                throw new Error(line.error);
+            }
+            if (line.data) {
+                items.push(line.data);
+                if (line.resource) {
+                    resources[line.data.IID] = line.resource;
+                }
+            } else if (line.total !== undefined) {
+                total = line.total;
             }
         });
 
         return {
-            ...firstPageResponse,
-            items: allItems
+            items,
+            resources,
+            total
         };
     }
+}
+
+// Построчное чтение NDJSON-ответа по мере поступления данных
+async function readNdjson(response, onLine) {
+    if (!response.body || !window.TextDecoder) {
+        (await response.text()).split('\n').filter(Boolean)
+            .forEach(line => onLine(JSON.parse(line)));
+        return;
+    }
 
-    // Загрузка одной страницы данных
-    async _fetchPage(page) {
-        const response = await fetch(
-            `${window.location.pathname}?all=1&page=${page}`, {
-                headers: {
-                    'X-Requested-With': 'XMLHttpRequest'
-                }
-            }
-        );
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
 
-        if (!response.ok) {
-            throw new Error('Network response was not ok');
-        }
+    while (true) {
+        const { done, value } = await reader.read();
+        buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
 
-        const data = await response.json();
-        if (data.error) {
-            throw new Error(data.error);
-        }
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(Boolean).forEach(line => onLine(JSON.parse(line)));
 
-        return data;
+        if (done) break;
+    }
+    if (buffer.trim()) {
+        onLine(JSON.parse(buffer));
     }
 }
 
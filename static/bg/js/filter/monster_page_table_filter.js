@@ -193,9 +193,10 @@ class DataService {
         this.stateManager.setState('isLoading', true);
 
         try {
-            const response = await fetch(`${window.location.pathname}?all=1`, {
+            const response = await fetch(`${window.location.pathname}?all=1&format=ndjson`, {
                 headers: {
-                    'X-Requested-With': 'XMLHttpRequest'
+                    'X-Requested-With': 'XMLHttpRequest',
+                    'Accept': 'application/x-ndjson'
                 }
             });
 
@@ -203,10 +204,20 @@ class DataService {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
 
-            const data = await response.json();
-            if (data.error) {
-                throw new Error(data.error);
-            }
+            const data = { monsters: [], resources: {}, total: 0 };
+            await readNdjson(response, line => {
+                if (line.error) {
+                    throw new Error(line.error);
+                }
+                if (line.data) {
+                    data.monsters.push(line.data);
+                    if (line.resource) {
+                        data.resources[line.data.MID] = line.resource;
+                    }
+                } else if (line.total !== undefined) {
+                    data.total = line.total;
+                }
+            });
 
             this.stateManager.setState('cachedData', data);
             return data;
@@ -220,6 +231,33 @@ class DataService {
     }
 }
 
+// Построчное чтение NDJSON-ответа по мере поступления данных
+async function readNdjson(response, onLine) {
+    if (!response.body || !window.TextDecoder) {
+        (await response.text()).split('\n').filter(Boolean)
+            .forEach(line => onLine(JSON.parse(line)));
+        return;
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(Boolean).forEach(line => onLine(JSON.parse(line)));
+
+        if (done) break;
+    }
+    if (buffer.trim()) {
+        onLine(JSON.parse(buffer));
+    }
+}
+
 // Filter Logic
 class FilterManager {
     static collectFilters() {
@@ -276,9 +314,6 @@ class FilterManager {
         return Object.entries(filters).every(([key, value]) => {
             if (!value || value === '') return true;
 
-            // Let server handle tick filtering
-            if (key === 'mTickMin' || key === 'mTickMax') return true;
-
             if (key.endsWith('Min') || key.endsWith('Max')) {
                 return this._applyRangeFilter(monster, key, value);
             }